@@ -0,0 +1,57 @@
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+# Por debajo de este número de filas un COUNT(*) real es barato y exacto
+ESTIMATE_THRESHOLD = 10000
+
+
+def estimated_row_count(model, using='default'):
+    """
+    Devuelve el número aproximado de filas de la tabla de `model` usando las
+    estadísticas del motor, o None si el motor no ofrece estimaciones.
+    """
+    connection = connections[using]
+    table = model._meta.db_table
+
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE relname = %s', [table])
+            row = cursor.fetchone()
+        return row[0] if row and row[0] >= 0 else None
+
+    if connection.vendor == 'mysql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT table_rows FROM information_schema.tables '
+                'WHERE table_schema = DATABASE() AND table_name = %s',
+                [table],
+            )
+            row = cursor.fetchone()
+        return row[0] if row else None
+
+    if connection.vendor == 'djongo':
+        # Con djongo la conexión subyacente es la base de datos de pymongo:
+        # estimated_document_count() lee los metadatos de la colección.
+        connection.ensure_connection()
+        return connection.connection[table].estimated_document_count()
+
+    return None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginador para tablas grandes: si el queryset no está filtrado usa la
+    estimación del motor en lugar de COUNT(*). Con filtros o en tablas
+    pequeñas se comporta como el Paginator estándar.
+    """
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, 'query', None)
+        if query is not None and not query.where:
+            estimate = estimated_row_count(self.object_list.model, using=self.object_list.db)
+            if estimate is not None and estimate > ESTIMATE_THRESHOLD:
+                return estimate
+        return super().count
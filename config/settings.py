@@ -41,6 +41,9 @@ INSTALLED_APPS = [
     'django.contrib.staticfiles',
     'users',
     'events',
+    'notifications',
+    'outbox',
+    'diagnostics',
 ]   
 
 MIDDLEWARE = [
@@ -49,12 +52,19 @@ MIDDLEWARE = [
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'diagnostics.middleware.ProfilingMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
 
+# Vistas de lectura asíncronas (listado, detalle, perfil público y API JSON).
+# config/asgi.py lo activa; con WSGI se usan las síncronas.
+ASYNC_VIEWS = os.environ.get('ASYNC_VIEWS', '0') == '1'
+# Hilos (y por tanto conexiones a la base de datos) que usan las vistas asíncronas
+ASYNC_DB_WORKERS = int(os.environ.get('ASYNC_DB_WORKERS', '8'))
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -82,7 +92,9 @@ DATABASES = {
     'ENGINE': 'djongo',
     'NAME': 'streamevents_db_fresh',  # <- nuevo nombre
     'ENFORCE_SCHEMA': True,
-    'CLIENT': {'host': 'mongodb://localhost:27017'}
+    'CLIENT': {'host': 'mongodb://localhost:27017'},
+    # Conexiones persistentes: los hilos de events.aio reutilizan la suya
+    'CONN_MAX_AGE': int(os.environ.get('DB_CONN_MAX_AGE', '60')),
   }
 }
 
@@ -123,6 +135,94 @@ USE_TZ = True
 
 AUTH_USER_MODEL = 'users.CustomUser'
 
+# Autenticación: el usuario de la sesión se guarda en caché (ver users/backends.py)
+AUTHENTICATION_BACKENDS = [
+    'users.backends.CachedModelBackend',
+    # Las sesiones iniciadas antes de CachedModelBackend guardan esta ruta;
+    # sin ella se cerrarían todas. Se puede quitar cuando caduquen (SESSION_COOKIE_AGE)
+    'django.contrib.auth.backends.ModelBackend',
+]
+# CachedModelBackend solo cachea con una caché compartida entre procesos
+# (ver users.backends); con LocMemCache se comporta como ModelBackend
+USER_CACHE_TIMEOUT = 60 * 5
+
+
+# Caché
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+# Por defecto una caché en disco (CACHE_DIR), compartida por todos los procesos
+# web y worker de la misma máquina: así CachedModelBackend y las sesiones
+# cached_db funcionan sin servicios extra. Con varias máquinas hay que apuntar a
+# memcached: MEMCACHED=host:puerto (requiere pymemcache).
+
+if os.environ.get('MEMCACHED'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+            'LOCATION': os.environ['MEMCACHED'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get('CACHE_DIR', str(BASE_DIR / 'cache')),
+        }
+    }
+FACET_CACHE_TIMEOUT = 60  # segundos; recuentos por faceta del listado de eventos
+
+
+# Sesiones
+# https://docs.djangoproject.com/en/3.2/topics/http/sessions/#configuring-the-session-engine
+# SESSION_BACKEND=db | cache | cached_db | signed_cookies
+
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cache': 'django.contrib.sessions.backends.cache',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+SESSION_ENGINE = SESSION_ENGINES[os.environ.get('SESSION_BACKEND', 'cached_db')]
+
+
+# Analítica de eventos (ver events/analytics.py)
+
+ANALYTICS_FLUSH_INTERVAL = 30  # segundos entre volcados de los contadores en memoria
+TRENDING_HALF_LIFE_HOURS = 6
+
+
+# Email
+# https://docs.djangoproject.com/en/3.2/topics/email/#email-backends
+# En local los avisos se escriben en consola o en ficheros (EMAIL_BACKEND=file)
+
+EMAIL_BACKENDS = {
+    'console': 'django.core.mail.backends.console.EmailBackend',
+    'file': 'django.core.mail.backends.filebased.EmailBackend',
+    'smtp': 'django.core.mail.backends.smtp.EmailBackend',
+}
+EMAIL_BACKEND = EMAIL_BACKENDS[os.environ.get('EMAIL_BACKEND', 'console')]
+EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
+DEFAULT_FROM_EMAIL = 'StreamEvents <no-reply@streamevents.com>'
+
+# URL pública para los enlaces de los emails
+SITE_URL = os.environ.get('SITE_URL', 'http://localhost:8000')
+
+# Outbox de cambios (ver outbox.relay). Cada consumidor tiene un sink:
+# 'file' (path), 'callback' (ruta con puntos a una función) o 'http' (url);
+# 'models' opcional limita los modelos que recibe (p.ej. ['events.event']).
+OUTBOX_CONSUMERS = {
+    'changes-file': {'sink': 'file', 'path': str(BASE_DIR / 'outbox_changes.jsonl')},
+}
+# Segundos que relay() espera a que aparezca un pk saltado (transacción aún
+# abierta) antes de darlo por perdido; debe superar la transacción más larga
+OUTBOX_GAP_TIMEOUT = 300
+
+# Diagnóstico de peticiones (app diagnostics). Desactivado, el middleware se
+# descarta al arrancar y no tiene coste.
+DIAGNOSTICS_ENABLED = os.environ.get('DIAGNOSTICS', '0') == '1'
+DIAGNOSTICS_SLOW_REQUESTS = 50     # peticiones más lentas que se conservan
+DIAGNOSTICS_PROFILES = 20          # últimos perfiles que se conservan
+DIAGNOSTICS_SAMPLE_INTERVAL = 0.005  # segundos entre muestras
+
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/3.2/howto/static-files/
 
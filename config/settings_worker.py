@@ -0,0 +1,43 @@
+"""
+Perfil de settings reducido para procesos worker (comandos de fondo, colas).
+
+Parte de config.settings y quita las apps y middleware que solo necesita la
+interfaz web (admin, estáticos y mensajes), de modo que el arranque importa
+menos módulos. No sirve para servir las vistas HTML: usan el framework de
+mensajes.
+
+Uso:
+    DJANGO_SETTINGS_MODULE=config.settings_worker python manage.py <comando>
+"""
+
+from .settings import *  # noqa: F401,F403
+from .settings import INSTALLED_APPS, MIDDLEWARE, TEMPLATES
+
+
+WEB_ONLY_APPS = {
+    'django.contrib.admin',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+}
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in WEB_ONLY_APPS]
+
+MIDDLEWARE = [
+    m for m in MIDDLEWARE
+    if m != 'django.contrib.messages.middleware.MessageMiddleware'
+]
+
+TEMPLATES = [
+    {
+        **TEMPLATES[0],
+        'OPTIONS': {
+            **TEMPLATES[0]['OPTIONS'],
+            'context_processors': [
+                cp for cp in TEMPLATES[0]['OPTIONS']['context_processors']
+                if cp != 'django.contrib.messages.context_processors.messages'
+            ],
+        },
+    },
+]
+
+ROOT_URLCONF = 'config.urls_worker'
@@ -28,6 +28,8 @@ urlpatterns = [
     path('users/', include(('users.urls', 'users'), namespace='users')),
     path('accounts/', include('django.contrib.auth.urls')),
     path('events/', include('events.urls', namespace='events')), 
+    path('notifications/', include('notifications.urls', namespace='notifications')),
+    path('diagnostics/', include('diagnostics.urls', namespace='diagnostics')),
 
 
 
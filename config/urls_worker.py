@@ -0,0 +1,10 @@
+"""URLs para config.settings_worker: las mismas rutas sin el admin, para poder usar reverse()."""
+from django.urls import path, include
+
+urlpatterns = [
+    path('users/', include(('users.urls', 'users'), namespace='users')),
+    path('accounts/', include('django.contrib.auth.urls')),
+    path('events/', include('events.urls', namespace='events')),
+    path('notifications/', include('notifications.urls', namespace='notifications')),
+    path('diagnostics/', include('diagnostics.urls', namespace='diagnostics')),
+]
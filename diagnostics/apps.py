@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+from django.conf import settings
+from django.db.backends.signals import connection_created
+
+
+class DiagnosticsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'diagnostics'
+
+    def ready(self):
+        if settings.DIAGNOSTICS_ENABLED:
+            from .store import install_recorder
+            connection_created.connect(install_recorder, dispatch_uid='diagnostics.install_recorder')
@@ -0,0 +1,88 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+
+from diagnostics import profiling, store
+
+
+class Command(BaseCommand):
+    help = "Perfila una URL en este proceso (cProfile o muestreo) con el cliente de pruebas de Django"
+
+    def add_arguments(self, parser):
+        parser.add_argument('url', help='Ruta a perfilar, p.ej. /events/?category=talk')
+        parser.add_argument(
+            '--mode',
+            choices=profiling.MODES,
+            default='cprofile',
+            help='cprofile (informe de pstats) o sample (pilas colapsadas)'
+        )
+        parser.add_argument(
+            '--user',
+            default=None,
+            help='Usuario con el que se hace la petición (force_login)'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=1,
+            help='Peticiones a perfilar tras una de calentamiento (por defecto: 1)'
+        )
+        parser.add_argument(
+            '--seed-users',
+            type=int,
+            default=0,
+            help='Crea antes estos usuarios de prueba con seed_users --with-follows'
+        )
+        parser.add_argument(
+            '--output',
+            default=None,
+            help='Fichero donde guardar el .prof (cprofile) o las pilas colapsadas (sample)'
+        )
+
+    def handle(self, *args, **options):
+        if options['seed_users']:
+            call_command('seed_users', users=options['seed_users'], with_follows=True, stdout=self.stdout)
+
+        hosts = [h for h in settings.ALLOWED_HOSTS if h != '*' and not h.startswith('.')]
+        client = Client(HTTP_HOST=hosts[0] if hosts else 'localhost')
+        if options['user']:
+            user = get_user_model().objects.filter(username=options['user']).first()
+            if user is None:
+                raise CommandError(f"No existe el usuario {options['user']}.")
+            client.force_login(user)
+
+        url = options['url']
+        warmup = client.get(url)
+        self.stdout.write(f'Calentamiento: {warmup.status_code}')
+
+        recorder = store.QueryRecorder()
+        if options['mode'] == 'sample':
+            profiler = profiling.Sampler(interval=settings.DIAGNOSTICS_SAMPLE_INTERVAL)
+        else:
+            profiler = profiling.CProfiler()
+
+        started = time.perf_counter()
+        with connection.execute_wrapper(recorder), profiler:
+            for _ in range(options['repeat']):
+                response = client.get(url)
+        elapsed = (time.perf_counter() - started) / options['repeat']
+
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"{url} → {response.status_code} · {elapsed * 1000:.1f} ms/petición · "
+            f"{recorder.count / options['repeat']:.0f} consultas ({recorder.total * 1000 / options['repeat']:.1f} ms)"
+        ))
+        self.stdout.write(profiler.report() if options['mode'] == 'cprofile' else profiler.top())
+
+        if options['output']:
+            if options['mode'] == 'cprofile':
+                with open(options['output'], 'wb') as f:
+                    f.write(profiler.dump())
+            else:
+                with open(options['output'], 'w', encoding='utf-8') as f:
+                    f.write(profiler.collapsed())
+            self.stdout.write(self.style.SUCCESS(f"Perfil guardado en {options['output']}"))
@@ -0,0 +1,119 @@
+import asyncio
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+try:
+    from asgiref.sync import markcoroutinefunction
+except ImportError:  # asgiref < 3.6
+    markcoroutinefunction = None
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from . import profiling, store
+
+
+class ProfilingMiddleware:
+    """
+    Diagnóstico de peticiones en producción (DIAGNOSTICS_ENABLED).
+
+    - Mide cada petición y su SQL y guarda las más lentas en store.slow_requests.
+    - Un usuario staff con un token de profiling.make_token (parámetro
+      ?_profile= o cabecera X-Profile) obtiene además un perfil cProfile o
+      por muestreo de esa petición; la respuesta lleva X-Profile-Id.
+
+    Desactivado, Django lo descarta al arrancar (MiddlewareNotUsed) y no
+    cuesta nada. Admite peticiones síncronas y asíncronas: con ASGI no
+    obliga a adaptar las vistas async. cProfile solo sigue al hilo que lo
+    activa, así que en las peticiones asíncronas se usa siempre el muestreo.
+    """
+    sync_capable = True
+    # Sin markcoroutinefunction Django lo adapta y se usa solo el camino síncrono
+    async_capable = markcoroutinefunction is not None
+
+    def __init__(self, get_response):
+        if not settings.DIAGNOSTICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = asyncio.iscoroutinefunction(get_response)
+        if self.is_async:
+            # Django trata la instancia como corrutina (igual que MiddlewareMixin)
+            markcoroutinefunction(self)
+
+    def profile_mode(self, request):
+        token = request.GET.get('_profile') or request.META.get('HTTP_X_PROFILE')
+        if not token or not request.user.is_staff:
+            return None
+        return profiling.read_token(token, request.user)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        mode = self.profile_mode(request)
+        recorder = store.QueryRecorder()
+        profiler = None
+        token = store.current_recorder.set(recorder)
+        started = time.perf_counter()
+        try:
+            if mode == 'sample':
+                with profiling.Sampler(interval=settings.DIAGNOSTICS_SAMPLE_INTERVAL) as profiler:
+                    response = self.get_response(request)
+            elif mode == 'cprofile':
+                with profiling.CProfiler() as profiler:
+                    response = self.get_response(request)
+            else:
+                response = self.get_response(request)
+        finally:
+            store.current_recorder.reset(token)
+        return self.finish(request, response, mode, recorder, profiler, time.perf_counter() - started)
+
+    async def __acall__(self, request):
+        # request.user es perezoso y consulta la base de datos
+        mode = await sync_to_async(self.profile_mode)(request)
+        if mode == 'cprofile':
+            mode = 'sample'
+        recorder = store.QueryRecorder()
+        profiler = None
+        token = store.current_recorder.set(recorder)
+        started = time.perf_counter()
+        try:
+            if mode == 'sample':
+                sampler = profiling.Sampler(
+                    thread_id=threading.get_ident(), interval=settings.DIAGNOSTICS_SAMPLE_INTERVAL
+                )
+                with sampler as profiler:
+                    response = await self.get_response(request)
+            else:
+                response = await self.get_response(request)
+        finally:
+            store.current_recorder.reset(token)
+        duration = time.perf_counter() - started
+        return await sync_to_async(self.finish)(request, response, mode, recorder, profiler, duration)
+
+    def finish(self, request, response, mode, recorder, profiler, duration):
+        # Sin el token en la ruta guardada
+        query = request.GET.copy()
+        query.pop('_profile', None)
+        entry = {
+            'method': request.method,
+            'path': request.path + (f'?{query.urlencode()}' if query else ''),
+            'status': response.status_code,
+            'user': request.user.username if request.user.is_authenticated else '',
+            'query_count': recorder.count,
+            'sql_ms': recorder.total * 1000,
+            'queries': recorder.queries,
+        }
+        store.slow_requests.offer(duration, **entry)
+
+        if mode == 'sample':
+            response['X-Profile-Id'] = store.profiles.add(
+                mode=mode, duration_ms=duration * 1000, samples=profiler.samples,
+                report=profiler.top(), collapsed=profiler.collapsed(), **entry
+            )
+        elif mode == 'cprofile' and profiler.active:
+            response['X-Profile-Id'] = store.profiles.add(
+                mode=mode, duration_ms=duration * 1000, report=profiler.report(),
+                prof=profiler.dump(), **entry
+            )
+        response['Server-Timing'] = f'app;dur={duration * 1000:.1f}, db;dur={recorder.total * 1000:.1f}'
+        return response
@@ -0,0 +1,152 @@
+"""
+Perfilado de peticiones: cProfile (determinista) o muestreo estadístico.
+
+- cProfile mide todas las llamadas; el informe es el de pstats y el .prof
+  se puede abrir con snakeviz o cargar con pstats.
+- El muestreo lee la pila de los hilos de la petición cada
+  DIAGNOSTICS_SAMPLE_INTERVAL segundos desde otro hilo. Apenas afecta al
+  tiempo de la petición y produce pilas colapsadas ("a;b;c 12"), el formato
+  de flamegraph.pl y speedscope. En una petición asíncrona se muestrean el
+  hilo del bucle de eventos (compartido con otras peticiones) y los hilos
+  que trabajan para ella mientras lo hacen (ver track_thread, que usa
+  events.aio).
+
+Las peticiones se perfilan con un token firmado (ver make_token) que solo
+vale para el usuario staff que lo ha generado.
+"""
+import cProfile
+import io
+import marshal
+import pstats
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.core import signing
+
+
+MODES = ('cprofile', 'sample')
+TOKEN_SALT = 'diagnostics.profile'
+TOKEN_MAX_AGE = 60 * 60
+
+# cProfile solo admite un perfilador activo por proceso (sys.monitoring)
+_cprofile_lock = threading.Lock()
+
+current_sampler = ContextVar('diagnostics_sampler', default=None)
+
+
+def make_token(user, mode):
+    return signing.dumps({'user': user.pk, 'mode': mode}, salt=TOKEN_SALT, compress=True)
+
+
+def read_token(token, user):
+    """Modo de perfilado del token, o None si no es válido para `user`."""
+    try:
+        data = signing.loads(token, salt=TOKEN_SALT, max_age=TOKEN_MAX_AGE)
+    except signing.BadSignature:
+        return None
+    if data.get('user') != user.pk or data.get('mode') not in MODES:
+        return None
+    return data['mode']
+
+
+def frame_label(frame):
+    code = frame.f_code
+    return f'{code.co_name} ({code.co_filename}:{code.co_firstlineno})'
+
+
+class Sampler:
+    """Muestrea la pila de uno o varios hilos desde un hilo aparte."""
+
+    def __init__(self, thread_id=None, interval=0.005):
+        self.threads = {thread_id or threading.get_ident()}
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='diagnostics-sampler', daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            for thread_id in list(self.threads):
+                frame = frames.get(thread_id)
+                if frame is None:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(frame_label(frame))
+                    frame = frame.f_back
+                self.stacks[';'.join(reversed(stack))] += 1
+                self.samples += 1
+
+    def __enter__(self):
+        self._token = current_sampler.set(self)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        current_sampler.reset(self._token)
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self):
+        return '\n'.join(f'{stack} {count}' for stack, count in self.stacks.most_common())
+
+    def top(self, limit=30):
+        """Funciones con más muestras propias (la cima de la pila)."""
+        own = Counter()
+        for stack, count in self.stacks.items():
+            own[stack.rsplit(';', 1)[-1]] += count
+        total = self.samples or 1
+        return '\n'.join(
+            f'{count:6d} {100 * count / total:5.1f}%  {label}' for label, count in own.most_common(limit)
+        )
+
+
+@contextmanager
+def track_thread():
+    """Incluye el hilo actual en el muestreo de la petición en curso, si lo hay."""
+    sampler = current_sampler.get()
+    if sampler is None:
+        yield
+        return
+    thread_id = threading.get_ident()
+    added = thread_id not in sampler.threads
+    sampler.threads.add(thread_id)
+    try:
+        yield
+    finally:
+        if added:
+            sampler.threads.discard(thread_id)
+
+
+class CProfiler:
+    """cProfile como gestor de contexto; si ya hay otro activo no perfila (`active` = False)."""
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+        self.active = False
+
+    def __enter__(self):
+        self.active = _cprofile_lock.acquire(blocking=False)
+        if self.active:
+            self.profile.enable()
+        return self
+
+    def __exit__(self, *exc):
+        if self.active:
+            self.profile.disable()
+            _cprofile_lock.release()
+
+    def report(self, limit=40, sort='cumulative'):
+        out = io.StringIO()
+        pstats.Stats(self.profile, stream=out).strip_dirs().sort_stats(sort).print_stats(limit)
+        return out.getvalue()
+
+    def dump(self):
+        """Contenido de un fichero .prof (el formato de pstats.dump_stats)."""
+        self.profile.create_stats()
+        return marshal.dumps(self.profile.stats)
@@ -0,0 +1,124 @@
+"""
+Almacenes en memoria del proceso: las N peticiones más lentas (con su SQL)
+y los últimos perfiles. Cada proceso del servidor tiene los suyos.
+
+El QueryRecorder de la petición en curso vive en una contextvar y
+record_queries() (instalado en todas las conexiones, ver apps.py) le pasa
+cada consulta. Así se anotan también las consultas que una vista asíncrona
+lanza desde otros hilos (events.aio), que heredan el contexto de la petición.
+"""
+import heapq
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+
+from django.conf import settings
+
+
+# Consultas guardadas por petición como máximo
+MAX_QUERIES = 200
+
+
+class QueryRecorder:
+    """execute_wrapper que anota el SQL y la duración de cada consulta."""
+
+    def __init__(self):
+        self.queries = []
+        self.count = 0
+        self.total = 0.0
+        # Una petición asíncrona consulta desde varios hilos a la vez
+        self._lock = threading.Lock()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.count += 1
+                self.total += elapsed
+                if len(self.queries) < MAX_QUERIES:
+                    self.queries.append((sql, elapsed * 1000))
+
+
+current_recorder = ContextVar('diagnostics_recorder', default=None)
+
+
+def record_queries(execute, sql, params, many, context):
+    """execute_wrapper permanente: delega en el QueryRecorder de la petición, si hay."""
+    recorder = current_recorder.get()
+    if recorder is None:
+        return execute(sql, params, many, context)
+    return recorder(execute, sql, params, many, context)
+
+
+def install_recorder(sender, connection, **kwargs):
+    """Receptor de connection_created."""
+    if record_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_queries)
+
+
+class SlowRequests:
+    """Las `size` peticiones más lentas (un heap de mínimos por duración)."""
+
+    def __init__(self, size):
+        self.size = size
+        self._heap = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def offer(self, duration, **data):
+        # Sin lock si ni siquiera entra en el ranking
+        if len(self._heap) >= self.size and duration <= self._heap[0][0]:
+            return
+        entry = dict(data, id=next(self._ids), duration_ms=duration * 1000, at=time.time())
+        with self._lock:
+            item = (duration, entry['id'], entry)
+            if len(self._heap) < self.size:
+                heapq.heappush(self._heap, item)
+            elif duration > self._heap[0][0]:
+                heapq.heapreplace(self._heap, item)
+
+    def all(self):
+        with self._lock:
+            return [entry for _duration, _id, entry in sorted(self._heap, reverse=True)]
+
+    def get(self, entry_id):
+        return next((entry for entry in self.all() if entry['id'] == entry_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._heap.clear()
+
+
+class Profiles:
+    """Los últimos `size` perfiles, por id."""
+
+    def __init__(self, size):
+        self.size = size
+        self._items = OrderedDict()
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def add(self, **data):
+        profile_id = next(self._ids)
+        with self._lock:
+            self._items[profile_id] = dict(data, id=profile_id, at=time.time())
+            while len(self._items) > self.size:
+                self._items.popitem(last=False)
+        return profile_id
+
+    def all(self):
+        with self._lock:
+            return list(reversed(self._items.values()))
+
+    def get(self, profile_id):
+        with self._lock:
+            return self._items.get(profile_id)
+
+
+slow_requests = SlowRequests(settings.DIAGNOSTICS_SLOW_REQUESTS)
+profiles = Profiles(settings.DIAGNOSTICS_PROFILES)
@@ -0,0 +1,96 @@
+import asyncio
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from . import profiling, store
+from .middleware import ProfilingMiddleware
+
+
+def view(request):
+    return HttpResponse('ok')
+
+
+async def async_view(request):
+    return HttpResponse('ok')
+
+
+@override_settings(DIAGNOSTICS_ENABLED=True, DIAGNOSTICS_SAMPLE_INTERVAL=0.001)
+class ProfilingMiddlewareTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.staff = User.objects.create_user('staff', password='x', is_staff=True)
+        self.other_staff = User.objects.create_user('altre', password='x', is_staff=True)
+        self.member = User.objects.create_user('membre', password='x')
+        self.factory = RequestFactory()
+        store.slow_requests.clear()
+
+    def get(self, user, middleware=None, **extra):
+        request = self.factory.get('/events/', extra.pop('data', None), **extra)
+        request.user = user
+        return (middleware or ProfilingMiddleware(view))(request)
+
+    def test_profiles_only_with_the_staff_users_own_token(self):
+        response = self.get(self.staff, data={'_profile': profiling.make_token(self.staff, 'sample')})
+        profile = store.profiles.get(int(response['X-Profile-Id']))
+        self.assertEqual((profile['mode'], profile['path']), ('sample', '/events/'))
+
+        response = self.get(self.staff, HTTP_X_PROFILE=profiling.make_token(self.staff, 'cprofile'))
+        self.assertEqual(store.profiles.get(int(response['X-Profile-Id']))['mode'], 'cprofile')
+
+        for user, token in [
+            (self.staff, profiling.make_token(self.other_staff, 'sample')),
+            (self.staff, 'no-es-un-token'),
+            (self.member, profiling.make_token(self.member, 'sample')),
+            (AnonymousUser(), profiling.make_token(self.staff, 'sample')),
+        ]:
+            response = self.get(user, data={'_profile': token})
+            self.assertNotIn('X-Profile-Id', response)
+
+    def test_every_request_is_timed(self):
+        response = self.get(self.member, data={'_profile': 'x', 'page': '2'})
+
+        self.assertTrue(response['Server-Timing'].startswith('app;dur='))
+        entry = store.slow_requests.all()[0]
+        self.assertEqual((entry['path'], entry['user'], entry['status']), ('/events/?page=2', 'membre', 200))
+
+    def test_async_chain(self):
+        middleware = ProfilingMiddleware(async_view)
+        self.assertTrue(asyncio.iscoroutinefunction(middleware))
+
+        request = self.factory.get('/events/', {'_profile': profiling.make_token(self.staff, 'cprofile')})
+        request.user = self.staff
+        response = async_to_sync(middleware)(request)
+        # cProfile solo sigue a un hilo: en asíncrono se muestrea
+        self.assertEqual(store.profiles.get(int(response['X-Profile-Id']))['mode'], 'sample')
+
+    @override_settings(DIAGNOSTICS_ENABLED=False)
+    def test_disabled(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            ProfilingMiddleware(view)
+
+
+class SlowRequestsTests(SimpleTestCase):
+    def test_keeps_only_the_slowest(self):
+        slow = store.SlowRequests(3)
+        for duration in (0.1, 0.5, 0.2, 0.4, 0.3, 0.05):
+            slow.offer(duration, path=f'/{duration}')
+
+        entries = slow.all()
+        self.assertEqual([entry['path'] for entry in entries], ['/0.5', '/0.4', '/0.3'])
+        self.assertEqual(entries[0]['duration_ms'], 500)
+        self.assertEqual(slow.get(entries[1]['id'])['path'], '/0.4')
+
+    def test_ties_do_not_replace_the_fastest(self):
+        slow = store.SlowRequests(2)
+        slow.offer(0.2, path='/a')
+        slow.offer(0.3, path='/b')
+        slow.offer(0.2, path='/c')
+
+        self.assertEqual([entry['path'] for entry in slow.all()], ['/b', '/a'])
+        slow.clear()
+        self.assertEqual(slow.all(), [])
@@ -0,0 +1,12 @@
+from django.urls import path
+from . import views
+
+app_name = 'diagnostics'
+
+urlpatterns = [
+    path('', views.diagnostics_view, name='index'),
+    path('requests/<int:pk>/', views.slow_request_view, name='request'),
+    path('profiles/<int:pk>/', views.profile_view, name='profile'),
+    path('profiles/<int:pk>/<str:fmt>/', views.profile_download_view, name='profile_download'),
+    path('clear/', views.clear_view, name='clear'),
+]
@@ -0,0 +1,59 @@
+from django.contrib.auth.decorators import user_passes_test
+from django.http import Http404, HttpResponse
+from django.shortcuts import redirect, render
+from django.views.decorators.http import require_POST
+
+from . import profiling, store
+
+
+staff_required = user_passes_test(lambda user: user.is_active and user.is_staff)
+
+
+@staff_required
+def diagnostics_view(request):
+    """Peticiones más lentas, últimos perfiles y tokens para perfilar."""
+    context = {
+        'slow_requests': store.slow_requests.all(),
+        'profiles': store.profiles.all(),
+        'tokens': {mode: profiling.make_token(request.user, mode) for mode in profiling.MODES},
+        'max_age_minutes': profiling.TOKEN_MAX_AGE // 60,
+    }
+    return render(request, 'diagnostics/index.html', context)
+
+
+@staff_required
+def slow_request_view(request, pk):
+    entry = store.slow_requests.get(pk)
+    if entry is None:
+        raise Http404('Petición no encontrada (el ranking se reinicia con el proceso).')
+    return render(request, 'diagnostics/request_detail.html', {'entry': entry})
+
+
+@staff_required
+def profile_view(request, pk):
+    profile = store.profiles.get(pk)
+    if profile is None:
+        raise Http404('Perfil no encontrado.')
+    return render(request, 'diagnostics/profile_detail.html', {'profile': profile})
+
+
+@staff_required
+def profile_download_view(request, pk, fmt):
+    """Pilas colapsadas (flamegraph.pl, speedscope) o .prof de cProfile."""
+    profile = store.profiles.get(pk)
+    if profile is None or fmt not in ('collapsed', 'prof') or fmt not in profile:
+        raise Http404('Perfil no encontrado.')
+    if fmt == 'collapsed':
+        response = HttpResponse(profile['collapsed'], content_type='text/plain; charset=utf-8')
+        response['Content-Disposition'] = f'attachment; filename="profile-{pk}.collapsed.txt"'
+    else:
+        response = HttpResponse(profile['prof'], content_type='application/octet-stream')
+        response['Content-Disposition'] = f'attachment; filename="profile-{pk}.prof"'
+    return response
+
+
+@staff_required
+@require_POST
+def clear_view(request):
+    store.slow_requests.clear()
+    return redirect('diagnostics:index')
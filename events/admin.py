@@ -1,3 +1,61 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.db import transaction
+from django.utils import timezone
 
-# Register your models here.
+from config.paginators import EstimatedCountPaginator
+from outbox.models import ChangeRecord
+from outbox.records import record_queryset
+from . import archive, stats
+from .models import ArchivedEvent, Event
+
+
+def _make_status_action(status, label):
+    """Acción masiva que cambia el estado con un único UPDATE."""
+    def action(modeladmin, request, queryset):
+        creator_ids = set(queryset.values_list('creator_id', flat=True).distinct())
+        event_ids = list(queryset.values_list('pk', flat=True))
+        with transaction.atomic():
+            updated = Event.objects.filter(pk__in=event_ids).update(status=status, updated_at=timezone.now())
+            # update() no dispara señales: recalculamos las estadísticas y registramos los cambios
+            stats.recompute(creator_ids)
+            record_queryset(Event.objects.filter(pk__in=event_ids), ChangeRecord.OP_UPDATE)
+        modeladmin.message_user(
+            request,
+            f'{updated} evento(s) marcados como "{label}".',
+            messages.SUCCESS,
+        )
+    action.__name__ = f'mark_{status}'
+    action.short_description = f'Marcar como "{label}"'
+    return action
+
+
+@admin.register(Event)
+class EventAdmin(admin.ModelAdmin):
+    list_display = ('title', 'creator', 'category', 'difficulty', 'status', 'scheduled_for', 'is_featured')
+    list_select_related = ('creator',)
+    list_filter = ('status', 'category', 'difficulty', 'is_featured')
+    search_fields = ('^title', '^creator__username')
+    autocomplete_fields = ('creator',)
+    readonly_fields = ('created_at', 'updated_at')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = [_make_status_action(value, label) for value, label in Event.STATUS_CHOICES]
+
+
+@admin.action(description='Restaurar eventos seleccionados')
+def restore_events(modeladmin, request, queryset):
+    restored = archive.restore(queryset)
+    modeladmin.message_user(request, f'{restored} evento(s) restaurados.', messages.SUCCESS)
+
+
+@admin.register(ArchivedEvent)
+class ArchivedEventAdmin(admin.ModelAdmin):
+    list_display = ('title', 'creator', 'status', 'scheduled_for', 'archived_at')
+    list_select_related = ('creator',)
+    list_filter = ('status',)
+    search_fields = ('^title', '^creator__username', '=original_id')
+    raw_id_fields = ('creator',)
+    readonly_fields = ('original_id', 'payload', 'archived_at')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = [restore_events]
@@ -0,0 +1,83 @@
+"""
+Acceso a datos desde vistas asíncronas.
+
+Django 3.2 no tiene ORM asíncrono: las consultas se ejecutan en un pool
+propio de ASYNC_DB_WORKERS hilos, de modo que varias consultas
+independientes de una misma petición pueden ir en paralelo con
+asyncio.gather() y la petición no bloquea el bucle de eventos mientras
+espera a la base de datos. Cada hilo del pool conserva su conexión entre
+peticiones (CONN_MAX_AGE): el pool acotado limita las conexiones abiertas y
+evita abrir una por consulta. close_old_connections() la cierra solo si ha
+caducado o ha dado errores.
+"""
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.shortcuts import render as _render
+
+from diagnostics.profiling import track_thread
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=settings.ASYNC_DB_WORKERS, thread_name_prefix='aio-db')
+    return _executor
+
+
+def _call(func, args, kwargs):
+    try:
+        # Con un perfil por muestreo en curso, este hilo también se muestrea
+        with track_thread():
+            return func(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
+async def run(func, *args, **kwargs):
+    """Ejecuta `func` (que puede consultar la base de datos) en el pool de hilos."""
+    loop = asyncio.get_running_loop()
+    # Como sync_to_async, la función ve las contextvars de la petición
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(executor(), functools.partial(context.run, _call, func, args, kwargs))
+
+
+async def fetch(queryset):
+    """Evalúa un queryset en el pool y devuelve la lista de resultados."""
+    return await run(list, queryset)
+
+
+def _load_user(request):
+    request.user.is_authenticated  # fuerza la carga perezosa de la sesión y del usuario
+    return request.user
+
+
+async def get_user(request):
+    """
+    Resuelve request.user (sesión y usuario) fuera del bucle de eventos. A
+    partir de aquí la plantilla y el resto de la vista pueden usarlo sin
+    consultas.
+    """
+    return await sync_to_async(_load_user)(request)
+
+
+def _tracked_render(*args, **kwargs):
+    with track_thread():
+        return _render(*args, **kwargs)
+
+
+# El renderizado evalúa plantillas que pueden tocar la sesión o los mensajes:
+# se hace en el hilo síncrono principal, como las vistas síncronas
+render = sync_to_async(_tracked_render)
@@ -0,0 +1,280 @@
+"""
+Analítica de eventos sin escrituras por visita.
+
+Las visitas y accesos se acumulan en contadores en memoria repartidos en
+shards (cada uno con su propio lock) y se vuelcan a la base de datos en lote
+cada ANALYTICS_FLUSH_INTERVAL segundos:
+
+- EventStatsBucket: contadores por evento y hora (rollup_event_stats los
+  agrega después por día).
+- EventPopularity: totales, puntuación "trending" con decaimiento y un
+  sketch HyperLogLog de espectadores únicos.
+
+El volcado corre en un hilo aparte para no alargar ni tumbar la petición
+que lo dispara; si la escritura falla, lo drenado vuelve a los shards y se
+reintenta en el siguiente volcado.
+"""
+import atexit
+import hashlib
+import logging
+import math
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import stats
+from .models import Event, EventPopularity, EventStatsBucket
+
+
+logger = logging.getLogger(__name__)
+
+TRENDING_EPOCH = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+# Un acceso al streaming vale más que una visita a la ficha
+JOIN_WEIGHT = 5
+
+
+class HyperLogLog:
+    """Sketch HyperLogLog (2 ** p registros de un byte) para contar valores distintos."""
+
+    def __init__(self, p=10, registers=None):
+        self.p = p
+        self.m = 1 << p
+        self.registers = bytearray(registers) if registers else bytearray(self.m)
+
+    @classmethod
+    def from_bytes(cls, data):
+        data = bytes(data or b'')
+        if not data:
+            return cls()
+        return cls(p=int(math.log2(len(data))), registers=data)
+
+    def to_bytes(self):
+        return bytes(self.registers)
+
+    @staticmethod
+    def hash(value):
+        return int.from_bytes(hashlib.blake2b(str(value).encode(), digest_size=8).digest(), 'big')
+
+    def add_hash(self, h):
+        index = h >> (64 - self.p)
+        rest = h & ((1 << (64 - self.p)) - 1)
+        rank = (64 - self.p) - rest.bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def add(self, value):
+        self.add_hash(self.hash(value))
+
+    def count(self):
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        estimate = alpha * self.m * self.m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * self.m and zeros:
+            # Corrección para cardinalidades pequeñas (linear counting)
+            estimate = self.m * math.log(self.m / zeros)
+        return int(round(estimate))
+
+
+def trending_contribution(weight, when):
+    """log2(weight * 2 ** ((when - TRENDING_EPOCH) / vida media))."""
+    half_life = settings.TRENDING_HALF_LIFE_HOURS * 3600
+    return math.log2(weight) + (when - TRENDING_EPOCH).total_seconds() / half_life
+
+
+def log2_add(a, b):
+    """log2(2 ** a + 2 ** b) sin desbordamientos."""
+    if a is None:
+        return b
+    high, low = max(a, b), min(a, b)
+    return high + math.log2(1 + 2 ** (low - high))
+
+
+def hour_bucket(when):
+    return when.replace(minute=0, second=0, microsecond=0)
+
+
+class _Pending:
+    __slots__ = ('views', 'joins', 'viewers')
+
+    def __init__(self):
+        self.views = 0
+        self.joins = 0
+        self.viewers = set()
+
+
+class EventCounters:
+    """Contadores en memoria repartidos en shards para no serializar las peticiones."""
+
+    def __init__(self, shards=16):
+        self._shards = [(threading.Lock(), {}) for _ in range(shards)]
+        self._flush_lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def record(self, event_id, views=0, joins=0, viewer=None):
+        key = (event_id, hour_bucket(timezone.now()))
+        lock, data = self._shards[event_id % len(self._shards)]
+        with lock:
+            pending = data.get(key)
+            if pending is None:
+                pending = data[key] = _Pending()
+            pending.views += views
+            pending.joins += joins
+            if viewer is not None:
+                pending.viewers.add(HyperLogLog.hash(viewer))
+
+    def drain(self):
+        """Vacía los shards y devuelve lo acumulado: {(event_id, hora): _Pending}."""
+        drained = {}
+        for lock, data in self._shards:
+            with lock:
+                drained.update(data)
+                data.clear()
+        return drained
+
+    def restore(self, drained):
+        """Devuelve a los shards lo drenado que no se ha podido escribir."""
+        for (event_id, bucket_start), counts in drained.items():
+            lock, data = self._shards[event_id % len(self._shards)]
+            with lock:
+                pending = data.get((event_id, bucket_start))
+                if pending is None:
+                    pending = data[(event_id, bucket_start)] = _Pending()
+                pending.views += counts.views
+                pending.joins += counts.joins
+                pending.viewers |= counts.viewers
+
+    def flush_due(self):
+        return time.monotonic() - self._last_flush >= settings.ANALYTICS_FLUSH_INTERVAL
+
+    def maybe_flush(self):
+        """Lanza el volcado en segundo plano si toca y no hay otro en curso."""
+        if self.flush_due() and self._flush_lock.acquire(blocking=False):
+            self._last_flush = time.monotonic()
+            threading.Thread(target=self._background_flush, daemon=True).start()
+
+    def _background_flush(self):
+        try:
+            self.flush()
+        finally:
+            # El hilo tiene su propia conexión a la base de datos
+            connection.close()
+            self._flush_lock.release()
+
+    def flush(self):
+        """Escribe lo acumulado. Devuelve cuántos buckets se han escrito (0 si falla)."""
+        self._last_flush = time.monotonic()
+        pending = self.drain()
+        if not pending:
+            return 0
+        try:
+            write_stats(pending)
+        except Exception:
+            self.restore(pending)
+            logger.exception('No se han podido volcar las estadísticas de %d buckets', len(pending))
+            return 0
+        return len(pending)
+
+
+def _add_to_bucket(event_id, bucket_start, views, joins):
+    updated = EventStatsBucket.objects.filter(
+        event_id=event_id,
+        granularity=EventStatsBucket.GRANULARITY_HOUR,
+        bucket_start=bucket_start,
+    ).update(views=F('views') + views, joins=F('joins') + joins)
+    if updated:
+        return
+    try:
+        with transaction.atomic():
+            EventStatsBucket.objects.create(
+                event_id=event_id,
+                granularity=EventStatsBucket.GRANULARITY_HOUR,
+                bucket_start=bucket_start,
+                views=views,
+                joins=joins,
+            )
+    except IntegrityError:
+        # Otro proceso ha creado el bucket a la vez
+        EventStatsBucket.objects.filter(
+            event_id=event_id,
+            granularity=EventStatsBucket.GRANULARITY_HOUR,
+            bucket_start=bucket_start,
+        ).update(views=F('views') + views, joins=F('joins') + joins)
+
+
+@transaction.atomic
+def write_stats(pending):
+    """Vuelca a la base de datos los contadores acumulados por EventCounters."""
+    # Descartamos las visitas de eventos borrados desde que se registraron
+    event_ids = {event_id for event_id, _bucket in pending}
+    alive = dict(Event.objects.filter(pk__in=event_ids).values_list('pk', 'creator_id'))
+
+    per_event = defaultdict(_Pending)
+    for (event_id, bucket_start), counts in sorted(pending.items()):
+        if event_id not in alive:
+            continue
+        _add_to_bucket(event_id, bucket_start, counts.views, counts.joins)
+        total = per_event[event_id]
+        total.views += counts.views
+        total.joins += counts.joins
+        total.viewers |= counts.viewers
+
+    now = timezone.now()
+    existing = EventPopularity.objects.select_for_update().in_bulk(list(per_event))
+    missing = [event_id for event_id in per_event if event_id not in existing]
+    for event_id in missing:
+        # get_or_create reintenta la lectura si otro proceso crea la fila a la vez
+        EventPopularity.objects.get_or_create(event_id=event_id)
+    if missing:
+        existing.update(EventPopularity.objects.select_for_update().in_bulk(missing))
+    for event_id, counts in per_event.items():
+        popularity = existing[event_id]
+        popularity.views += counts.views
+        popularity.joins += counts.joins
+        popularity.updated_at = now
+        weight = counts.views + JOIN_WEIGHT * counts.joins
+        if weight:
+            popularity.trending_score = log2_add(popularity.trending_score, trending_contribution(weight, now))
+        if counts.viewers:
+            sketch = HyperLogLog.from_bytes(popularity.viewers_sketch)
+            for h in counts.viewers:
+                sketch.add_hash(h)
+            popularity.viewers_sketch = sketch.to_bytes()
+
+    EventPopularity.objects.bulk_update(
+        existing.values(), ['views', 'joins', 'trending_score', 'viewers_sketch', 'updated_at']
+    )
+
+    views_by_creator = defaultdict(int)
+    for event_id, counts in per_event.items():
+        views_by_creator[alive[event_id]] += counts.views
+    for creator_id, views in views_by_creator.items():
+        stats.bump(creator_id, total_views=views)
+
+
+counters = EventCounters()
+atexit.register(counters.flush)
+
+
+def viewer_key(request):
+    """Identificador estable del espectador para el recuento de únicos."""
+    if request.user.is_authenticated:
+        return f'user:{request.user.pk}'
+    if request.session.session_key:
+        return f'session:{request.session.session_key}'
+    return f"anon:{request.META.get('REMOTE_ADDR', '')}:{request.META.get('HTTP_USER_AGENT', '')}"
+
+
+def record_view(request, event_id):
+    counters.record(event_id, views=1, viewer=viewer_key(request))
+    counters.maybe_flush()
+
+
+def record_join(request, event_id):
+    counters.record(event_id, joins=1, viewer=viewer_key(request))
+    counters.maybe_flush()
@@ -0,0 +1,43 @@
+"""
+Representación JSON de los eventos para /events/api/.
+
+Las funciones reciben objetos ya cargados (o querysets) y no hacen más
+consultas que las suyas, así sirven tanto a las vistas síncronas de
+events.views como a las asíncronas de events.async_views.
+"""
+PAGE_SIZE = 50
+
+
+def event_data(event):
+    return {
+        'id': event.pk,
+        'title': event.title,
+        'category': event.category,
+        'difficulty': event.difficulty,
+        'status': event.status,
+        'scheduled_for': event.scheduled_for.isoformat(),
+        'ends_at': event.ends_at.isoformat() if event.ends_at else None,
+        'tags': event.tags,
+        'creator': event.creator.username,
+    }
+
+
+def list_payload(facet_options, events):
+    return {
+        'results': [event_data(event) for event in events],
+        'facets': {
+            facet: {option['value']: option['count'] for option in options}
+            for facet, options in facet_options.items()
+        },
+    }
+
+
+def detail_payload(event, similar):
+    data = event_data(event)
+    data['description'] = event.description
+    data['stream_url'] = event.stream_url
+    data['archived'] = getattr(event, 'is_archived', False)
+    popularity = None if data['archived'] else getattr(event, 'popularity', None)
+    data['views'] = popularity.views if popularity else 0
+    data['similar'] = [event_data(e) for e in similar]
+    return data
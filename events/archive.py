@@ -0,0 +1,155 @@
+"""
+Archivado de eventos terminados.
+
+Los eventos finalizados o cancelados con más antigüedad que la retención
+se copian a ArchivedEvent y se borran de Event por lotes, de modo que la
+tabla principal (y todas sus consultas) solo contiene inventario vivo y
+próximo. La ficha de un evento archivado sigue accesible (ver
+event_detail_view) y restore() los devuelve a Event con el mismo id.
+
+Las filas que cuelgan del evento y se borrarían en cascada (popularidad,
+buckets de estadísticas y notificaciones) viajan en el mismo payload y se
+reconstruyen al restaurar. Las visitas se guardan además en
+ArchivedEvent.views para que CreatorStats.total_views no baje al archivar.
+SimilarEvent y UserRecommendation no se guardan: son derivados y
+compute_recommendations los vuelve a generar.
+"""
+import json
+from collections import defaultdict
+
+from django.db import transaction
+
+from notifications.models import Notification
+from outbox.models import ChangeRecord
+from outbox.records import record_objects
+from . import stats
+from .models import ArchivedEvent, Event, EventPopularity, EventStatsBucket
+
+
+ARCHIVABLE_STATUSES = (Event.STATUS_FINISHED, Event.STATUS_CANCELLED)
+
+
+def _dump(model, obj):
+    return {
+        field.attname: None if field.value_from_object(obj) is None else field.value_to_string(obj)
+        for field in model._meta.concrete_fields
+    }
+
+
+def _load(model, data):
+    values = {}
+    for field in model._meta.concrete_fields:
+        if field.attname in data:
+            value = data[field.attname]
+            values[field.attname] = None if value in (None, '') and field.null else field.to_python(value)
+    return model(**values)
+
+
+def serialize_event(event, popularity=None, buckets=(), notifications=()):
+    return json.dumps(
+        {
+            'event': _dump(Event, event),
+            'popularity': _dump(EventPopularity, popularity) if popularity else None,
+            'buckets': [_dump(EventStatsBucket, bucket) for bucket in buckets],
+            'notifications': [_dump(Notification, notification) for notification in notifications],
+        },
+        ensure_ascii=False,
+    )
+
+
+def _payload(payload):
+    data = json.loads(payload)
+    # Los primeros archivados guardaban solo los campos del evento
+    return data if 'event' in data else {'event': data}
+
+
+def deserialize_event(payload):
+    return _load(Event, _payload(payload)['event'])
+
+
+def deserialize_related(payload):
+    """(popularidad o None, buckets, notificaciones) sin guardar del payload."""
+    data = _payload(payload)
+    popularity = data.get('popularity')
+    return (
+        _load(EventPopularity, popularity) if popularity else None,
+        [_load(EventStatsBucket, bucket) for bucket in data.get('buckets', ())],
+        [_load(Notification, notification) for notification in data.get('notifications', ())],
+    )
+
+
+def to_event(archived):
+    """Event sin guardar para mostrar la ficha de un evento archivado."""
+    event = deserialize_event(archived.payload)
+    event.is_archived = True
+    return event
+
+
+def archivable(cutoff):
+    return Event.objects.filter(status__in=ARCHIVABLE_STATUSES, scheduled_for__lt=cutoff)
+
+
+def _group(queryset):
+    grouped = defaultdict(list)
+    for obj in queryset:
+        grouped[obj.event_id].append(obj)
+    return grouped
+
+
+def archive(cutoff, batch_size=500):
+    """Archiva por lotes los eventos anteriores a `cutoff`. Devuelve un iterador de tamaños de lote."""
+    while True:
+        events = list(archivable(cutoff).order_by('pk')[:batch_size])
+        if not events:
+            return
+        ids = [event.pk for event in events]
+        with transaction.atomic(), stats.deferred():
+            popularity = EventPopularity.objects.in_bulk(ids, field_name='event_id')
+            buckets = _group(EventStatsBucket.objects.filter(event_id__in=ids).order_by('pk'))
+            notifications = _group(Notification.objects.filter(event_id__in=ids).order_by('pk'))
+            ArchivedEvent.objects.bulk_create([
+                ArchivedEvent(
+                    original_id=event.pk,
+                    creator_id=event.creator_id,
+                    title=event.title,
+                    status=event.status,
+                    scheduled_for=event.scheduled_for,
+                    views=popularity[event.pk].views if event.pk in popularity else 0,
+                    payload=serialize_event(
+                        event,
+                        popularity.get(event.pk),
+                        buckets.get(event.pk, ()),
+                        notifications.get(event.pk, ()),
+                    ),
+                )
+                for event in events
+            ])
+            Event.objects.filter(pk__in=ids).delete()
+            stats.recompute({event.creator_id for event in events})
+        yield len(events)
+
+
+def restore(queryset, batch_size=500):
+    """Devuelve a Event los ArchivedEvent de `queryset`, conservando sus ids."""
+    restored = 0
+    while True:
+        batch = list(queryset.order_by('pk')[:batch_size])
+        if not batch:
+            return restored
+        events = [deserialize_event(archived.payload) for archived in batch]
+        popularity, buckets, notifications = [], [], []
+        for archived in batch:
+            event_popularity, event_buckets, event_notifications = deserialize_related(archived.payload)
+            if event_popularity is not None:
+                popularity.append(event_popularity)
+            buckets.extend(event_buckets)
+            notifications.extend(event_notifications)
+        with transaction.atomic(), stats.deferred():
+            Event.objects.bulk_create(events)
+            EventPopularity.objects.bulk_create(popularity)
+            EventStatsBucket.objects.bulk_create(buckets, batch_size=1000)
+            Notification.objects.bulk_create(notifications, batch_size=1000)
+            ArchivedEvent.objects.filter(pk__in=[archived.pk for archived in batch]).delete()
+            stats.recompute({event.creator_id for event in events})
+            record_objects(events, ChangeRecord.OP_CREATE)
+        restored += len(events)
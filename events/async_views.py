@@ -0,0 +1,77 @@
+"""
+Versiones asíncronas de las vistas de lectura de events.views.
+
+Se sirven en lugar de las síncronas cuando ASYNC_VIEWS está activo (lo
+activa config/asgi.py). Reutilizan los mismos querysets; las consultas
+independientes se lanzan a la vez con asyncio.gather() a través de
+events.aio.
+"""
+import asyncio
+
+from django.http import JsonResponse
+
+from . import aio, analytics, api, facets
+from .views import (
+    filter_events, find_event, list_page, list_params, page_context, recommended_events, search_events,
+    similar_events,
+)
+
+
+async def event_list_view(request):
+    """Listado principal de eventos con búsqueda y filtros."""
+    q, filters, order = list_params(request)
+    user = await aio.get_user(request)
+    events = search_events(q)
+    page_events, page = list_page(request, filter_events(events, filters, order))
+
+    queries = [
+        aio.run(facets.facet_counts, events, q, filters),
+        aio.fetch(page_events),
+    ]
+    if user.is_authenticated and not (q or any(filters.values())):
+        queries.append(aio.fetch(recommended_events(user)))
+    facet_options, event_list, *recommended = await asyncio.gather(*queries)
+
+    context = {
+        **page_context(request, event_list, page),
+        'recommended': recommended[0] if recommended else [],
+        'q': q,
+        'facets': facet_options,
+        'order': order,
+    }
+    return await aio.render(request, 'events/event_list.html', context)
+
+
+async def event_detail_view(request, pk):
+    """Detalle de un evento concreto."""
+    await aio.get_user(request)
+    event, similar = await asyncio.gather(
+        aio.run(find_event, pk),
+        aio.fetch(similar_events(pk)),
+    )
+    if getattr(event, 'is_archived', False):
+        return await aio.render(request, 'events/event_detail.html', {'event': event, 'archived': True})
+
+    await aio.run(analytics.record_view, request, event.pk)
+    return await aio.render(request, 'events/event_detail.html', {'event': event, 'similar_events': similar})
+
+
+async def event_list_api(request):
+    """Listado en JSON con los mismos filtros que event_list_view."""
+    q, filters, order = list_params(request)
+    events = search_events(q)
+    facet_options, event_list = await asyncio.gather(
+        aio.run(facets.facet_counts, events, q, filters),
+        aio.fetch(filter_events(events, filters, order)[:api.PAGE_SIZE]),
+    )
+    return JsonResponse(api.list_payload(facet_options, event_list))
+
+
+async def event_detail_api(request, pk):
+    event, similar = await asyncio.gather(
+        aio.run(find_event, pk),
+        aio.fetch(similar_events(pk)),
+    )
+    if getattr(event, 'is_archived', False):
+        similar = []
+    return JsonResponse(api.detail_payload(event, similar))
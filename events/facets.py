@@ -0,0 +1,83 @@
+"""
+Recuentos por faceta (categoría, estado y nivel) del listado de eventos.
+
+Todos los recuentos salen de una única consulta agrupada por las tres
+facetas (como mucho |categorías| × |estados| × |niveles| filas) sobre los
+eventos que cumplen la búsqueda de texto. Cada faceta se calcula en Python
+aplicando el resto de filtros activos pero no el suyo, de modo que el
+desplegable muestra cuántos eventos habría al cambiar esa opción.
+
+El resultado se guarda en caché con los filtros como clave. Cualquier
+cambio de un evento incrementa la versión y deja obsoletas todas las
+entradas; las escrituras masivas (que no disparan señales) se reflejan al
+caducar FACET_CACHE_TIMEOUT.
+"""
+import hashlib
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+
+from .models import Event
+
+
+FACETS = {
+    'category': Event.CATEGORY_CHOICES,
+    'status': Event.STATUS_CHOICES,
+    'difficulty': Event.DIFFICULTY_CHOICES,
+}
+
+VERSION_KEY = 'event-facets:version'
+
+
+def invalidate():
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 1, None)
+
+
+def _cache_key(q, filters):
+    version = cache.get(VERSION_KEY, 0)
+    raw = '|'.join([q.lower()] + [filters.get(facet, '') for facet in FACETS])
+    return f'event-facets:{version}:{hashlib.md5(raw.encode()).hexdigest()}'
+
+
+def compute_counts(queryset, filters):
+    """{faceta: {valor: n}} condicionados al resto de filtros de `filters`."""
+    counts = {facet: defaultdict(int) for facet in FACETS}
+    for row in queryset.order_by().values(*FACETS).annotate(n=Count('pk')):
+        for facet in FACETS:
+            if all(
+                not filters.get(other) or row[other] == filters[other]
+                for other in FACETS if other != facet
+            ):
+                counts[facet][row[facet]] += row['n']
+    return counts
+
+
+def facet_counts(queryset, q, filters):
+    """
+    Opciones de cada faceta listas para la plantilla:
+    {faceta: [{'value', 'label', 'count', 'selected'}, ...]}.
+    `queryset` debe tener aplicada solo la búsqueda de texto `q`.
+    """
+    key = _cache_key(q, filters)
+    counts = cache.get(key)
+    if counts is None:
+        counts = {facet: dict(values) for facet, values in compute_counts(queryset, filters).items()}
+        cache.set(key, counts, settings.FACET_CACHE_TIMEOUT)
+
+    return {
+        facet: [
+            {
+                'value': value,
+                'label': label,
+                'count': counts[facet].get(value, 0),
+                'selected': filters.get(facet) == value,
+            }
+            for value, label in choices
+        ]
+        for facet, choices in FACETS.items()
+    }
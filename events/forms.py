@@ -1,3 +1,5 @@
+from datetime import timedelta
+
 from django import forms
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
@@ -5,6 +7,15 @@ from django.utils.translation import gettext_lazy as _
 from .models import Event
 
 
+def normalize_tags(value):
+    """Normaliza una lista de etiquetas separadas por comas: sin espacios extra ni duplicados."""
+    tags = (value or '').strip()
+    if not tags:
+        return ''
+    parts = [t.strip() for t in tags.split(',') if t.strip()]
+    return ', '.join(sorted(set(parts)))
+
+
 class EventForm(forms.ModelForm):
     scheduled_for = forms.DateTimeField(
         label=_('Fecha y hora'),
@@ -46,6 +57,41 @@ class EventForm(forms.ModelForm):
             'is_featured': forms.CheckboxInput(attrs={'class': 'form-check-input'}),
         }
 
+    def __init__(self, *args, creator=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Solo necesitamos el id del creador para comprobar solapamientos
+        self.creator_id = creator.pk if creator is not None else self.instance.creator_id
+
+    def get_intervals(self, start, duration):
+        """Franjas [inicio, fin) que ocupará el evento."""
+        return [(start, start + timedelta(minutes=duration))]
+
+    def clean(self):
+        cleaned = super().clean()
+        start = cleaned.get('scheduled_for')
+        if start is None or self.creator_id is None or cleaned.get('status') == Event.STATUS_CANCELLED:
+            return cleaned
+        duration = cleaned.get('duration_minutes') or Event.DEFAULT_DURATION_BY_CATEGORY.get(cleaned.get('category'))
+        if not duration:
+            return cleaned
+
+        clash = (
+            Event.objects
+            .filter(creator_id=self.creator_id)
+            .exclude(status=Event.STATUS_CANCELLED)
+            .exclude(pk=self.instance.pk)
+            .overlapping_any(self.get_intervals(start, duration))
+            .order_by('scheduled_for')
+            .only('title', 'scheduled_for')
+            .first()
+        )
+        if clash is not None:
+            self.add_error('scheduled_for', _('Se solapa con "%(title)s" (%(date)s).') % {
+                'title': clash.title,
+                'date': timezone.localtime(clash.scheduled_for).strftime('%d/%m/%Y %H:%M'),
+            })
+        return cleaned
+
     def clean_scheduled_for(self):
         dt = self.cleaned_data['scheduled_for']
         if dt < timezone.now():
@@ -53,9 +99,63 @@ class EventForm(forms.ModelForm):
         return dt
 
     def clean_tags(self):
-        tags = (self.cleaned_data.get('tags') or '').strip()
-        # Normalizar: quitar espacios extra y duplicados
-        if not tags:
-            return ''
-        parts = [t.strip() for t in tags.split(',') if t.strip()]
-        return ', '.join(sorted(set(parts)))
+        return normalize_tags(self.cleaned_data.get('tags'))
+
+
+class EventRecurrenceForm(EventForm):
+    """Evento base más una regla de repetición que se expande en varias fechas."""
+    FREQUENCY_DAILY = 'daily'
+    FREQUENCY_WEEKLY = 'weekly'
+    FREQUENCY_BIWEEKLY = 'biweekly'
+
+    FREQUENCY_CHOICES = [
+        (FREQUENCY_DAILY, _('Cada día')),
+        (FREQUENCY_WEEKLY, _('Cada semana')),
+        (FREQUENCY_BIWEEKLY, _('Cada dos semanas')),
+    ]
+
+    FREQUENCY_STEPS = {
+        FREQUENCY_DAILY: timedelta(days=1),
+        FREQUENCY_WEEKLY: timedelta(weeks=1),
+        FREQUENCY_BIWEEKLY: timedelta(weeks=2),
+    }
+
+    frequency = forms.ChoiceField(
+        label=_('Repetición'),
+        choices=FREQUENCY_CHOICES,
+        initial=FREQUENCY_WEEKLY,
+        widget=forms.Select(attrs={'class': 'form-select'})
+    )
+    occurrences = forms.IntegerField(
+        label=_('Número de sesiones'),
+        min_value=2,
+        max_value=100,
+        initial=4,
+        widget=forms.NumberInput(attrs={'class': 'form-control', 'min': 2, 'max': 100})
+    )
+
+    def get_intervals(self, start, duration):
+        frequency = self.cleaned_data.get('frequency')
+        occurrences = self.cleaned_data.get('occurrences')
+        if not frequency or not occurrences:
+            return super().get_intervals(start, duration)
+        step = self.FREQUENCY_STEPS[frequency]
+        length = timedelta(minutes=duration)
+        return [(start + step * i, start + step * i + length) for i in range(occurrences)]
+
+
+class EventImportForm(forms.Form):
+    """Subida de un fichero CSV o JSON con varios eventos."""
+    file = forms.FileField(
+        label=_('Fichero CSV o JSON'),
+        help_text=_('Columnas: title, description, category, difficulty, scheduled_for, '
+                    'status, max_viewers, duration_minutes, tags, stream_url, is_featured'),
+        widget=forms.ClearableFileInput(attrs={'class': 'form-control', 'accept': '.csv,.json'})
+    )
+
+    def clean_file(self):
+        upload = self.cleaned_data['file']
+        name = upload.name.lower()
+        if not (name.endswith('.csv') or name.endswith('.json')):
+            raise forms.ValidationError(_('El fichero debe ser .csv o .json.'))
+        return upload
@@ -0,0 +1,240 @@
+import csv
+import io
+import json
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from outbox import records
+from . import stats
+from .forms import EventRecurrenceForm, normalize_tags
+from .models import MAX_DURATION_MINUTES, Event
+
+
+MAX_IMPORT_ROWS = 5000
+BULK_BATCH_SIZE = 500
+
+_CATEGORIES = {value for value, _label in Event.CATEGORY_CHOICES}
+_DIFFICULTIES = {value for value, _label in Event.DIFFICULTY_CHOICES}
+_STATUSES = {value for value, _label in Event.STATUS_CHOICES}
+_TRUE_VALUES = {'1', 'true', 'yes', 'si', 'sí', 'on'}
+_TEXT_FIELDS = ('title', 'description', 'category', 'difficulty', 'status', 'tags', 'stream_url')
+TITLE_MAX_LENGTH = Event._meta.get_field('title').max_length
+
+
+class EventImportError(Exception):
+    """Errores de validación acumulados de un fichero de importación."""
+
+    def __init__(self, errors):
+        self.errors = errors
+        super().__init__('; '.join(errors))
+
+
+def read_rows(upload):
+    """Lee un fichero CSV o JSON subido y devuelve una lista de diccionarios."""
+    raw = upload.read()
+    if isinstance(raw, bytes):
+        try:
+            raw = raw.decode('utf-8-sig')
+        except UnicodeDecodeError:
+            raise EventImportError(['El fichero debe estar codificado en UTF-8.'])
+
+    if upload.name.lower().endswith('.json'):
+        try:
+            rows = json.loads(raw)
+        except ValueError as exc:
+            raise EventImportError([f'JSON no válido: {exc}'])
+        if not isinstance(rows, list) or not all(isinstance(r, dict) for r in rows):
+            raise EventImportError(['El JSON debe ser una lista de objetos.'])
+    else:
+        rows = list(csv.DictReader(io.StringIO(raw)))
+
+    if len(rows) > MAX_IMPORT_ROWS:
+        raise EventImportError([f'Como máximo se pueden importar {MAX_IMPORT_ROWS} eventos a la vez.'])
+    return rows
+
+
+def _to_text(value):
+    """Texto de una celda; en JSON se aceptan números, pero no listas ni objetos."""
+    if value is None:
+        return ''
+    if isinstance(value, str):
+        return value.strip()
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    raise ValueError(value)
+
+
+def _to_int(value, default=None):
+    if value in (None, ''):
+        return default
+    return int(value)
+
+
+def build_events(rows, creator):
+    """
+    Valida todas las filas en una sola pasada y devuelve los Event sin guardar.
+    Si alguna fila es incorrecta se lanza EventImportError con todos los errores.
+    """
+    now = timezone.now()
+    tz = timezone.get_current_timezone()
+    events = []
+    errors = []
+
+    for number, row in enumerate(rows, start=1):
+        row_errors = []
+        if isinstance(row.get('tags'), list) and all(isinstance(tag, str) for tag in row['tags']):
+            row = dict(row, tags=','.join(row['tags']))
+        text = {}
+        for field in _TEXT_FIELDS:
+            try:
+                text[field] = _to_text(row.get(field))
+            except ValueError:
+                row_errors.append(f'valor no válido en "{field}"')
+                text[field] = None
+        title = text['title']
+        category = text['category']
+        difficulty = Event.DIFFICULTY_BEGINNER if text['difficulty'] == '' else text['difficulty']
+        status = Event.STATUS_DRAFT if text['status'] == '' else text['status']
+
+        # None: valor no válido, ya anotado
+        if title == '':
+            row_errors.append('falta el título')
+        elif title is not None and len(title) > TITLE_MAX_LENGTH:
+            row_errors.append(f'el título supera los {TITLE_MAX_LENGTH} caracteres')
+        if category is not None and category not in _CATEGORIES:
+            row_errors.append(f'categoría desconocida "{category}"')
+        if difficulty is not None and difficulty not in _DIFFICULTIES:
+            row_errors.append(f'nivel desconocido "{difficulty}"')
+        if status is not None and status not in _STATUSES:
+            row_errors.append(f'estado desconocido "{status}"')
+
+        scheduled_for = row.get('scheduled_for')
+        try:
+            # parse_datetime lanza ValueError si la fecha tiene formato pero no existe
+            scheduled_for = parse_datetime(scheduled_for) if isinstance(scheduled_for, str) else None
+        except ValueError:
+            scheduled_for = None
+        if scheduled_for is None:
+            row_errors.append('fecha no válida (usa ISO 8601)')
+        else:
+            if timezone.is_naive(scheduled_for):
+                scheduled_for = timezone.make_aware(scheduled_for, tz)
+            if scheduled_for < now:
+                row_errors.append('la fecha del evento debe ser futura')
+
+        try:
+            max_viewers = _to_int(row.get('max_viewers'), default=100)
+            duration_minutes = _to_int(row.get('duration_minutes'))
+            if max_viewers < 1 or (duration_minutes is not None and not 1 <= duration_minutes <= MAX_DURATION_MINUTES):
+                raise ValueError
+        except (TypeError, ValueError):
+            row_errors.append(f'max_viewers y duration_minutes deben ser enteros positivos '
+                              f'(duración máxima {MAX_DURATION_MINUTES} min)')
+            max_viewers = duration_minutes = None
+
+        if row_errors:
+            errors.append(f'Fila {number}: ' + ', '.join(row_errors))
+            continue
+
+        is_featured = row.get('is_featured')
+        if not isinstance(is_featured, bool):
+            is_featured = str(is_featured or '').strip().lower() in _TRUE_VALUES
+
+        event = Event(
+            title=title,
+            description=text['description'],
+            category=category,
+            difficulty=difficulty,
+            scheduled_for=scheduled_for,
+            status=status,
+            max_viewers=max_viewers,
+            duration_minutes=duration_minutes,
+            tags=normalize_tags(text['tags'])[:500],
+            stream_url=text['stream_url'],
+            is_featured=is_featured,
+            creator=creator,
+        )
+        event.apply_defaults()
+        event.row_number = number
+        events.append(event)
+
+    if not errors:
+        errors = find_schedule_conflicts(events, creator)
+    if errors:
+        raise EventImportError(errors)
+    return events
+
+
+def find_schedule_conflicts(events, creator):
+    """
+    Solapamientos entre los eventos del fichero y con los ya existentes del
+    creador. Una sola consulta para todo el lote.
+    """
+    errors = []
+    active = sorted(
+        (e for e in events if e.status != Event.STATUS_CANCELLED and e.ends_at),
+        key=lambda e: e.scheduled_for,
+    )
+
+    previous = None
+    for event in active:
+        if previous is not None and event.scheduled_for < previous.ends_at:
+            errors.append(f'Fila {event.row_number}: se solapa con la fila {previous.row_number}')
+        if previous is None or event.ends_at > previous.ends_at:
+            previous = event
+
+    existing = (
+        Event.objects
+        .filter(creator=creator)
+        .exclude(status=Event.STATUS_CANCELLED)
+        .overlapping_any([(e.scheduled_for, e.ends_at) for e in active])
+        .values_list('title', 'scheduled_for', 'ends_at')
+    )
+    for title, start, end in existing:
+        for event in active:
+            if event.scheduled_for < end and event.ends_at > start:
+                errors.append(f'Fila {event.row_number}: se solapa con "{title}"')
+    return errors
+
+
+def expand_recurrence(event, frequency, occurrences):
+    """Genera `occurrences` copias sin guardar de `event`, separadas según `frequency`."""
+    step = EventRecurrenceForm.FREQUENCY_STEPS[frequency]
+    # La imagen se guarda una sola vez y todas las sesiones comparten el fichero
+    thumbnail = None
+    if event.thumbnail:
+        if not event.thumbnail._committed:
+            event.thumbnail.save(event.thumbnail.name, event.thumbnail.file, save=False)
+        thumbnail = event.thumbnail.name
+    events = []
+    for i in range(occurrences):
+        copy = Event(
+            title=event.title,
+            description=event.description,
+            category=event.category,
+            difficulty=event.difficulty,
+            scheduled_for=event.scheduled_for + step * i,
+            status=event.status,
+            thumbnail=thumbnail,
+            max_viewers=event.max_viewers,
+            duration_minutes=event.duration_minutes,
+            tags=event.tags,
+            stream_url=event.stream_url,
+            is_featured=event.is_featured,
+            creator=event.creator,
+        )
+        copy.apply_defaults()
+        events.append(copy)
+    return events
+
+
+@transaction.atomic
+def save_events(events):
+    """Inserta los eventos en lotes y registra sus altas en el outbox."""
+    # bulk_create no dispara señales: recalculamos las estadísticas de los creadores
+    with stats.deferred():
+        created = records.bulk_create(Event, events, batch_size=BULK_BATCH_SIZE)
+    stats.recompute({event.creator_id for event in events})
+    return created
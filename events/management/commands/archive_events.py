@@ -0,0 +1,43 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from events import archive
+
+
+class Command(BaseCommand):
+    help = "Mueve a la tabla de archivo los eventos finalizados o cancelados antiguos"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=90,
+            help='Retención en días desde la fecha del evento (por defecto: 90)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Eventos por transacción (por defecto: 500)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Solo cuenta los eventos que se archivarían'
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+
+        if options['dry_run']:
+            count = archive.archivable(cutoff).count()
+            self.stdout.write(f'{count} eventos se archivarían (anteriores a {cutoff:%d/%m/%Y}).')
+            return
+
+        total = 0
+        for archived in archive.archive(cutoff, batch_size=options['batch_size']):
+            total += archived
+            self.stdout.write(f'  {total} eventos archivados...')
+        self.stdout.write(self.style.SUCCESS(f'{total} eventos archivados.'))
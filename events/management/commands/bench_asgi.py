@@ -0,0 +1,151 @@
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.management.base import BaseCommand, CommandError
+
+from events.models import Event
+
+
+MODES = {'sync': '0', 'async': '1'}
+
+
+async def request(app, path):
+    """Una petición GET a la aplicación ASGI; devuelve (estado, segundos)."""
+    path, _, query = path.partition('?')
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'query_string': query.encode(),
+        'headers': [(b'host', b'localhost')],
+        'client': ('127.0.0.1', 0),
+        'server': ('localhost', 80),
+    }
+    status = None
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+
+    started = time.perf_counter()
+    await app(scope, receive, send)
+    return status, time.perf_counter() - started
+
+
+async def run_load(app, paths, total, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(i):
+        async with semaphore:
+            return await request(app, paths[i % len(paths)])
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(one(i) for i in range(total)))
+    return results, time.perf_counter() - started
+
+
+class Command(BaseCommand):
+    help = "Compara el rendimiento de las vistas de lectura síncronas y asíncronas bajo ASGI"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'paths',
+            nargs='*',
+            help='Rutas a pedir (por defecto: listado, un detalle, la API y un perfil público)'
+        )
+        parser.add_argument(
+            '--requests',
+            type=int,
+            default=500,
+            help='Peticiones por modo (por defecto: 500)'
+        )
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=100,
+            help='Peticiones simultáneas (por defecto: 100)'
+        )
+        parser.add_argument(
+            '--mode',
+            choices=sorted(MODES),
+            help='Mide solo este modo en el proceso actual (lo usa la comparación)'
+        )
+
+    def default_paths(self):
+        event = Event.objects.select_related('creator').order_by('-pk').first()
+        if event is None:
+            raise CommandError('No hay eventos: crea datos de prueba o indica las rutas.')
+        return [
+            '/events/',
+            f'/events/{event.pk}/',
+            '/events/api/events/',
+            f'/events/api/events/{event.pk}/',
+            f'/users/{event.creator.username}/',
+        ]
+
+    def measure(self, paths, total, concurrency):
+        """Mide el modo con el que ha arrancado este proceso (ASYNC_VIEWS)."""
+        app = ASGIHandler()
+        # Calentamiento: plantillas, URLconf y conexiones
+        asyncio.run(run_load(app, paths, len(paths), 1))
+        results, elapsed = asyncio.run(run_load(app, paths, total, concurrency))
+        latencies = sorted(seconds * 1000 for _, seconds in results)
+        return {
+            'rate': total / elapsed,
+            'p50': statistics.median(latencies),
+            'p95': latencies[int(len(latencies) * 0.95) - 1],
+            'errors': sum(1 for status, _ in results if status != 200),
+        }
+
+    def run_mode(self, mode, paths, total, concurrency):
+        # Cada modo en un proceso nuevo: ASYNC_VIEWS se lee al cargar settings y URLconf
+        env = dict(os.environ, ASYNC_VIEWS=MODES[mode], DJANGO_SETTINGS_MODULE=settings.SETTINGS_MODULE)
+        result = subprocess.run(
+            [
+                sys.executable, str(settings.BASE_DIR / 'manage.py'), 'bench_asgi', *paths,
+                '--requests', str(total), '--concurrency', str(concurrency), '--mode', mode,
+            ],
+            cwd=str(settings.BASE_DIR),
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise CommandError(f'La medición {mode} ha fallado:\n{result.stderr[-2000:]}')
+        return json.loads(result.stdout.strip().splitlines()[-1])
+
+    def handle(self, *args, **options):
+        paths = options['paths'] or self.default_paths()
+        total, concurrency = options['requests'], options['concurrency']
+        if options['mode']:
+            self.stdout.write(json.dumps(self.measure(paths, total, concurrency)))
+            return
+
+        self.stdout.write(f'{total} peticiones, {concurrency} simultáneas, rutas: {", ".join(paths)}')
+        summary = {}
+        for mode in ('sync', 'async'):
+            result = self.run_mode(mode, paths, total, concurrency)
+            summary[mode] = result['rate']
+            self.stdout.write(
+                f"  {mode:<6} {result['rate']:8.1f} peticiones/s · "
+                f"p50 {result['p50']:7.1f} ms · p95 {result['p95']:7.1f} ms · errores {result['errors']}"
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"async / sync: {summary['async'] / summary['sync']:.2f}x"
+        ))
@@ -0,0 +1,67 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from events.models import Event
+
+
+class Command(BaseCommand):
+    help = "Calcula offline los eventos similares y las recomendaciones por usuario"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--top-k',
+            type=int,
+            default=10,
+            help='Recomendaciones guardadas por evento y por usuario (por defecto: 10)'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Filas procesadas por bloque (por defecto: 2000)'
+        )
+        parser.add_argument(
+            '--max-tag-df',
+            type=int,
+            default=5000,
+            help='Ignora las etiquetas presentes en más de N eventos (por defecto: 5000)'
+        )
+        parser.add_argument(
+            '--skip-users',
+            action='store_true',
+            help='Calcula solo los eventos similares'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            from events import recommendations
+        except ImportError as exc:
+            raise CommandError(f'Este comando necesita NumPy y SciPy (pip install numpy scipy): {exc}')
+
+        if not Event.objects.exists():
+            self.stdout.write(self.style.WARNING('No hay eventos.'))
+            return
+
+        log = self.stdout.write if options['verbosity'] > 1 else None
+        started = time.monotonic()
+
+        data = recommendations.load_events(options['max_tag_df'])
+        follows, affinity, user_ids = recommendations.load_follows(data)
+        self.stdout.write(
+            f'{len(data.ids)} eventos ({len(data.candidates)} recomendables), '
+            f'{data.tags.shape[1]} etiquetas, {len(user_ids)} usuarios con seguimientos.'
+        )
+
+        links = recommendations.compute_similar_events(
+            data, affinity, options['top_k'], options['chunk_size'], log=log,
+        )
+        self.stdout.write(self.style.SUCCESS(f'{links} relaciones de eventos similares guardadas.'))
+
+        if not options['skip_users']:
+            suggestions = recommendations.compute_user_recommendations(
+                data, follows, affinity, user_ids, options['top_k'], options['chunk_size'], log=log,
+            )
+            self.stdout.write(self.style.SUCCESS(f'{suggestions} recomendaciones de usuario guardadas.'))
+
+        self.stdout.write(f'Tiempo total: {time.monotonic() - started:.1f} s')
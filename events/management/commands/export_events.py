@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+
+from events.models import Event
+from events.transfer import EVENT_FIELDS
+from users import transfer
+
+
+class Command(BaseCommand):
+    help = "Exporta eventos en streaming a JSONL o CSV, con gzip si el fichero acaba en .gz"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'output',
+            help="Fichero de salida: .jsonl, .csv, .jsonl.gz, .csv.gz o '-' para stdout"
+        )
+        parser.add_argument(
+            '--since',
+            default=None,
+            help='Exporta solo los eventos modificados desde esta fecha (ISO 8601)'
+        )
+        parser.add_argument(
+            '--watermark',
+            default=None,
+            help='Fichero con la marca de agua: se lee como --since y se actualiza al terminar'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Filas por lectura de la base de datos (por defecto: 2000)'
+        )
+
+    def handle(self, *args, **options):
+        since = transfer.read_watermark(options['watermark'])
+        if options['since']:
+            since = parse_datetime(options['since'])
+            if since is None:
+                raise CommandError('--since debe ser una fecha ISO 8601.')
+
+        count, high = transfer.export_queryset(
+            Event.objects.all(),
+            EVENT_FIELDS,
+            options['output'],
+            since=since,
+            chunk_size=options['chunk_size'],
+        )
+        self.stderr.write(f"{count} eventos exportados a {options['output']}")
+
+        if options['watermark'] and high:
+            transfer.write_watermark(options['watermark'], high)
+            self.stderr.write(f'Marca de agua: {high.isoformat()}')
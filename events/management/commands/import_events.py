@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from events.transfer import creator_key, import_events_batch
+from users import transfer
+
+
+class Command(BaseCommand):
+    help = "Importa eventos exportados con export_events (upsert por creador, fecha y título)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'input',
+            help="Fichero de eventos: .jsonl, .csv, .jsonl.gz, .csv.gz o '-' para stdin"
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Filas por lote (por defecto: 1000)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Hilos que importan lotes en paralelo (por defecto: 4)'
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        created, updated, rejected, errors = transfer.run_batches(
+            transfer.batched(transfer.read_rows(options['input']), options['batch_size']),
+            import_events_batch,
+            workers=options['workers'],
+            key=creator_key,
+            empty=(0, 0, 0, []),
+        )
+        elapsed = time.monotonic() - started
+        for error in errors:
+            self.stderr.write(f'  {error}')
+        if rejected:
+            self.stderr.write(self.style.WARNING(
+                f'{rejected} filas rechazadas' + (f' (se muestran {len(errors)})' if rejected > len(errors) else '') + '.'
+            ))
+        self.stdout.write(self.style.SUCCESS(
+            f'{created} eventos creados y {updated} actualizados en {elapsed:.1f} s.'
+        ))
@@ -0,0 +1,34 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+
+from events import stats
+
+
+class Command(BaseCommand):
+    help = "Recalcula las estadísticas de todos los creadores y corrige las desviaciones"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Usuarios por lote (por defecto: 1000)'
+        )
+
+    def handle(self, *args, **options):
+        User = get_user_model()
+        batch_size = options['batch_size']
+        last_pk = 0
+        checked = repaired = 0
+
+        while True:
+            user_ids = list(
+                User.objects.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:batch_size]
+            )
+            if not user_ids:
+                break
+            last_pk = user_ids[-1]
+            repaired += stats.recompute(user_ids)
+            checked += len(user_ids)
+
+        self.stdout.write(self.style.SUCCESS(f'{checked} usuarios revisados, {repaired} estadísticas corregidas.'))
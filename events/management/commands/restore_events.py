@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from events import archive
+from events.models import ArchivedEvent
+
+
+class Command(BaseCommand):
+    help = "Devuelve eventos archivados a la tabla principal"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'ids',
+            nargs='*',
+            type=int,
+            help='Ids originales de los eventos a restaurar'
+        )
+        parser.add_argument(
+            '--creator',
+            help='Restaura todos los eventos archivados de este usuario'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Eventos por transacción (por defecto: 500)'
+        )
+
+    def handle(self, *args, **options):
+        if not options['ids'] and not options['creator']:
+            raise CommandError('Indica ids de eventos o --creator.')
+
+        queryset = ArchivedEvent.objects.all()
+        if options['ids']:
+            queryset = queryset.filter(original_id__in=options['ids'])
+        if options['creator']:
+            queryset = queryset.filter(creator__username=options['creator'])
+
+        restored = archive.restore(queryset, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'{restored} eventos restaurados.'))
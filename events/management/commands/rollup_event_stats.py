@@ -0,0 +1,86 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from events.models import EventStatsBucket
+
+
+HOUR = EventStatsBucket.GRANULARITY_HOUR
+DAY = EventStatsBucket.GRANULARITY_DAY
+
+
+class Command(BaseCommand):
+    help = "Agrega los buckets horarios de estadísticas antiguos en buckets diarios"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=7,
+            help='Conserva el detalle por hora de los últimos N días (por defecto: 7)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Buckets diarios por transacción (por defecto: 1000)'
+        )
+
+    @transaction.atomic
+    def write_batch(self, days):
+        """days: {(event_id, día): [views, joins, [ids horarios]]}"""
+        existing = {
+            (b.event_id, b.bucket_start): b
+            for b in EventStatsBucket.objects.filter(
+                granularity=DAY,
+                event_id__in={event_id for event_id, _day in days},
+                bucket_start__in={day for _event_id, day in days},
+            )
+        }
+        to_create = []
+        hour_ids = []
+        for (event_id, day), (views, joins, ids) in days.items():
+            hour_ids.extend(ids)
+            bucket = existing.get((event_id, day))
+            if bucket is None:
+                to_create.append(EventStatsBucket(
+                    event_id=event_id, granularity=DAY, bucket_start=day, views=views, joins=joins,
+                ))
+            else:
+                EventStatsBucket.objects.filter(pk=bucket.pk).update(
+                    views=F('views') + views, joins=F('joins') + joins,
+                )
+        EventStatsBucket.objects.bulk_create(to_create)
+        EventStatsBucket.objects.filter(pk__in=hour_ids).delete()
+        return len(hour_ids)
+
+    def handle(self, *args, **options):
+        cutoff = (timezone.now() - timedelta(days=options['days'])).replace(
+            hour=0, minute=0, second=0, microsecond=0,
+        )
+        hours = (
+            EventStatsBucket.objects
+            .filter(granularity=HOUR, bucket_start__lt=cutoff)
+            .order_by('event_id', 'bucket_start')
+            .values_list('pk', 'event_id', 'bucket_start', 'views', 'joins')
+        )
+
+        batch = {}
+        rolled = 0
+        for pk, event_id, bucket_start, views, joins in hours.iterator(chunk_size=2000):
+            key = (event_id, bucket_start.replace(hour=0))
+            if key not in batch and len(batch) >= options['batch_size']:
+                # Los datos vienen ordenados: los días ya acumulados están completos
+                rolled += self.write_batch(batch)
+                batch = {}
+            entry = batch.setdefault(key, [0, 0, []])
+            entry[0] += views
+            entry[1] += joins
+            entry[2].append(pk)
+        if batch:
+            rolled += self.write_batch(batch)
+
+        self.stdout.write(self.style.SUCCESS(f'{rolled} buckets horarios agregados por día.'))
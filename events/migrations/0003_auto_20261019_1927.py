@@ -0,0 +1,84 @@
+# Generated by Django 3.2.8 on 2026-10-19 19:27
+
+from datetime import timedelta
+
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_ends_at(apps, schema_editor):
+    Event = apps.get_model('events', 'Event')
+    batch = []
+    events = Event.objects.filter(ends_at__isnull=True, duration_minutes__isnull=False).only('scheduled_for', 'duration_minutes')
+    for event in events.iterator(chunk_size=1000):
+        event.ends_at = event.scheduled_for + timedelta(minutes=event.duration_minutes)
+        batch.append(event)
+        if len(batch) >= 1000:
+            Event.objects.bulk_update(batch, ['ends_at'])
+            batch = []
+    if batch:
+        Event.objects.bulk_update(batch, ['ends_at'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0002_auto_20261019_1922'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventPopularity',
+            fields=[
+                ('event', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='popularity', serialize=False, to='events.event')),
+                ('views', models.PositiveBigIntegerField(default=0, verbose_name='Visitas')),
+                ('joins', models.PositiveBigIntegerField(default=0, verbose_name='Accesos al streaming')),
+                ('trending_score', models.FloatField(blank=True, db_index=True, null=True)),
+                ('viewers_sketch', models.BinaryField(blank=True, default=b'')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'popularidad de evento',
+                'verbose_name_plural': 'popularidad de eventos',
+            },
+        ),
+        migrations.CreateModel(
+            name='EventStatsBucket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('granularity', models.CharField(choices=[('hour', 'Hora'), ('day', 'Día')], max_length=4)),
+                ('bucket_start', models.DateTimeField()),
+                ('views', models.PositiveBigIntegerField(default=0)),
+                ('joins', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='event',
+            name='ends_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Fin previsto'),
+        ),
+        migrations.AlterField(
+            model_name='event',
+            name='duration_minutes',
+            field=models.PositiveIntegerField(blank=True, null=True, validators=[django.core.validators.MaxValueValidator(1440)], verbose_name='Duración prevista (minutos)'),
+        ),
+        migrations.AddIndex(
+            model_name='event',
+            index=models.Index(fields=['scheduled_for', 'ends_at'], name='event_sched_ends_idx'),
+        ),
+        migrations.AddField(
+            model_name='eventstatsbucket',
+            name='event',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='stats_buckets', to='events.event'),
+        ),
+        migrations.AddIndex(
+            model_name='eventstatsbucket',
+            index=models.Index(fields=['granularity', 'bucket_start'], name='stats_gran_bucket_idx'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='eventstatsbucket',
+            unique_together={('event', 'granularity', 'bucket_start')},
+        ),
+        migrations.RunPython(backfill_ends_at, migrations.RunPython.noop),
+    ]
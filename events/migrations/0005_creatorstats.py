@@ -0,0 +1,36 @@
+# Generated by Django 3.2.8 on 2026-10-19 19:31
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0002_follow_follow_following_created_idx'),
+        ('events', '0004_similarevent_userrecommendation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CreatorStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='creator_stats', serialize=False, to='users.customuser')),
+                ('draft_count', models.IntegerField(default=0)),
+                ('scheduled_count', models.IntegerField(default=0)),
+                ('live_count', models.IntegerField(default=0)),
+                ('finished_count', models.IntegerField(default=0)),
+                ('cancelled_count', models.IntegerField(default=0)),
+                ('upcoming_count', models.IntegerField(default=0)),
+                ('followers_count', models.IntegerField(default=0)),
+                ('following_count', models.IntegerField(default=0)),
+                ('total_views', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('next_event', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='events.event')),
+            ],
+            options={
+                'verbose_name': 'estadísticas de creador',
+                'verbose_name_plural': 'estadísticas de creadores',
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 3.2.8 on 2026-10-19 19:34
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('events', '0005_creatorstats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('original_id', models.BigIntegerField(unique=True)),
+                ('title', models.CharField(max_length=200, verbose_name='Título')),
+                ('status', models.CharField(choices=[('draft', 'Borrador'), ('scheduled', 'Programado'), ('live', 'En directo'), ('finished', 'Finalizado'), ('cancelled', 'Cancelado')], max_length=20, verbose_name='Estado')),
+                ('scheduled_for', models.DateTimeField(verbose_name='Fecha y hora programada')),
+                ('payload', models.TextField()),
+                ('archived_at', models.DateTimeField(auto_now_add=True, verbose_name='Archivado')),
+                ('creator', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_events', to=settings.AUTH_USER_MODEL, verbose_name='Creador')),
+            ],
+            options={
+                'verbose_name': 'evento archivado',
+                'verbose_name_plural': 'eventos archivados',
+                'ordering': ['-scheduled_for'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='archivedevent',
+            index=models.Index(fields=['creator', 'scheduled_for'], name='archived_creator_sched_idx'),
+        ),
+    ]
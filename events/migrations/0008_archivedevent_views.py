@@ -0,0 +1,18 @@
+# Generated by Django 3.2.8 on 2026-10-19 19:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0007_event_event_updated_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='archivedevent',
+            name='views',
+            field=models.PositiveBigIntegerField(default=0, verbose_name='Visitas'),
+        ),
+    ]
@@ -0,0 +1,40 @@
+import logging
+from datetime import timedelta
+
+from django.db import migrations
+
+
+MAX_DURATION_MINUTES = 24 * 60
+
+logger = logging.getLogger(__name__)
+
+
+def clamp_duration(apps, schema_editor):
+    # 0003 añadió MaxValueValidator, pero las filas anteriores pueden superar
+    # el límite y romper el filtro de solapamiento (Event.objects.overlapping)
+    Event = apps.get_model('events', 'Event')
+    batch, clamped = [], 0
+    events = Event.objects.filter(duration_minutes__gt=MAX_DURATION_MINUTES).only('pk', 'scheduled_for')
+    for event in events.iterator(chunk_size=1000):
+        event.duration_minutes = MAX_DURATION_MINUTES
+        event.ends_at = event.scheduled_for + timedelta(minutes=MAX_DURATION_MINUTES)
+        batch.append(event)
+        clamped += 1
+        if len(batch) >= 1000:
+            Event.objects.bulk_update(batch, ['duration_minutes', 'ends_at'])
+            batch = []
+    if batch:
+        Event.objects.bulk_update(batch, ['duration_minutes', 'ends_at'])
+    if clamped:
+        logger.info('%d eventos con la duración recortada a %d minutos', clamped, MAX_DURATION_MINUTES)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0008_archivedevent_views'),
+    ]
+
+    operations = [
+        migrations.RunPython(clamp_duration, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,120 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import migrations
+from django.db.models import Count, Sum
+from django.utils import timezone
+
+
+BATCH_SIZE = 500
+
+# Copia de CreatorStats.STATUS_FIELDS en el momento de esta migración
+STATUS_FIELDS = {
+    'draft': 'draft_count',
+    'scheduled': 'scheduled_count',
+    'live': 'live_count',
+    'finished': 'finished_count',
+    'cancelled': 'cancelled_count',
+}
+COUNTER_FIELDS = list(STATUS_FIELDS.values()) + [
+    'upcoming_count', 'next_event_id', 'followers_count', 'following_count', 'total_views',
+]
+
+
+def _empty_counters():
+    counters = dict.fromkeys(COUNTER_FIELDS, 0)
+    counters['next_event_id'] = None
+    return counters
+
+
+def _backfill_batch(apps, user_ids):
+    # Mismo cálculo que events.stats.recompute(), pero solo con modelos históricos
+    Event = apps.get_model('events', 'Event')
+    EventPopularity = apps.get_model('events', 'EventPopularity')
+    ArchivedEvent = apps.get_model('events', 'ArchivedEvent')
+    CreatorStats = apps.get_model('events', 'CreatorStats')
+    Follow = apps.get_model('users', 'Follow')
+
+    fresh = defaultdict(_empty_counters)
+    for row in (
+        Event.objects.filter(creator_id__in=user_ids)
+        .values('creator_id', 'status').annotate(n=Count('pk')).order_by()
+    ):
+        field = STATUS_FIELDS.get(row['status'])
+        if field:
+            fresh[row['creator_id']][field] = row['n']
+
+    seen = set()
+    upcoming = Event.objects.filter(
+        creator_id__in=user_ids, status='scheduled', scheduled_for__gte=timezone.now()
+    )
+    for creator_id, pk in upcoming.order_by('creator_id', 'scheduled_for').values_list('creator_id', 'pk'):
+        counters = fresh[creator_id]
+        counters['upcoming_count'] += 1
+        if creator_id not in seen:
+            counters['next_event_id'] = pk
+            seen.add(creator_id)
+
+    for row in (
+        Follow.objects.filter(following_id__in=user_ids)
+        .values('following_id').annotate(n=Count('pk')).order_by()
+    ):
+        fresh[row['following_id']]['followers_count'] = row['n']
+
+    for row in (
+        Follow.objects.filter(follower_id__in=user_ids)
+        .values('follower_id').annotate(n=Count('pk')).order_by()
+    ):
+        fresh[row['follower_id']]['following_count'] = row['n']
+
+    for row in (
+        EventPopularity.objects.filter(event__creator_id__in=user_ids)
+        .values('event__creator_id').annotate(n=Sum('views')).order_by()
+    ):
+        fresh[row['event__creator_id']]['total_views'] = row['n'] or 0
+
+    for row in (
+        ArchivedEvent.objects.filter(creator_id__in=user_ids)
+        .values('creator_id').annotate(n=Sum('views')).order_by()
+    ):
+        fresh[row['creator_id']]['total_views'] += row['n'] or 0
+
+    existing = CreatorStats.objects.in_bulk(user_ids)
+    to_create, to_update = [], []
+    for user_id in user_ids:
+        values = fresh.get(user_id)
+        stats = existing.get(user_id)
+        if stats is None:
+            if values and any(values.values()):
+                to_create.append(CreatorStats(user_id=user_id, **values))
+            continue
+        for field, value in (values or _empty_counters()).items():
+            setattr(stats, field, value)
+        to_update.append(stats)
+
+    CreatorStats.objects.bulk_create(to_create, batch_size=1000)
+    CreatorStats.objects.bulk_update(to_update, COUNTER_FIELDS, batch_size=1000)
+
+
+def backfill_creator_stats(apps, schema_editor):
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+    batch = []
+    for user_id in User.objects.order_by('pk').values_list('pk', flat=True).iterator(chunk_size=BATCH_SIZE):
+        batch.append(user_id)
+        if len(batch) >= BATCH_SIZE:
+            _backfill_batch(apps, batch)
+            batch = []
+    if batch:
+        _backfill_batch(apps, batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('events', '0009_clamp_event_duration'),
+        ('users', '0004_backfill_customuser_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_creator_stats, migrations.RunPython.noop),
+    ]
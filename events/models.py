@@ -1,8 +1,47 @@
-from django.db import models
+from datetime import timedelta
+
+from django.core.validators import MaxValueValidator
+from django.db import models, transaction
+from django.db.models import Q
 from django.conf import settings
 from django.utils import timezone
 
 
+# Duración máxima de un evento. Acota las búsquedas por rango de tiempo:
+# un evento que termina después de T empezó como mucho MAX_DURATION_MINUTES antes.
+MAX_DURATION_MINUTES = 24 * 60
+
+
+class EventQuerySet(models.QuerySet):
+    def overlapping(self, start, end):
+        """
+        Eventos cuyo intervalo [scheduled_for, ends_at) se solapa con [start, end).
+        El límite inferior sobre scheduled_for convierte la búsqueda en un
+        rango acotado del índice en lugar de un recorrido completo.
+        """
+        return self.filter(
+            scheduled_for__lt=end,
+            scheduled_for__gte=start - timedelta(minutes=MAX_DURATION_MINUTES),
+            ends_at__gt=start,
+        )
+
+    def overlapping_any(self, intervals):
+        """Como overlapping() pero para varios intervalos en una sola consulta."""
+        condition = Q()
+        for start, end in intervals:
+            condition |= Q(
+                scheduled_for__lt=end,
+                scheduled_for__gte=start - timedelta(minutes=MAX_DURATION_MINUTES),
+                ends_at__gt=start,
+            )
+        return self.filter(condition) if condition else self.none()
+
+    def happening_now(self):
+        now = timezone.now()
+        return self.exclude(status=Event.STATUS_CANCELLED).overlapping(now, now)
+
+
+
 class Event(models.Model):
     # Categorías del evento
     CATEGORY_GAMING = 'gaming'
@@ -91,8 +130,15 @@ class Event(models.Model):
     duration_minutes = models.PositiveIntegerField(
         blank=True,
         null=True,
+        validators=[MaxValueValidator(MAX_DURATION_MINUTES)],
         verbose_name='Duración prevista (minutos)'
     )
+    ends_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        editable=False,
+        verbose_name='Fin previsto'
+    )
     tags = models.CharField(
         max_length=500,
         blank=True,
@@ -125,19 +171,41 @@ class Event(models.Model):
         verbose_name='Actualizado'
     )
 
+    objects = EventQuerySet.as_manager()
+
     class Meta:
         ordering = ['-scheduled_for', '-created_at']
         verbose_name = 'evento'
         verbose_name_plural = 'eventos'
+        indexes = [
+            models.Index(fields=['creator', 'scheduled_for'], name='event_creator_sched_idx'),
+            models.Index(fields=['status', 'scheduled_for'], name='event_status_sched_idx'),
+            models.Index(fields=['title'], name='event_title_idx'),
+            models.Index(fields=['scheduled_for', 'ends_at'], name='event_sched_ends_idx'),
+            # Exportaciones incrementales (export_events --watermark)
+            models.Index(fields=['updated_at'], name='event_updated_idx'),
+        ]
 
     def __str__(self):
         return self.title
 
-    def save(self, *args, **kwargs):
+    def apply_defaults(self):
+        """
+        Rellena los campos derivados. Se llama desde save() y también antes
+        de bulk_create(), que no pasa por save().
+        """
         # Si no hay duración, asignamos la duración por defecto según categoría
         if not self.duration_minutes and self.category in self.DEFAULT_DURATION_BY_CATEGORY:
             self.duration_minutes = self.DEFAULT_DURATION_BY_CATEGORY[self.category]
-        super().save(*args, **kwargs)
+        # Fin precalculado para las consultas por franja horaria
+        if self.scheduled_for and self.duration_minutes:
+            self.ends_at = self.scheduled_for + timedelta(minutes=self.duration_minutes)
+
+    def save(self, *args, **kwargs):
+        self.apply_defaults()
+        # Atómico para que el cambio en el outbox (post_save) vaya en la misma transacción
+        with transaction.atomic():
+            super().save(*args, **kwargs)
 
     @property
     def is_past(self):
@@ -146,3 +214,202 @@ class Event(models.Model):
     @property
     def is_upcoming(self):
         return self.scheduled_for >= timezone.now()
+
+
+class EventPopularity(models.Model):
+    """
+    Contadores agregados de un evento. Se escriben en lote desde
+    events.analytics, nunca en cada visita.
+
+    `trending_score` es log2 de la suma de visitas ponderadas por
+    2 ** ((t - TRENDING_EPOCH) / vida media): ordenar por él equivale a
+    ordenar por popularidad con decaimiento exponencial sin tener que
+    recalcular los eventos que no reciben visitas.
+    """
+    event = models.OneToOneField(
+        Event,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='popularity'
+    )
+    views = models.PositiveBigIntegerField(default=0, verbose_name='Visitas')
+    joins = models.PositiveBigIntegerField(default=0, verbose_name='Accesos al streaming')
+    trending_score = models.FloatField(null=True, blank=True, db_index=True)
+    viewers_sketch = models.BinaryField(blank=True, default=b'')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'popularidad de evento'
+        verbose_name_plural = 'popularidad de eventos'
+
+    def __str__(self):
+        return f'{self.event_id}: {self.views} visitas'
+
+    @property
+    def unique_viewers(self):
+        from .analytics import HyperLogLog
+        return HyperLogLog.from_bytes(self.viewers_sketch).count()
+
+
+class EventStatsBucket(models.Model):
+    """Visitas y accesos de un evento agregados por hora o por día."""
+    GRANULARITY_HOUR = 'hour'
+    GRANULARITY_DAY = 'day'
+
+    GRANULARITY_CHOICES = [
+        (GRANULARITY_HOUR, 'Hora'),
+        (GRANULARITY_DAY, 'Día'),
+    ]
+
+    event = models.ForeignKey(
+        Event,
+        on_delete=models.CASCADE,
+        related_name='stats_buckets'
+    )
+    granularity = models.CharField(max_length=4, choices=GRANULARITY_CHOICES)
+    bucket_start = models.DateTimeField()
+    views = models.PositiveBigIntegerField(default=0)
+    joins = models.PositiveBigIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('event', 'granularity', 'bucket_start')
+        indexes = [
+            models.Index(fields=['granularity', 'bucket_start'], name='stats_gran_bucket_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.event_id} {self.granularity} {self.bucket_start:%Y-%m-%d %H:%M}'
+
+
+class SimilarEvent(models.Model):
+    """Vecinos más parecidos de un evento, precalculados por compute_recommendations."""
+    event = models.ForeignKey(
+        Event,
+        on_delete=models.CASCADE,
+        related_name='similar_links'
+    )
+    similar = models.ForeignKey(
+        Event,
+        on_delete=models.CASCADE,
+        related_name='recommended_in'
+    )
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        unique_together = ('event', 'rank')
+        verbose_name = 'evento similar'
+        verbose_name_plural = 'eventos similares'
+
+    def __str__(self):
+        return f'{self.event_id} -> {self.similar_id} (#{self.rank})'
+
+
+class UserRecommendation(models.Model):
+    """Eventos sugeridos a un usuario a partir de los creadores que sigue."""
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='event_recommendations'
+    )
+    event = models.ForeignKey(
+        Event,
+        on_delete=models.CASCADE,
+        related_name='recommended_to'
+    )
+    rank = models.PositiveSmallIntegerField()
+    score = models.FloatField()
+
+    class Meta:
+        unique_together = ('user', 'rank')
+        verbose_name = 'recomendación'
+        verbose_name_plural = 'recomendaciones'
+
+    def __str__(self):
+        return f'{self.user_id} -> {self.event_id} (#{self.rank})'
+
+
+class CreatorStats(models.Model):
+    """
+    Contadores desnormalizados de un usuario para las páginas de perfil.
+    Se mantienen desde events.signals y reconcile_creator_stats corrige
+    cualquier desviación.
+    """
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='creator_stats'
+    )
+    draft_count = models.IntegerField(default=0)
+    scheduled_count = models.IntegerField(default=0)
+    live_count = models.IntegerField(default=0)
+    finished_count = models.IntegerField(default=0)
+    cancelled_count = models.IntegerField(default=0)
+    upcoming_count = models.IntegerField(default=0)
+    next_event = models.ForeignKey(
+        Event,
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name='+'
+    )
+    followers_count = models.IntegerField(default=0)
+    following_count = models.IntegerField(default=0)
+    total_views = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    STATUS_FIELDS = {
+        Event.STATUS_DRAFT: 'draft_count',
+        Event.STATUS_SCHEDULED: 'scheduled_count',
+        Event.STATUS_LIVE: 'live_count',
+        Event.STATUS_FINISHED: 'finished_count',
+        Event.STATUS_CANCELLED: 'cancelled_count',
+    }
+    COUNTER_FIELDS = list(STATUS_FIELDS.values()) + [
+        'upcoming_count', 'next_event_id', 'followers_count', 'following_count', 'total_views',
+    ]
+
+    class Meta:
+        verbose_name = 'estadísticas de creador'
+        verbose_name_plural = 'estadísticas de creadores'
+
+    def __str__(self):
+        return f'Estadísticas de {self.user_id}'
+
+    @property
+    def events_count(self):
+        return sum(getattr(self, field) for field in self.STATUS_FIELDS.values())
+
+
+class ArchivedEvent(models.Model):
+    """
+    Evento finalizado o cancelado que archive_events ha sacado de la tabla
+    Event. Guarda los campos de búsqueda habituales y el resto en `payload`
+    (JSON) para poder mostrarlo o restaurarlo tal cual.
+    """
+    original_id = models.BigIntegerField(unique=True)
+    creator = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='archived_events',
+        verbose_name='Creador'
+    )
+    title = models.CharField(max_length=200, verbose_name='Título')
+    status = models.CharField(max_length=20, choices=Event.STATUS_CHOICES, verbose_name='Estado')
+    scheduled_for = models.DateTimeField(verbose_name='Fecha y hora programada')
+    # Visitas acumuladas al archivar; cuentan en CreatorStats.total_views
+    views = models.PositiveBigIntegerField(default=0, verbose_name='Visitas')
+    payload = models.TextField()
+    archived_at = models.DateTimeField(auto_now_add=True, verbose_name='Archivado')
+
+    class Meta:
+        ordering = ['-scheduled_for']
+        verbose_name = 'evento archivado'
+        verbose_name_plural = 'eventos archivados'
+        indexes = [
+            models.Index(fields=['creator', 'scheduled_for'], name='archived_creator_sched_idx'),
+        ]
+
+    def __str__(self):
+        return self.title
@@ -0,0 +1,252 @@
+"""
+Cálculo offline de recomendaciones con matrices dispersas (NumPy/SciPy).
+
+- Similitud evento-evento: etiquetas (TF-IDF), creadores con seguidores en
+  común (co-follow a partir de Follow) y una bonificación por misma
+  categoría y nivel. Solo se recomiendan eventos próximos o en directo.
+- Sugerencias por usuario: eventos de los creadores que sigue y de los
+  creadores parecidos a ellos, priorizando los más cercanos en el tiempo.
+
+Los resultados se guardan en SimilarEvent y UserRecommendation; las vistas
+solo leen esas tablas. Este módulo solo lo importa el comando
+compute_recommendations, así que NumPy/SciPy no se cargan en el servidor web.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+from scipy import sparse
+
+from django.db import transaction
+from django.utils import timezone
+
+from users.models import Follow
+from .models import Event, SimilarEvent, UserRecommendation
+
+
+WEIGHT_TAGS = 1.0
+WEIGHT_COFOLLOW = 0.5
+BONUS_CATEGORY = 0.2
+BONUS_DIFFICULTY = 0.1
+# Creadores parecidos que se conservan por creador en la matriz de co-follow
+CREATOR_NEIGHBOURS = 50
+
+CANDIDATE_STATUSES = (Event.STATUS_SCHEDULED, Event.STATUS_LIVE)
+
+
+@dataclass
+class EventData:
+    ids: np.ndarray            # pk de cada fila
+    creator_index: np.ndarray  # índice del creador de cada fila
+    creator_ids: np.ndarray    # pk del usuario creador de cada índice
+    category: np.ndarray
+    difficulty: np.ndarray
+    days_until: np.ndarray
+    candidates: np.ndarray     # filas que se pueden recomendar
+    tags: sparse.csr_matrix    # TF-IDF normalizado, filas = eventos
+
+
+def _normalize_rows(matrix):
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1
+    return sparse.diags(1 / norms) @ matrix
+
+
+def _top_k_rows(matrix, k):
+    """Para cada fila de una matriz CSR, (fila, columnas, valores) de los k mayores."""
+    for row in range(matrix.shape[0]):
+        start, end = matrix.indptr[row], matrix.indptr[row + 1]
+        if start == end:
+            continue
+        values = matrix.data[start:end]
+        columns = matrix.indices[start:end]
+        if len(values) > k:
+            keep = np.argpartition(-values, k)[:k]
+            values, columns = values[keep], columns[keep]
+        order = np.argsort(-values, kind='stable')
+        yield row, columns[order], values[order]
+
+
+def load_events(max_tag_df):
+    now = timezone.now()
+    ids, creators, categories, difficulties, days, candidates = [], [], [], [], [], []
+    tag_rows, tag_cols = [], []
+    vocabulary = {}
+
+    rows = (
+        Event.objects.order_by()
+        .values_list('pk', 'creator_id', 'category', 'difficulty', 'tags', 'scheduled_for', 'ends_at', 'status')
+        .iterator(chunk_size=5000)
+    )
+    for i, (pk, creator_id, category, difficulty, tags, scheduled_for, ends_at, status) in enumerate(rows):
+        ids.append(pk)
+        creators.append(creator_id)
+        categories.append(category)
+        difficulties.append(difficulty)
+        days.append(max((scheduled_for - now).total_seconds() / 86400, 0))
+        candidates.append(status in CANDIDATE_STATUSES and (ends_at or scheduled_for) >= now)
+        for tag in {t.strip().lower() for t in (tags or '').split(',') if t.strip()}:
+            tag_rows.append(i)
+            tag_cols.append(vocabulary.setdefault(tag, len(vocabulary)))
+
+    n = len(ids)
+    creator_ids, creator_index = np.unique(np.array(creators, dtype=np.int64), return_inverse=True)
+
+    tags = sparse.csr_matrix(
+        (np.ones(len(tag_rows), dtype=np.float32), (tag_rows, tag_cols)),
+        shape=(n, len(vocabulary)),
+    )
+    # TF-IDF; las etiquetas de un solo evento o demasiado comunes no aportan
+    df = np.asarray((tags > 0).sum(axis=0)).ravel()
+    idf = np.where((df >= 2) & (df <= max_tag_df), np.log(np.maximum(n, 1) / np.maximum(df, 1)), 0)
+    tags = _normalize_rows(tags @ sparse.diags(idf.astype(np.float32))).tocsr()
+    tags.eliminate_zeros()
+
+    return EventData(
+        ids=np.array(ids, dtype=np.int64),
+        creator_index=creator_index,
+        creator_ids=creator_ids,
+        category=np.array(categories),
+        difficulty=np.array(difficulties),
+        days_until=np.array(days, dtype=np.float32),
+        candidates=np.flatnonzero(np.array(candidates, dtype=bool)),
+        tags=tags,
+    )
+
+
+def load_follows(data):
+    """
+    Devuelve (U, A, user_ids):
+    U: usuarios × creadores (quién sigue a quién).
+    A: creadores × creadores, coseno entre sus conjuntos de seguidores.
+    """
+    creator_position = {pk: i for i, pk in enumerate(data.creator_ids.tolist())}
+    follower_ids, creator_cols = [], []
+    for follower_id, following_id in Follow.objects.order_by().values_list(
+        'follower_id', 'following_id'
+    ).iterator(chunk_size=10000):
+        column = creator_position.get(following_id)
+        if column is not None:
+            follower_ids.append(follower_id)
+            creator_cols.append(column)
+
+    user_ids, user_rows = np.unique(np.array(follower_ids, dtype=np.int64), return_inverse=True)
+    n_creators = len(data.creator_ids)
+    follows = sparse.csr_matrix(
+        (np.ones(len(user_rows), dtype=np.float32), (user_rows, creator_cols)),
+        shape=(len(user_ids), n_creators),
+    )
+
+    followers = _normalize_rows(follows.T.tocsr())
+    affinity = (followers @ followers.T).tolil()
+    affinity.setdiag(1)  # los eventos del mismo creador también se parecen
+    affinity = affinity.tocsr()
+
+    pruned_rows, pruned_cols, pruned_values = [], [], []
+    for row, columns, values in _top_k_rows(affinity, CREATOR_NEIGHBOURS):
+        pruned_rows.extend([row] * len(columns))
+        pruned_cols.extend(columns.tolist())
+        pruned_values.extend(values.tolist())
+    affinity = sparse.csr_matrix(
+        (np.array(pruned_values, dtype=np.float32), (pruned_rows, pruned_cols)),
+        shape=(n_creators, n_creators),
+    )
+    return follows, affinity, user_ids
+
+
+def compute_similar_events(data, affinity, top_k, chunk_size, log=None):
+    """Calcula y guarda los top_k eventos similares de cada evento, por bloques de filas."""
+    n = len(data.ids)
+    candidates = data.candidates
+    creator_matrix = sparse.csr_matrix(
+        (np.ones(n, dtype=np.float32), (np.arange(n), data.creator_index)),
+        shape=(n, len(data.creator_ids)),
+    )
+    candidate_tags_t = data.tags[candidates].T.tocsc()
+    candidate_creators_t = creator_matrix[candidates].T.tocsc()
+
+    written = 0
+    for start in range(0, n, chunk_size):
+        end = min(start + chunk_size, n)
+        scores = (
+            WEIGHT_TAGS * (data.tags[start:end] @ candidate_tags_t)
+            + WEIGHT_COFOLLOW * ((creator_matrix[start:end] @ affinity) @ candidate_creators_t)
+        ).tocoo()
+
+        rows = scores.row + start
+        columns = candidates[scores.col]
+        values = (
+            scores.data
+            + BONUS_CATEGORY * (data.category[rows] == data.category[columns])
+            + BONUS_DIFFICULTY * (data.difficulty[rows] == data.difficulty[columns])
+        )
+        keep = rows != columns
+        scores = sparse.csr_matrix(
+            (values[keep], (scores.row[keep], scores.col[keep])),
+            shape=(end - start, len(candidates)),
+        )
+
+        links = [
+            SimilarEvent(
+                event_id=int(data.ids[start + row]),
+                similar_id=int(data.ids[candidates[column]]),
+                rank=rank,
+                score=float(value),
+            )
+            for row, columns_, values_ in _top_k_rows(scores, top_k)
+            for rank, (column, value) in enumerate(zip(columns_, values_), start=1)
+        ]
+        with transaction.atomic():
+            SimilarEvent.objects.filter(event_id__in=data.ids[start:end].tolist()).delete()
+            SimilarEvent.objects.bulk_create(links, batch_size=1000)
+        written += len(links)
+        if log:
+            log(f'  eventos {end}/{n}')
+    return written
+
+
+def compute_user_recommendations(data, follows, affinity, user_ids, top_k, chunk_size, log=None):
+    """
+    Puntuación usuario-evento = afinidad con el creador del evento (seguido o
+    parecido a uno seguido) ponderada por la cercanía de la fecha.
+    """
+    candidates = data.candidates
+    recency = 1 / (1 + data.days_until[candidates] / 7)
+    creator_to_candidates = sparse.csr_matrix(
+        (recency.astype(np.float32), (data.creator_index[candidates], np.arange(len(candidates)))),
+        shape=(len(data.creator_ids), len(candidates)),
+    )
+    candidate_creator_users = data.creator_ids[data.creator_index[candidates]]
+    affinity_by_user = (follows @ affinity).tocsr()
+
+    n = len(user_ids)
+    written = 0
+    for start in range(0, n, chunk_size):
+        end = min(start + chunk_size, n)
+        scores = (affinity_by_user[start:end] @ creator_to_candidates).tocoo()
+        # Nunca recomendamos a un usuario sus propios eventos
+        keep = candidate_creator_users[scores.col] != user_ids[scores.row + start]
+        scores = sparse.csr_matrix(
+            (scores.data[keep], (scores.row[keep], scores.col[keep])),
+            shape=(end - start, len(candidates)),
+        )
+
+        recommendations = [
+            UserRecommendation(
+                user_id=int(user_ids[start + row]),
+                event_id=int(data.ids[candidates[column]]),
+                rank=rank,
+                score=float(value),
+            )
+            for row, columns_, values_ in _top_k_rows(scores, top_k)
+            for rank, (column, value) in enumerate(zip(columns_, values_), start=1)
+        ]
+        with transaction.atomic():
+            UserRecommendation.objects.filter(user_id__in=user_ids[start:end].tolist()).delete()
+            UserRecommendation.objects.bulk_create(recommendations, batch_size=1000)
+        written += len(recommendations)
+        if log:
+            log(f'  usuarios {end}/{n}')
+
+    # Usuarios que ya no siguen a nadie
+    UserRecommendation.objects.filter(user__following_set__isnull=True).delete()
+    return written
@@ -0,0 +1,76 @@
+from django.db.models.signals import post_delete, post_init, post_save
+from django.dispatch import receiver
+
+from users.models import Follow
+from . import facets, stats
+from .models import CreatorStats, Event
+
+
+def _snapshot(event):
+    # __dict__ para no provocar consultas con campos diferidos (.only())
+    return (
+        event.__dict__.get('status'),
+        event.__dict__.get('creator_id'),
+        event.__dict__.get('scheduled_for'),
+    )
+
+
+@receiver(post_init, sender=Event)
+def remember_event_state(sender, instance, **kwargs):
+    instance._stats_snapshot = _snapshot(instance) if instance.pk else None
+
+
+@receiver(post_save, sender=Event)
+def update_stats_on_event_save(sender, instance, created, **kwargs):
+    if stats.is_deferred():
+        return
+    previous = None if created else instance._stats_snapshot
+    current = _snapshot(instance)
+    instance._stats_snapshot = current
+    if previous == current:
+        return
+
+    status, creator_id, _scheduled_for = current
+    if previous is None:
+        stats.bump(creator_id, **{CreatorStats.STATUS_FIELDS[status]: 1})
+    elif None in previous[:2]:
+        # Instancia cargada sin estado o creador (.only()): recálculo exacto
+        stats.recompute([creator_id])
+    elif previous[:2] != current[:2]:
+        stats.bump(previous[1], **{CreatorStats.STATUS_FIELDS[previous[0]]: -1})
+        stats.bump(creator_id, **{CreatorStats.STATUS_FIELDS[status]: 1})
+
+    stats.refresh_upcoming(creator_id)
+    if previous and previous[1] not in (None, creator_id):
+        stats.refresh_upcoming(previous[1])
+
+
+@receiver(post_delete, sender=Event)
+def update_stats_on_event_delete(sender, instance, **kwargs):
+    if stats.is_deferred():
+        return
+    stats.bump(instance.creator_id, **{CreatorStats.STATUS_FIELDS[instance.status]: -1})
+    stats.refresh_upcoming(instance.creator_id)
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_event_facets(sender, **kwargs):
+    facets.invalidate()
+
+
+@receiver(post_save, sender=Follow)
+def update_stats_on_follow(sender, instance, created, **kwargs):
+    if stats.is_deferred():
+        return
+    if created:
+        stats.bump(instance.following_id, followers_count=1)
+        stats.bump(instance.follower_id, following_count=1)
+
+
+@receiver(post_delete, sender=Follow)
+def update_stats_on_unfollow(sender, instance, **kwargs):
+    if stats.is_deferred():
+        return
+    stats.bump(instance.following_id, followers_count=-1)
+    stats.bump(instance.follower_id, following_count=-1)
@@ -0,0 +1,169 @@
+"""
+Mantenimiento de CreatorStats.
+
+- bump(): incrementos atómicos con F() desde las señales de Event y Follow.
+- refresh_upcoming(): recalcula los eventos próximos de un creador (dos
+  consultas sobre el índice creator + scheduled_for).
+- recompute(): recálculo exacto para un conjunto de usuarios con consultas
+  agrupadas; lo usan reconcile_creator_stats y las operaciones masivas que
+  no disparan señales (bulk_create, update).
+- deferred(): desactiva las señales durante operaciones masivas que luego
+  llaman a recompute() (archivado y restauración de eventos).
+"""
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+
+from users.models import Follow
+from .models import ArchivedEvent, CreatorStats, Event, EventPopularity
+
+
+_local = threading.local()
+
+
+@contextmanager
+def deferred():
+    """
+    Desactiva el mantenimiento incremental desde las señales dentro del
+    bloque; quien lo usa debe llamar a recompute() para los usuarios afectados.
+    """
+    previous = getattr(_local, 'deferred', False)
+    _local.deferred = True
+    try:
+        yield
+    finally:
+        _local.deferred = previous
+
+
+def is_deferred():
+    return getattr(_local, 'deferred', False)
+
+
+def _empty_counters():
+    counters = dict.fromkeys(CreatorStats.COUNTER_FIELDS, 0)
+    counters['next_event_id'] = None
+    return counters
+
+
+def upcoming_events(user_ids):
+    return Event.objects.filter(
+        creator_id__in=user_ids,
+        status=Event.STATUS_SCHEDULED,
+        scheduled_for__gte=timezone.now(),
+    )
+
+
+def bump(user_id, **deltas):
+    """Suma `deltas` a los contadores de `user_id`, creando la fila si no existe."""
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    updates = {field: F(field) + delta for field, delta in deltas.items()}
+    if CreatorStats.objects.filter(user_id=user_id).update(**updates):
+        return
+    if all(delta < 0 for delta in deltas.values()):
+        # Sin fila no hay nada que descontar (p.ej. al borrar el propio usuario)
+        return
+    try:
+        with transaction.atomic():
+            CreatorStats.objects.create(user_id=user_id, **{f: max(d, 0) for f, d in deltas.items()})
+    except IntegrityError:
+        # Otro proceso ha creado la fila a la vez
+        CreatorStats.objects.filter(user_id=user_id).update(**updates)
+
+
+def refresh_upcoming(user_id):
+    upcoming = upcoming_events([user_id])
+    next_event_id = upcoming.order_by('scheduled_for').values_list('pk', flat=True).first()
+    fields = {'upcoming_count': upcoming.count(), 'next_event_id': next_event_id}
+    if not CreatorStats.objects.filter(user_id=user_id).update(**fields) and next_event_id:
+        CreatorStats.objects.get_or_create(user_id=user_id, defaults=fields)
+
+
+def recompute(user_ids):
+    """
+    Recalcula todos los contadores de `user_ids` y guarda solo las filas que
+    han cambiado. Devuelve el número de filas corregidas o creadas.
+    """
+    user_ids = list(user_ids)
+    fresh = defaultdict(_empty_counters)
+
+    for row in (
+        Event.objects.filter(creator_id__in=user_ids)
+        .values('creator_id', 'status').annotate(n=Count('pk')).order_by()
+    ):
+        field = CreatorStats.STATUS_FIELDS.get(row['status'])
+        if field:
+            fresh[row['creator_id']][field] = row['n']
+
+    seen = set()
+    for creator_id, pk in upcoming_events(user_ids).order_by('creator_id', 'scheduled_for').values_list('creator_id', 'pk'):
+        stats = fresh[creator_id]
+        stats['upcoming_count'] += 1
+        if creator_id not in seen:
+            stats['next_event_id'] = pk
+            seen.add(creator_id)
+
+    for row in (
+        Follow.objects.filter(following_id__in=user_ids)
+        .values('following_id').annotate(n=Count('pk')).order_by()
+    ):
+        fresh[row['following_id']]['followers_count'] = row['n']
+
+    for row in (
+        Follow.objects.filter(follower_id__in=user_ids)
+        .values('follower_id').annotate(n=Count('pk')).order_by()
+    ):
+        fresh[row['follower_id']]['following_count'] = row['n']
+
+    for row in (
+        EventPopularity.objects.filter(event__creator_id__in=user_ids)
+        .values('event__creator_id').annotate(n=Sum('views')).order_by()
+    ):
+        fresh[row['event__creator_id']]['total_views'] = row['n'] or 0
+
+    # Las visitas de los eventos archivados siguen contando
+    for row in (
+        ArchivedEvent.objects.filter(creator_id__in=user_ids)
+        .values('creator_id').annotate(n=Sum('views')).order_by()
+    ):
+        fresh[row['creator_id']]['total_views'] += row['n'] or 0
+
+    existing = CreatorStats.objects.in_bulk(user_ids)
+    to_create, to_update = [], []
+    for user_id in user_ids:
+        values = fresh.get(user_id)
+        stats = existing.get(user_id)
+        if stats is None:
+            if values and any(values.values()):
+                to_create.append(CreatorStats(user_id=user_id, **values))
+            continue
+        values = values or _empty_counters()
+        if any(getattr(stats, field) != value for field, value in values.items()):
+            for field, value in values.items():
+                setattr(stats, field, value)
+            stats.updated_at = timezone.now()
+            to_update.append(stats)
+
+    CreatorStats.objects.bulk_create(to_create, batch_size=1000)
+    CreatorStats.objects.bulk_update(to_update, CreatorStats.COUNTER_FIELDS + ['updated_at'], batch_size=1000)
+    return len(to_create) + len(to_update)
+
+
+def get_creator_stats(user_id, stats=None):
+    """
+    Estadísticas listas para mostrar. Si el próximo evento ya ha empezado,
+    los datos de eventos próximos están caducados y se recalculan.
+    """
+    if stats is None:
+        stats = CreatorStats.objects.select_related('next_event').filter(user_id=user_id).first()
+    if stats is None:
+        return CreatorStats(user_id=user_id)
+    if stats.next_event is not None and stats.next_event.scheduled_for < timezone.now():
+        refresh_upcoming(user_id)
+        stats = CreatorStats.objects.select_related('next_event').get(user_id=user_id)
+    return stats
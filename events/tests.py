@@ -1,3 +1,543 @@
-from django.test import TestCase
+import json
+import math
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser
+from django.http import Http404
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from notifications.models import Notification
+from users.models import Follow
+from . import analytics, archive, async_views, facets, stats, views
+from .forms import EventRecurrenceForm
+from .importers import EventImportError, build_events, expand_recurrence, find_schedule_conflicts
+from .transfer import import_events_batch
+from .models import (
+    ArchivedEvent, CreatorStats, Event, EventPopularity, EventStatsBucket, SimilarEvent, UserRecommendation,
+)
+
+
+class ArchiveRestoreTests(TestCase):
+    def setUp(self):
+        self.creator = get_user_model().objects.create_user('creador', password='x')
+        self.viewer = get_user_model().objects.create_user('espectador', password='x')
+        past = timezone.now() - timedelta(days=200)
+        self.old = Event.objects.create(
+            creator=self.creator, title='Antiguo', scheduled_for=past, status=Event.STATUS_FINISHED
+        )
+        self.recent = Event.objects.create(
+            creator=self.creator, title='Reciente', scheduled_for=timezone.now() - timedelta(days=1),
+            status=Event.STATUS_FINISHED,
+        )
+        EventPopularity.objects.create(event=self.old, views=5, joins=2, viewers_sketch=b'\x01\x02')
+        EventPopularity.objects.create(event=self.recent, views=1)
+        EventStatsBucket.objects.create(
+            event=self.old, granularity=EventStatsBucket.GRANULARITY_DAY, bucket_start=past, views=5, joins=2
+        )
+        Notification.objects.create(
+            recipient=self.viewer, kind=Notification.KIND_REMINDER, event=self.old, title='Aviso',
+            idempotency_key=Notification.make_key(Notification.KIND_REMINDER, self.old.pk, self.viewer.pk),
+            read_at=past,
+        )
+        stats.recompute([self.creator.pk])
+
+    def snapshot(self):
+        creator_stats = CreatorStats.objects.get(user=self.creator)
+        return {field: getattr(creator_stats, field) for field in CreatorStats.COUNTER_FIELDS}
+
+    def test_archive_keeps_total_views(self):
+        before = self.snapshot()
+        self.assertEqual(sum(archive.archive(timezone.now() - timedelta(days=90))), 1)
+
+        self.assertFalse(Event.objects.filter(pk=self.old.pk).exists())
+        self.assertEqual(ArchivedEvent.objects.get(original_id=self.old.pk).views, 5)
+        self.assertEqual(self.snapshot()['total_views'], before['total_views'])
+
+    def test_restore_rebuilds_related_rows(self):
+        before = self.snapshot()
+        list(archive.archive(timezone.now() - timedelta(days=90)))
+        self.assertEqual(archive.restore(ArchivedEvent.objects.all()), 1)
+
+        self.assertEqual(self.snapshot(), before)
+        self.assertFalse(ArchivedEvent.objects.exists())
+        popularity = EventPopularity.objects.get(event_id=self.old.pk)
+        self.assertEqual((popularity.views, popularity.joins), (5, 2))
+        self.assertEqual(bytes(popularity.viewers_sketch), b'\x01\x02')
+        self.assertEqual(EventStatsBucket.objects.get(event_id=self.old.pk).views, 5)
+        notification = Notification.objects.get(event_id=self.old.pk)
+        self.assertEqual(notification.recipient_id, self.viewer.pk)
+        self.assertIsNotNone(notification.read_at)
+
+
+class ImportTests(TestCase):
+    def setUp(self):
+        self.creator = get_user_model().objects.create_user('importador', password='x')
+        self.start = (timezone.now() + timedelta(days=7)).replace(microsecond=0)
+
+    def row(self, title, start, **extra):
+        return dict({
+            'title': title, 'description': 'd', 'category': Event.CATEGORY_TALK,
+            'scheduled_for': start.isoformat(),
+        }, **extra)
+
+    def test_build_events_applies_defaults(self):
+        events = build_events([self.row('Charla', self.start, tags='b, a,b ')], self.creator)
+
+        self.assertEqual(len(events), 1)
+        event = events[0]
+        self.assertIsNone(event.pk)
+        self.assertEqual(event.duration_minutes, Event.DEFAULT_DURATION_BY_CATEGORY[Event.CATEGORY_TALK])
+        self.assertEqual(event.ends_at, self.start + timedelta(minutes=event.duration_minutes))
+        self.assertEqual(event.tags, 'a, b')
+
+    def test_build_events_reports_every_bad_row(self):
+        rows = [
+            self.row('Bien', self.start),
+            self.row('Pasado', self.start - timedelta(days=30)),
+            self.row('Imposible', self.start, scheduled_for='2030-02-30T10:00:00'),
+            self.row('x' * 201, self.start + timedelta(days=1), category='cocina'),
+        ]
+        with self.assertRaises(EventImportError) as raised:
+            build_events(rows, self.creator)
+
+        errors = raised.exception.errors
+        self.assertEqual([error.split(':')[0] for error in errors], ['Fila 2', 'Fila 3', 'Fila 4'])
+        self.assertIn('categoría desconocida', errors[2])
+        self.assertIn('supera los 200 caracteres', errors[2])
+
+    def test_expand_recurrence(self):
+        event = build_events([self.row('Taller', self.start, duration_minutes=90)], self.creator)[0]
+        copies = expand_recurrence(event, EventRecurrenceForm.FREQUENCY_WEEKLY, 3)
+
+        self.assertEqual([copy.scheduled_for for copy in copies],
+                         [self.start + timedelta(weeks=i) for i in range(3)])
+        self.assertEqual([copy.ends_at - copy.scheduled_for for copy in copies], [timedelta(minutes=90)] * 3)
+        self.assertTrue(all(copy.pk is None and copy.creator == self.creator for copy in copies))
+
+    def test_overlaps_within_the_file(self):
+        rows = [
+            self.row('Primero', self.start, duration_minutes=60),
+            self.row('Solapado', self.start + timedelta(minutes=30), duration_minutes=60),
+            self.row('Cancelado', self.start, duration_minutes=60, status=Event.STATUS_CANCELLED),
+            self.row('Después', self.start + timedelta(minutes=90), duration_minutes=60),
+        ]
+        with self.assertRaises(EventImportError) as raised:
+            build_events(rows, self.creator)
+
+        self.assertEqual(raised.exception.errors, ['Fila 2: se solapa con la fila 1'])
+
+    def test_overlaps_with_existing_events(self):
+        Event.objects.create(
+            creator=self.creator, title='Existente', description='d', category=Event.CATEGORY_TALK,
+            scheduled_for=self.start, duration_minutes=60, status=Event.STATUS_SCHEDULED,
+        )
+        Event.objects.create(
+            creator=self.creator, title='Anulado', description='d', category=Event.CATEGORY_TALK,
+            scheduled_for=self.start + timedelta(hours=2), duration_minutes=60, status=Event.STATUS_CANCELLED,
+        )
+        events = [
+            Event(creator=self.creator, title=title, scheduled_for=start, duration_minutes=60)
+            for title, start in [
+                ('Choca', self.start + timedelta(minutes=59)),
+                ('Libre', self.start + timedelta(hours=2)),
+            ]
+        ]
+        for number, event in enumerate(events, start=1):
+            event.apply_defaults()
+            event.row_number = number
+
+        self.assertEqual(find_schedule_conflicts(events, self.creator), ['Fila 1: se solapa con "Existente"'])
+
+
+class HyperLogLogTests(TestCase):
+    def estimate(self, values):
+        sketch = analytics.HyperLogLog()
+        for value in values:
+            sketch.add(value)
+        return sketch
+
+    def test_small_cardinalities_are_nearly_exact(self):
+        self.assertEqual(analytics.HyperLogLog().count(), 0)
+        sketch = self.estimate(f'user:{i}' for i in range(50))
+        self.assertAlmostEqual(sketch.count(), 50, delta=2)
+
+    def test_estimate_within_error_bounds(self):
+        # Error típico 1.04 / sqrt(1024) ≈ 3,3 %; margen de tres desviaciones
+        for n in (5000, 50000):
+            self.assertAlmostEqual(self.estimate(range(n)).count(), n, delta=n * 0.1)
+
+    def test_duplicates_and_round_trip(self):
+        sketch = self.estimate(['a', 'b', 'a', 'a', 'b'])
+        self.assertEqual(sketch.count(), 2)
+        restored = analytics.HyperLogLog.from_bytes(sketch.to_bytes())
+        restored.add('c')
+        self.assertEqual(restored.count(), 3)
+
+
+@override_settings(TRENDING_HALF_LIFE_HOURS=24)
+class TrendingScoreTests(TestCase):
+    def test_log2_add(self):
+        self.assertEqual(analytics.log2_add(None, 3.0), 3.0)
+        self.assertAlmostEqual(analytics.log2_add(3.0, 3.0), 4.0)
+        self.assertAlmostEqual(analytics.log2_add(1.0, 0.0), math.log2(3))
+        # 2 ** 5000 no cabe en un float: la suma se hace en espacio log2
+        self.assertAlmostEqual(analytics.log2_add(5000.0, 5000.0), 5001.0)
+
+    def test_contribution_doubles_every_half_life(self):
+        now = timezone.now()
+        later = analytics.trending_contribution(1, now + timedelta(hours=24))
+        self.assertAlmostEqual(later - analytics.trending_contribution(1, now), 1.0)
+        self.assertAlmostEqual(analytics.trending_contribution(2, now), later)
+
+    def test_recent_views_outrank_older_ones(self):
+        now = timezone.now()
+        old = analytics.trending_contribution(10, now - timedelta(hours=48))
+        recent = analytics.trending_contribution(3, now)
+        self.assertGreater(recent, old)
+        # Diez visitas de hace dos vidas medias equivalen a 2,5 de ahora
+        self.assertAlmostEqual(old, analytics.trending_contribution(2.5, now))
+
+
+class AnalyticsFlushTests(TestCase):
+    def setUp(self):
+        self.creator = get_user_model().objects.create_user('analitica', password='x')
+        self.event = Event.objects.create(
+            creator=self.creator, title='Popular', description='d', category=Event.CATEGORY_TALK,
+            scheduled_for=timezone.now() + timedelta(days=1), status=Event.STATUS_SCHEDULED,
+        )
+        self.counters = analytics.EventCounters()
+
+    def test_flush_writes_buckets_popularity_and_creator_views(self):
+        for viewer in ('a', 'b', 'a'):
+            self.counters.record(self.event.pk, views=1, viewer=viewer)
+        self.counters.record(self.event.pk, joins=1, viewer='c')
+        self.assertEqual(self.counters.flush(), 1)
+
+        popularity = EventPopularity.objects.get(event=self.event)
+        self.assertEqual((popularity.views, popularity.joins, popularity.unique_viewers), (3, 1, 3))
+        self.assertIsNotNone(popularity.trending_score)
+        self.assertEqual(EventStatsBucket.objects.get(event=self.event).views, 3)
+        self.assertEqual(CreatorStats.objects.get(user=self.creator).total_views, 3)
+
+        first_score = popularity.trending_score
+        self.counters.record(self.event.pk, views=1, viewer='d')
+        self.counters.flush()
+        popularity.refresh_from_db()
+        self.assertEqual(popularity.views, 4)
+        self.assertGreater(popularity.trending_score, first_score)
+
+    def test_failed_write_keeps_the_counts(self):
+        self.counters.record(self.event.pk, views=2, viewer='a')
+        with mock.patch.object(analytics, 'write_stats', side_effect=RuntimeError('sin base de datos')):
+            with self.assertLogs('events.analytics', 'ERROR'):
+                self.assertEqual(self.counters.flush(), 0)
+
+        self.assertEqual(self.counters.flush(), 1)
+        self.assertEqual(EventPopularity.objects.get(event=self.event).views, 2)
+
+
+class RecommendationTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.c1, self.c2, self.c3, self.fan, self.fan2, self.idle = (
+            User.objects.create_user(name, password='x') for name in ('c1', 'c2', 'c3', 'fan', 'fan2', 'idle')
+        )
+        soon = timezone.now() + timedelta(days=2)
+
+        def event(creator, title, tags, category=Event.CATEGORY_TALK, **extra):
+            return Event.objects.create(
+                creator=creator, title=title, description='d', category=category, tags=tags,
+                scheduled_for=extra.pop('scheduled_for', soon), status=extra.pop('status', Event.STATUS_SCHEDULED),
+            )
+
+        self.a = event(self.c1, 'A', 'python, django')
+        self.b = event(self.c2, 'B', 'python, django')
+        # Mismas etiquetas pero ya terminado: no se recomienda
+        self.c = event(self.c3, 'C', 'python, django', scheduled_for=soon - timedelta(days=10),
+                       status=Event.STATUS_FINISHED)
+        self.d = event(self.c3, 'D', 'cocina, recetas', category=Event.CATEGORY_MUSIC)
+        self.e = event(self.c3, 'E', 'cocina, recetas', category=Event.CATEGORY_MUSIC)
+
+        for follower, following in [(self.fan, self.c1), (self.fan2, self.c1), (self.fan2, self.c2), (self.c1, self.c2)]:
+            Follow.objects.create(follower=follower, following=following)
+        UserRecommendation.objects.create(user=self.idle, event=self.a, rank=1, score=1)
+
+    def compute(self, top_k=10):
+        call_command('compute_recommendations', top_k=top_k, stdout=StringIO())
+
+    def similar(self, event):
+        return list(SimilarEvent.objects.filter(event=event).order_by('rank').values_list('similar_id', flat=True))
+
+    def recommended(self, user):
+        return list(
+            UserRecommendation.objects.filter(user=user).order_by('rank').values_list('event_id', flat=True)
+        )
+
+    def test_similar_events(self):
+        self.compute()
+
+        self.assertEqual(self.similar(self.a)[0], self.b.pk)
+        self.assertEqual(self.similar(self.d), [self.e.pk])
+        for event in (self.a, self.b, self.c, self.d, self.e):
+            similar = self.similar(event)
+            self.assertNotIn(event.pk, similar)
+            self.assertNotIn(self.c.pk, similar)
+        # El evento terminado sigue teniendo similares (su ficha los muestra):
+        # primero los de sus etiquetas y después los del mismo creador
+        similar = self.similar(self.c)
+        self.assertEqual(set(similar[:2]), {self.a.pk, self.b.pk})
+        self.assertEqual(set(similar[2:]), {self.d.pk, self.e.pk})
+
+    def test_top_k_limits_and_orders_by_score(self):
+        self.compute(top_k=1)
+
+        self.assertEqual(self.similar(self.a), [self.b.pk])
+        self.assertEqual(len(self.similar(self.c)), 1)
+        self.assertEqual(self.recommended(self.fan2), [self.a.pk])
+
+    def test_user_recommendations(self):
+        self.compute()
+
+        # Seguido directamente antes que el creador parecido (co-follow)
+        self.assertEqual(self.recommended(self.fan), [self.a.pk, self.b.pk])
+        self.assertEqual(self.recommended(self.fan2), [self.a.pk, self.b.pk])
+        # Nunca sus propios eventos ni los de creadores sin relación
+        self.assertEqual(self.recommended(self.c1), [self.b.pk])
+        self.assertEqual(self.recommended(self.idle), [])
+
+
+class CreatorStatsSignalTests(TestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.alice = User.objects.create_user('alice', password='x')
+        self.bob = User.objects.create_user('bob', password='x')
+
+    def create_event(self, creator, days, status=Event.STATUS_SCHEDULED):
+        return Event.objects.create(
+            creator=creator, title='Evento', description='d', category=Event.CATEGORY_TALK,
+            scheduled_for=timezone.now() + timedelta(days=days), status=status,
+        )
+
+    def assertMatchesRecompute(self):
+        users = [self.alice.pk, self.bob.pk]
+        maintained = {
+            stats_row.user_id: [getattr(stats_row, field) for field in CreatorStats.COUNTER_FIELDS]
+            for stats_row in CreatorStats.objects.filter(user_id__in=users)
+        }
+        self.assertEqual(stats.recompute(users), 0, maintained)
+
+    def test_create_and_status_change(self):
+        later = self.create_event(self.alice, 3)
+        sooner = self.create_event(self.alice, 1)
+        self.create_event(self.alice, 2, status=Event.STATUS_DRAFT)
+        self.assertMatchesRecompute()
+        alice = CreatorStats.objects.get(user=self.alice)
+        self.assertEqual((alice.scheduled_count, alice.draft_count, alice.upcoming_count), (2, 1, 2))
+        self.assertEqual(alice.next_event_id, sooner.pk)
+
+        sooner.status = Event.STATUS_CANCELLED
+        sooner.save()
+        self.assertMatchesRecompute()
+        self.assertEqual(CreatorStats.objects.get(user=self.alice).next_event_id, later.pk)
+
+    def test_creator_change_and_deferred_fields(self):
+        event = self.create_event(self.alice, 1)
+        event.creator = self.bob
+        event.save()
+        self.assertMatchesRecompute()
+
+        # Instancia sin estado ni creador cargados: recálculo exacto
+        partial = Event.objects.only('title').get(pk=event.pk)
+        partial.title = 'Otro'
+        partial.save()
+        self.assertMatchesRecompute()
+
+    def test_delete(self):
+        event = self.create_event(self.alice, 1)
+        self.create_event(self.alice, 2, status=Event.STATUS_LIVE)
+        event.delete()
+        self.assertMatchesRecompute()
+        alice = CreatorStats.objects.get(user=self.alice)
+        self.assertEqual((alice.scheduled_count, alice.live_count, alice.next_event_id), (0, 1, None))
+
+    def test_follow_and_unfollow(self):
+        follow = Follow.objects.create(follower=self.bob, following=self.alice)
+        self.assertMatchesRecompute()
+        self.assertEqual(CreatorStats.objects.get(user=self.alice).followers_count, 1)
+        self.assertEqual(CreatorStats.objects.get(user=self.bob).following_count, 1)
+
+        follow.delete()
+        self.assertMatchesRecompute()
+        self.assertEqual(CreatorStats.objects.get(user=self.alice).followers_count, 0)
+
+
+class EventTransferImportTests(TestCase):
+    def setUp(self):
+        self.creator = get_user_model().objects.create_user('origen', password='x')
+        self.when = (timezone.now() + timedelta(days=3)).replace(microsecond=0)
+
+    def row(self, **extra):
+        return dict({
+            'creator__username': 'origen', 'title': 'Importado', 'description': 'd',
+            'category': Event.CATEGORY_TALK, 'scheduled_for': self.when.isoformat(),
+            'status': Event.STATUS_SCHEDULED, 'duration_minutes': '60',
+        }, **extra)
+
+    def test_reimport_updates_instead_of_duplicating(self):
+        self.assertEqual(import_events_batch([self.row()]), (1, 0, 0, []))
+        self.assertEqual(import_events_batch([self.row(description='nueva', duration_minutes='90')]), (0, 1, 0, []))
+
+        event = Event.objects.get()
+        self.assertEqual(event.description, 'nueva')
+        self.assertEqual(event.ends_at, self.when + timedelta(minutes=90))
+        self.assertEqual(CreatorStats.objects.get(user=self.creator).scheduled_count, 1)
+
+    def test_bad_rows_are_rejected_without_stopping_the_batch(self):
+        created, updated, rejected, errors = import_events_batch([
+            self.row(),
+            self.row(title='Sin creador', creator__username='nadie'),
+            self.row(title='Sin fecha', scheduled_for=''),
+            self.row(title='Duración', duration_minutes='mucha'),
+            self.row(title='Categoría', category='cocina'),
+        ])
+
+        self.assertEqual((created, updated, rejected), (1, 0, 4))
+        self.assertEqual(len(errors), 4)
+        self.assertIn('el creador no existe', errors[0])
+        self.assertIn('faltan el título o la fecha', errors[1])
+        self.assertIn('duration_minutes', errors[2])
+        self.assertIn('category', errors[3])
+        self.assertEqual(list(Event.objects.values_list('title', flat=True)), ['Importado'])
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class FacetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.creator = get_user_model().objects.create_user('facetas', password='x')
+        for category, status, difficulty in [
+            (Event.CATEGORY_TALK, Event.STATUS_SCHEDULED, Event.DIFFICULTY_BEGINNER),
+            (Event.CATEGORY_TALK, Event.STATUS_SCHEDULED, Event.DIFFICULTY_BEGINNER),
+            (Event.CATEGORY_MUSIC, Event.STATUS_SCHEDULED, Event.DIFFICULTY_ADVANCED),
+            (Event.CATEGORY_TALK, Event.STATUS_DRAFT, Event.DIFFICULTY_BEGINNER),
+        ]:
+            self.create(category, status, difficulty)
+
+    def create(self, category, status, difficulty=Event.DIFFICULTY_BEGINNER):
+        return Event.objects.create(
+            creator=self.creator, title='Faceta', description='d', category=category, status=status,
+            difficulty=difficulty, scheduled_for=timezone.now() + timedelta(days=1),
+        )
+
+    def counts(self, **filters):
+        return {facet: dict(values) for facet, values in facets.compute_counts(Event.objects.all(), filters).items()}
+
+    def test_each_facet_ignores_its_own_filter(self):
+        self.assertEqual(self.counts(category=Event.CATEGORY_TALK), {
+            'category': {Event.CATEGORY_TALK: 3, Event.CATEGORY_MUSIC: 1},
+            'status': {Event.STATUS_SCHEDULED: 2, Event.STATUS_DRAFT: 1},
+            'difficulty': {Event.DIFFICULTY_BEGINNER: 3},
+        })
+        self.assertEqual(self.counts(category=Event.CATEGORY_TALK, status=Event.STATUS_SCHEDULED), {
+            'category': {Event.CATEGORY_TALK: 2, Event.CATEGORY_MUSIC: 1},
+            'status': {Event.STATUS_SCHEDULED: 2, Event.STATUS_DRAFT: 1},
+            'difficulty': {Event.DIFFICULTY_BEGINNER: 2},
+        })
+
+    def test_options_for_the_template(self):
+        options = facets.facet_counts(Event.objects.all(), '', {'difficulty': Event.DIFFICULTY_ADVANCED})
+
+        self.assertEqual([o['value'] for o in options['category']], [v for v, _l in Event.CATEGORY_CHOICES])
+        music = next(o for o in options['category'] if o['value'] == Event.CATEGORY_MUSIC)
+        self.assertEqual((music['count'], music['selected']), (1, False))
+        advanced = next(o for o in options['difficulty'] if o['value'] == Event.DIFFICULTY_ADVANCED)
+        self.assertEqual((advanced['count'], advanced['selected']), (1, True))
+
+    def test_event_changes_bump_the_cache_version(self):
+        def talk_count():
+            options = facets.facet_counts(Event.objects.all(), '', {})
+            return next(o['count'] for o in options['category'] if o['value'] == Event.CATEGORY_TALK)
+
+        self.assertEqual(talk_count(), 3)
+        with self.assertNumQueries(0):
+            self.assertEqual(talk_count(), 3)
+
+        version = cache.get(facets.VERSION_KEY)
+        event = self.create(Event.CATEGORY_TALK, Event.STATUS_SCHEDULED)
+        self.assertEqual(cache.get(facets.VERSION_KEY), version + 1)
+        self.assertEqual(talk_count(), 4)
+
+        event.delete()
+        self.assertEqual(talk_count(), 3)
+
+
+# Las vistas asíncronas consultan desde el pool de events.aio: sus conexiones
+# solo ven datos confirmados
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class AsyncViewTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.creator = get_user_model().objects.create_user('asincrono', password='x')
+        start = timezone.now() + timedelta(days=1)
+        self.events = [
+            Event.objects.create(
+                creator=self.creator, title=f'Evento {i}', description='d', tags='python',
+                category=Event.CATEGORY_TALK if i % 2 else Event.CATEGORY_MUSIC,
+                scheduled_for=start + timedelta(hours=i), status=Event.STATUS_SCHEDULED,
+            )
+            for i in range(30)
+        ]
+        for rank, similar in enumerate(self.events[1:4], start=1):
+            SimilarEvent.objects.create(event=self.events[0], similar=similar, rank=rank, score=1 / rank)
+        EventPopularity.objects.create(event=self.events[0], views=7)
+        self.factory = RequestFactory()
+
+    def request(self, url):
+        request = self.factory.get(url)
+        request.user = AnonymousUser()
+        return request
+
+    def both(self, view_name, url, *args):
+        sync = getattr(views, view_name)(self.request(url), *args)
+        asynchronous = async_to_sync(getattr(async_views, view_name))(self.request(url), *args)
+        self.assertEqual(asynchronous.status_code, sync.status_code)
+        return sync, asynchronous
+
+    def test_list_api(self):
+        for url in ('/events/api/', '/events/api/?category=talk&q=evento', '/events/api/?order=trending'):
+            sync, asynchronous = self.both('event_list_api', url)
+            self.assertJSONEqual(asynchronous.content, sync.content.decode())
+
+    def test_detail_api(self):
+        sync, asynchronous = self.both('event_detail_api', '/', self.events[0].pk)
+        self.assertJSONEqual(asynchronous.content, sync.content.decode())
+        data = json.loads(asynchronous.content)
+        self.assertEqual(len(data['similar']), 3)
+        self.assertEqual(data['views'], 7)
+
+    def test_detail_api_of_an_archived_event(self):
+        event = Event.objects.create(
+            creator=self.creator, title='Viejo', description='d', category=Event.CATEGORY_TALK,
+            scheduled_for=timezone.now() - timedelta(days=200), status=Event.STATUS_FINISHED,
+        )
+        list(archive.archive(timezone.now() - timedelta(days=90)))
+
+        sync, asynchronous = self.both('event_detail_api', '/', event.pk)
+        self.assertJSONEqual(asynchronous.content, sync.content.decode())
+        self.assertTrue(json.loads(asynchronous.content)['archived'])
+
+    def test_missing_event(self):
+        with self.assertRaises(Http404):
+            async_to_sync(async_views.event_detail_api)(self.request('/'), 0)
+
+    def test_list_page(self):
+        for url in ('/events/', '/events/?page=2', '/events/?category=music'):
+            sync, asynchronous = self.both('event_list_view', url)
+            self.assertEqual(asynchronous.content, sync.content)
@@ -0,0 +1,100 @@
+"""
+Exportación e importación de eventos en streaming (ver users.transfer).
+
+El creador viaja como `creator__username` y se resuelve por lotes en el
+destino. Un evento se identifica por (creador, fecha, título): reimportar
+el mismo fichero actualiza los eventos en lugar de duplicarlos. No hay un
+índice único sobre esa clave: import_events reparte las filas por creador
+(run_batches con `key`) para que dos hilos nunca hagan el upsert del mismo
+evento a la vez.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from outbox import records
+from outbox.models import ChangeRecord
+from users.transfer import MAX_REPORTED_ERRORS, invalid_fields, parse_row, resolve_usernames
+from . import stats
+from .models import Event
+
+
+EVENT_FIELDS = [
+    'id', 'creator__username', 'title', 'description', 'category', 'difficulty',
+    'scheduled_for', 'duration_minutes', 'status', 'max_viewers', 'tags',
+    'stream_url', 'is_featured', 'thumbnail', 'created_at', 'updated_at',
+]
+# Campos que se copian al importar; ids, fechas de alta y ends_at son del destino
+EVENT_IMPORT_FIELDS = [
+    'title', 'description', 'category', 'difficulty', 'scheduled_for', 'duration_minutes',
+    'status', 'max_viewers', 'tags', 'stream_url', 'is_featured', 'thumbnail',
+]
+# Campos que clean_fields() no valida al importar (la descripción puede venir vacía)
+EVENT_UNCHECKED_FIELDS = ['creator', 'description', 'thumbnail', 'ends_at']
+
+
+def creator_key(row):
+    return row.get('creator__username')
+
+
+def import_events_batch(rows):
+    """
+    Upsert de un lote de eventos. Devuelve (creados, actualizados, rechazados,
+    errores): las filas cuyo creador no existe en el destino, con valores que
+    no se pueden convertir o que no pasan clean_fields() se rechazan sin
+    detener la importación.
+    """
+    creator_ids = resolve_usernames(row.get('creator__username') for row in rows)
+    incoming = {}
+    errors = []
+    for row in rows:
+        label = f"{row.get('creator__username')} · {row.get('title')} · {row.get('scheduled_for')}"
+        try:
+            values = parse_row(row, EVENT_IMPORT_FIELDS)
+        except ValueError as exc:
+            errors.append(f'{label}: {exc}')
+            continue
+        creator_id = creator_ids.get(row.get('creator__username'))
+        if creator_id is None:
+            errors.append(f'{label}: el creador no existe')
+            continue
+        if not values['title'] or values['scheduled_for'] is None:
+            errors.append(f'{label}: faltan el título o la fecha')
+            continue
+        # Los campos ausentes del fichero conservan su valor por defecto
+        values = {field: value for field, value in values.items() if value is not None}
+        incoming[(creator_id, values['scheduled_for'], values['title'])] = (label, values)
+
+    if not incoming:
+        return 0, 0, len(errors), errors[:MAX_REPORTED_ERRORS]
+
+    now = timezone.now()
+    with transaction.atomic():
+        existing = {
+            (event.creator_id, event.scheduled_for, event.title): event
+            for event in Event.objects.filter(
+                creator_id__in={key[0] for key in incoming},
+                scheduled_for__in={key[1] for key in incoming},
+            )
+        }
+        to_create, to_update = [], []
+        for key, (label, values) in incoming.items():
+            event = existing.get(key) or Event(creator_id=key[0])
+            for field, value in values.items():
+                setattr(event, field, value)
+            problem = invalid_fields(event, EVENT_UNCHECKED_FIELDS)
+            if problem:
+                errors.append(f'{label}: {problem}')
+                continue
+            # bulk_create/bulk_update no pasan por save()
+            event.apply_defaults()
+            event.updated_at = now
+            (to_update if event.pk else to_create).append(event)
+
+        with stats.deferred():
+            records.bulk_create(Event, to_create, batch_size=1000)
+        Event.objects.bulk_update(
+            to_update, EVENT_IMPORT_FIELDS + ['ends_at', 'updated_at'], batch_size=1000
+        )
+        records.record_objects(to_update, ChangeRecord.OP_UPDATE)
+        stats.recompute({key[0] for key in incoming})
+    return len(to_create), len(to_update), len(errors), errors[:MAX_REPORTED_ERRORS]
@@ -1,12 +1,22 @@
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import async_views, views
 
 app_name = 'events'
 
+# Con ASGI (ASYNC_VIEWS) las vistas de lectura se sirven en su versión async
+read_views = async_views if settings.ASYNC_VIEWS else views
+
 urlpatterns = [
-    path('', views.event_list_view, name='list'),
+    path('', read_views.event_list_view, name='list'),
     path('my-events/', views.my_events_view, name='my_events'),
     path('create/', views.event_create_view, name='create'),
-    path('<int:pk>/', views.event_detail_view, name='detail'),
+    path('create/recurring/', views.event_recurring_view, name='create_recurring'),
+    path('import/', views.event_import_view, name='import'),
+    path('<int:pk>/', read_views.event_detail_view, name='detail'),
     path('<int:pk>/edit/', views.event_update_view, name='edit'),
+    path('<int:pk>/join/', views.event_join_view, name='join'),
+    path('timeline/', views.event_timeline_view, name='timeline'),
+    path('api/events/', read_views.event_list_api, name='api_list'),
+    path('api/events/<int:pk>/', read_views.event_detail_api, name='api_detail'),
 ]
@@ -1,46 +1,205 @@
+from django.http import Http404, JsonResponse
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db.models import Q
+from datetime import timedelta
 
-from .models import Event
-from .forms import EventForm
+from django.db.models import F, Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 
+from . import analytics, api, archive, facets
+from .models import ArchivedEvent, Event
+from .forms import EventForm, EventImportForm, EventRecurrenceForm
+from .importers import EventImportError, build_events, expand_recurrence, read_rows, save_events
 
-def event_list_view(request):
-    """Listado principal de eventos con búsqueda y filtros."""
-    events = Event.objects.select_related('creator')
 
+LIST_PAGE_SIZE = 24
+
+
+def list_params(request):
+    """(q, filtros por faceta, orden) del listado a partir de la query string."""
     q = request.GET.get('q', '').strip()
-    category = request.GET.get('category', '').strip()
-    status = request.GET.get('status', '').strip()
+    filters = {facet: request.GET.get(facet, '').strip() for facet in facets.FACETS}
+    order = request.GET.get('order', '').strip()
+    return q, filters, order
+
 
+def search_events(q):
+    events = Event.objects.select_related('creator')
     if q:
         events = events.filter(
             Q(title__icontains=q) |
             Q(description__icontains=q) |
             Q(tags__icontains=q)
         )
+    return events
+
+
+def filter_events(events, filters, order):
+    active = {facet: value for facet, value in filters.items() if value}
+    if active:
+        events = events.filter(**active)
+    if order == 'trending':
+        events = events.order_by(F('popularity__trending_score').desc(nulls_last=True), '-scheduled_for')
+    return events
+
+
+def list_page(request, events):
+    """
+    Trozo de `events` de la página pedida (?page=N) con una fila de más para
+    saber si hay página siguiente sin un COUNT. Devuelve (queryset, página).
+    """
+    try:
+        page = max(int(request.GET.get('page', 1)), 1)
+    except ValueError:
+        page = 1
+    start = (page - 1) * LIST_PAGE_SIZE
+    return events[start:start + LIST_PAGE_SIZE + 1], page
+
+
+def page_context(request, rows, page):
+    """Variables de paginación de la plantilla a partir de las filas de list_page()."""
+    query = request.GET.copy()
+    query.pop('page', None)
+    return {
+        'events': rows[:LIST_PAGE_SIZE],
+        'page': page,
+        'has_next': len(rows) > LIST_PAGE_SIZE,
+        'page_query': query.urlencode(),
+    }
+
 
-    if category:
-        events = events.filter(category=category)
+def recommended_events(user):
+    # Lista precalculada por compute_recommendations: una sola consulta
+    return (
+        Event.objects.filter(recommended_to__user=user)
+        .select_related('creator')
+        .order_by('recommended_to__rank')[:6]
+    )
 
-    if status:
-        events = events.filter(status=status)
+
+def similar_events(event_id):
+    return (
+        Event.objects.filter(recommended_in__event_id=event_id)
+        .select_related('creator')
+        .order_by('recommended_in__rank')[:6]
+    )
+
+
+def find_event(pk):
+    """
+    Evento con su creador y popularidad. Los eventos archivados ya no están
+    en Event pero su ficha sigue visible: se devuelven con is_archived=True.
+    """
+    event = Event.objects.select_related('creator', 'popularity').filter(pk=pk).first()
+    if event is not None:
+        return event
+    archived = ArchivedEvent.objects.select_related('creator').filter(original_id=pk).first()
+    if archived is None:
+        raise Http404('Evento no encontrado.')
+    event = archive.to_event(archived)
+    event.creator = archived.creator
+    return event
+
+
+def event_list_view(request):
+    """Listado principal de eventos con búsqueda y filtros."""
+    q, filters, order = list_params(request)
+    events = search_events(q)
+    # Recuentos por faceta: una consulta agrupada (o ninguna si está en caché)
+    facet_options = facets.facet_counts(events, q, filters)
+    events, page = list_page(request, filter_events(events, filters, order))
+
+    recommended = []
+    if request.user.is_authenticated and not (q or any(filters.values())):
+        recommended = recommended_events(request.user)
 
     context = {
-        'events': events,
+        **page_context(request, list(events), page),
+        'recommended': recommended,
         'q': q,
-        'category': category,
-        'status': status,
+        'facets': facet_options,
+        'order': order,
     }
     return render(request, 'events/event_list.html', context)
 
 
 def event_detail_view(request, pk):
     """Detalle de un evento concreto."""
-    event = get_object_or_404(Event, pk=pk)
-    return render(request, 'events/event_detail.html', {'event': event})
+    event = find_event(pk)
+    if getattr(event, 'is_archived', False):
+        return render(request, 'events/event_detail.html', {'event': event, 'archived': True})
+
+    analytics.record_view(request, event.pk)
+    return render(request, 'events/event_detail.html', {'event': event, 'similar_events': similar_events(event.pk)})
+
+
+def event_list_api(request):
+    """Listado en JSON con los mismos filtros que event_list_view."""
+    q, filters, order = list_params(request)
+    events = search_events(q)
+    return JsonResponse(api.list_payload(
+        facets.facet_counts(events, q, filters),
+        filter_events(events, filters, order)[:api.PAGE_SIZE],
+    ))
+
+
+def event_detail_api(request, pk):
+    event = find_event(pk)
+    similar = [] if getattr(event, 'is_archived', False) else similar_events(event.pk)
+    return JsonResponse(api.detail_payload(event, similar))
+
+
+def event_join_view(request, pk):
+    """Registra el acceso al streaming y redirige a la URL del evento."""
+    event = get_object_or_404(Event.objects.only('stream_url'), pk=pk)
+    if not event.stream_url:
+        return redirect('events:detail', pk=event.pk)
+    analytics.record_join(request, event.pk)
+    return redirect(event.stream_url)
+
+
+def event_timeline_view(request):
+    """Eventos que coinciden con una franja horaria (por defecto, las próximas 24 horas)."""
+    try:
+        hours = min(max(int(request.GET.get('hours', 24)), 1), 24 * 7)
+    except ValueError:
+        hours = 24
+    try:
+        # parse_datetime lanza ValueError con fechas imposibles (p.ej. 2026-02-30)
+        start = parse_datetime(request.GET.get('start', ''))
+        if start is not None and timezone.is_naive(start):
+            start = timezone.make_aware(start)
+        end = start + timedelta(hours=hours) if start is not None else None
+    except (ValueError, OverflowError):
+        start = None
+    if start is None:
+        start = timezone.now()
+        end = start + timedelta(hours=hours)
+    window = (end - start).total_seconds()
+
+    events = list(
+        Event.objects.select_related('creator')
+        .exclude(status=Event.STATUS_CANCELLED)
+        .overlapping(start, end)
+        .order_by('scheduled_for')[:200]
+    )
+    # Posición y anchura de cada evento en la barra de la franja (en %)
+    for event in events:
+        visible_start = max(event.scheduled_for, start)
+        visible_end = min(event.ends_at, end)
+        event.offset = round((visible_start - start).total_seconds() * 100 / window, 2)
+        event.width = max(round((visible_end - visible_start).total_seconds() * 100 / window, 2), 0.5)
+
+    context = {
+        'events': events,
+        'happening_now': Event.objects.select_related('creator').happening_now().order_by('scheduled_for')[:50],
+        'start': start,
+        'end': end,
+        'hours': hours,
+    }
+    return render(request, 'events/event_timeline.html', context)
 
 
 @login_required
@@ -54,7 +213,7 @@ def my_events_view(request):
 def event_create_view(request):
     """Crear un nuevo evento."""
     if request.method == 'POST':
-        form = EventForm(request.POST, request.FILES)
+        form = EventForm(request.POST, request.FILES, creator=request.user)
         if form.is_valid():
             event = form.save(commit=False)
             event.creator = request.user
@@ -74,7 +233,8 @@ def event_update_view(request, pk):
     """Editar un evento (solo el creador puede editar)."""
     event = get_object_or_404(Event, pk=pk)
 
-    if event.creator != request.user:
+    # Comparamos ids: no hace falta cargar el creador
+    if event.creator_id != request.user.pk:
         messages.error(request, 'Solo el creador del evento puede editarlo.')
         return redirect('events:detail', pk=event.pk)
 
@@ -90,3 +250,53 @@ def event_update_view(request, pk):
         form = EventForm(instance=event)
 
     return render(request, 'events/event_form.html', {'form': form, 'mode': 'edit', 'event': event})
+
+
+@login_required
+def event_recurring_view(request):
+    """Crear una serie de eventos a partir de una regla de repetición."""
+    if request.method == 'POST':
+        form = EventRecurrenceForm(request.POST, request.FILES, creator=request.user)
+        if form.is_valid():
+            event = form.save(commit=False)
+            event.creator = request.user
+            events = expand_recurrence(
+                event,
+                form.cleaned_data['frequency'],
+                form.cleaned_data['occurrences'],
+            )
+            save_events(events)
+            messages.success(request, f'Se han creado {len(events)} eventos.')
+            return redirect('events:my_events')
+        else:
+            messages.error(request, 'Revisa los errores del formulario.')
+    else:
+        form = EventRecurrenceForm()
+
+    return render(request, 'events/event_bulk_form.html', {'form': form, 'mode': 'recurring'})
+
+
+@login_required
+def event_import_view(request):
+    """Importar varios eventos desde un fichero CSV o JSON."""
+    import_errors = []
+    if request.method == 'POST':
+        form = EventImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            try:
+                rows = read_rows(form.cleaned_data['file'])
+                events = build_events(rows, creator=request.user)
+            except EventImportError as exc:
+                import_errors = exc.errors
+                messages.error(request, 'El fichero contiene errores. No se ha importado ningún evento.')
+            else:
+                save_events(events)
+                messages.success(request, f'Se han importado {len(events)} eventos.')
+                return redirect('events:my_events')
+        else:
+            messages.error(request, 'Revisa los errores del formulario.')
+    else:
+        form = EventImportForm()
+
+    context = {'form': form, 'mode': 'import', 'import_errors': import_errors}
+    return render(request, 'events/event_bulk_form.html', context)
@@ -0,0 +1,15 @@
+from django.contrib import admin
+
+from config.paginators import EstimatedCountPaginator
+from .models import Notification
+
+
+@admin.register(Notification)
+class NotificationAdmin(admin.ModelAdmin):
+    list_display = ('title', 'recipient', 'kind', 'created_at', 'read_at', 'emailed_at')
+    list_select_related = ('recipient',)
+    list_filter = ('kind',)
+    search_fields = ('^recipient__username', '=idempotency_key')
+    raw_id_fields = ('recipient', 'event')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
@@ -0,0 +1,239 @@
+"""
+Reparto de avisos de eventos a los seguidores de sus creadores.
+
+1. Se buscan los eventos que empiezan pronto (recordatorio) o que están en
+   directo (aviso de directo).
+2. Los destinatarios se obtienen recorriendo Follow por pk en lotes
+   (keyset), sin OFFSET ni cargar las relaciones de golpe.
+3. Los avisos se agrupan por usuario: cada usuario recibe un único email
+   con todos sus eventos, aunque siga a cientos de creadores.
+4. Los usuarios se reparten en bloques que procesa un pool de hilos. Cada
+   aviso tiene una clave de idempotencia, así que repetir una ejecución no
+   duplica avisos ni emails.
+
+Antes de enviar, cada bloque reserva sus avisos pendientes con un UPDATE
+condicional (emailed_at nulo → ahora, email_claim = uuid de la reserva) y
+solo envía los que ha reservado: dos ejecuciones simultáneas no mandan el
+mismo email. Si el envío falla la reserva se deshace y se reintenta en la
+siguiente ejecución.
+"""
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.mail import EmailMessage, get_connection
+from django.db import IntegrityError, connection, transaction
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils import timezone
+
+from events.models import Event
+from users.models import Follow
+from .models import Notification
+
+
+User = get_user_model()
+
+FOLLOW_BATCH_SIZE = 5000
+CREATOR_BATCH_SIZE = 500
+# Claves por consulta idempotency_key__in
+KEY_BATCH_SIZE = 1000
+
+
+def due_events(now, window_minutes):
+    """{event_id: (kind, creator_id, title, scheduled_for)} de los eventos a anunciar."""
+    due = {}
+    reminders = Event.objects.filter(
+        status=Event.STATUS_SCHEDULED,
+        scheduled_for__gte=now,
+        scheduled_for__lt=now + timedelta(minutes=window_minutes),
+    )
+    live = Event.objects.filter(status=Event.STATUS_LIVE).overlapping(now, now)
+    for kind, queryset in ((Notification.KIND_REMINDER, reminders), (Notification.KIND_LIVE, live)):
+        for pk, creator_id, title, scheduled_for in queryset.values_list(
+            'pk', 'creator_id', 'title', 'scheduled_for'
+        ):
+            due[pk] = (kind, creator_id, title, scheduled_for)
+    return due
+
+
+def iter_followers(creator_ids, batch_size=FOLLOW_BATCH_SIZE):
+    """Recorre Follow por pk (keyset) y devuelve lotes de (follower_id, following_id)."""
+    creator_ids = sorted(creator_ids)
+    for i in range(0, len(creator_ids), CREATOR_BATCH_SIZE):
+        creators = creator_ids[i:i + CREATOR_BATCH_SIZE]
+        last_pk = 0
+        while True:
+            batch = list(
+                Follow.objects.filter(following_id__in=creators, pk__gt=last_pk)
+                .order_by('pk')
+                .values_list('pk', 'follower_id', 'following_id')[:batch_size]
+            )
+            if not batch:
+                break
+            last_pk = batch[-1][0]
+            yield [(follower_id, following_id) for _pk, follower_id, following_id in batch]
+
+
+def build_digests(due):
+    """{user_id: [event_id, ...]} con todos los eventos que debe recibir cada usuario."""
+    events_by_creator = defaultdict(list)
+    for event_id, (_kind, creator_id, _title, _when) in due.items():
+        events_by_creator[creator_id].append(event_id)
+
+    digests = defaultdict(list)
+    for batch in iter_followers(events_by_creator):
+        for follower_id, following_id in batch:
+            digests[follower_id].extend(events_by_creator[following_id])
+    return digests
+
+
+def notification_title(kind, title):
+    if kind == Notification.KIND_LIVE:
+        return f'🔴 En directo: {title}'
+    return f'⏰ Empieza pronto: {title}'
+
+
+def in_batches(items, size=KEY_BATCH_SIZE):
+    items = list(items)
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def create_notifications(new):
+    """Inserta los avisos nuevos; si otra ejecución ha creado alguno a la vez, los salta."""
+    try:
+        with transaction.atomic():
+            Notification.objects.bulk_create(new, batch_size=1000)
+        return len(new)
+    except IntegrityError:
+        pass
+    created = 0
+    for notification in new:
+        try:
+            with transaction.atomic():
+                notification.save(force_insert=True)
+            created += 1
+        except IntegrityError:
+            continue
+    return created
+
+
+def claim_emails(keys, now):
+    """
+    Reserva para esta ejecución los avisos de `keys` aún sin email y devuelve
+    (uuid de la reserva, [(clave, destinatario, evento, tipo), ...]).
+    """
+    claim = uuid.uuid4()
+    for batch in in_batches(keys):
+        Notification.objects.filter(idempotency_key__in=batch, emailed_at__isnull=True).update(
+            emailed_at=now, email_claim=claim
+        )
+    claimed = Notification.objects.filter(email_claim=claim).values_list(
+        'idempotency_key', 'recipient_id', 'event_id', 'kind'
+    )
+    return claim, list(claimed)
+
+
+def release_emails(claim):
+    Notification.objects.filter(email_claim=claim).update(emailed_at=None, email_claim=None)
+
+
+def deliver_chunk(chunk, due):
+    """
+    Crea los avisos de un bloque de usuarios y envía un email-resumen a cada
+    uno. Devuelve (avisos creados, emails enviados).
+    """
+    try:
+        now = timezone.now()
+        wanted = {}
+        for user_id, event_ids in chunk:
+            for event_id in event_ids:
+                kind = due[event_id][0]
+                wanted[Notification.make_key(kind, event_id, user_id)] = (user_id, event_id, kind)
+
+        existing = set()
+        for batch in in_batches(wanted):
+            existing.update(
+                Notification.objects.filter(idempotency_key__in=batch).values_list('idempotency_key', flat=True)
+            )
+        created = create_notifications([
+            Notification(
+                recipient_id=user_id,
+                event_id=event_id,
+                kind=kind,
+                title=notification_title(kind, due[event_id][2]),
+                idempotency_key=key,
+            )
+            for key, (user_id, event_id, kind) in wanted.items()
+            if key not in existing
+        ])
+
+        # Email pendiente: avisos nuevos y los de ejecuciones anteriores que no
+        # llegaron a enviarse, solo de usuarios a los que se puede escribir
+        recipients = {
+            user.pk: user
+            for user in User.objects.filter(pk__in=[user_id for user_id, _events in chunk], is_active=True)
+            .exclude(email='').only('username', 'email', 'display_name')
+        }
+        claim, claimed = claim_emails(
+            [key for key, (user_id, _event_id, _kind) in wanted.items() if user_id in recipients], now
+        )
+        pending = defaultdict(list)
+        for key, user_id, event_id, kind in claimed:
+            pending[user_id].append((key, event_id, kind))
+
+        messages = []
+        for user_id, items in pending.items():
+            user = recipients[user_id]
+            items.sort(key=lambda item: due[item[1]][3])
+            body = render_to_string('notifications/email/digest.txt', {
+                'user': user,
+                'items': [
+                    {
+                        'title': notification_title(kind, due[event_id][2]),
+                        'scheduled_for': due[event_id][3],
+                        'url': settings.SITE_URL + reverse('events:detail', args=[event_id]),
+                    }
+                    for _key, event_id, kind in items
+                ],
+            })
+            subject = f'StreamEvents: {len(items)} evento(s) de creadores que sigues'
+            messages.append(EmailMessage(subject, body, to=[user.email]))
+
+        sent = 0
+        if messages:
+            try:
+                with get_connection() as mail:
+                    sent = mail.send_messages(messages) or 0
+            except Exception:
+                # Sin enviar: la siguiente ejecución los vuelve a reservar
+                release_emails(claim)
+                raise
+        return created, sent
+    finally:
+        # Cada hilo tiene su propia conexión a la base de datos
+        connection.close()
+
+
+def send_notifications(window_minutes=15, workers=4, chunk_size=1000, log=None):
+    now = timezone.now()
+    due = due_events(now, window_minutes)
+    if not due:
+        return 0, 0, 0
+
+    digests = build_digests(due)
+    items = list(digests.items())
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+    if log:
+        log(f'{len(due)} eventos, {len(digests)} destinatarios, {len(chunks)} bloques.')
+
+    created = sent = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for chunk_created, chunk_sent in pool.map(lambda chunk: deliver_chunk(chunk, due), chunks):
+            created += chunk_created
+            sent += chunk_sent
+    return len(digests), created, sent
@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from notifications.delivery import send_notifications
+
+
+class Command(BaseCommand):
+    help = "Avisa a los seguidores de los eventos que empiezan pronto o están en directo"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--window',
+            type=int,
+            default=15,
+            help='Minutos de antelación de los recordatorios (por defecto: 15)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Hilos de envío (por defecto: 4)'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Usuarios por bloque de envío (por defecto: 1000)'
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        recipients, created, sent = send_notifications(
+            window_minutes=options['window'],
+            workers=options['workers'],
+            chunk_size=options['chunk_size'],
+            log=self.stdout.write,
+        )
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'{created} avisos nuevos para {recipients} usuarios, {sent} emails enviados en {elapsed:.1f} s.'
+        ))
@@ -0,0 +1,41 @@
+# Generated by Django 3.2.8 on 2026-10-19 19:31
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('events', '0004_similarevent_userrecommendation'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Notification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('reminder', 'Recordatorio'), ('live', 'En directo')], max_length=20, verbose_name='Tipo')),
+                ('title', models.CharField(max_length=250, verbose_name='Título')),
+                ('idempotency_key', models.CharField(max_length=100, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Creado')),
+                ('read_at', models.DateTimeField(blank=True, null=True, verbose_name='Leído')),
+                ('emailed_at', models.DateTimeField(blank=True, null=True, verbose_name='Enviado por email')),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to='events.event', verbose_name='Evento')),
+                ('recipient', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notifications', to=settings.AUTH_USER_MODEL, verbose_name='Destinatario')),
+            ],
+            options={
+                'verbose_name': 'notificación',
+                'verbose_name_plural': 'notificaciones',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['recipient', '-created_at'], name='notif_recipient_created_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.8 on 2026-10-19 20:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='email_claim',
+            field=models.UUIDField(blank=True, db_index=True, null=True),
+        ),
+    ]
@@ -0,0 +1,74 @@
+from django.db import models
+from django.conf import settings
+
+
+class Notification(models.Model):
+    KIND_REMINDER = 'reminder'
+    KIND_LIVE = 'live'
+
+    KIND_CHOICES = [
+        (KIND_REMINDER, 'Recordatorio'),
+        (KIND_LIVE, 'En directo'),
+    ]
+
+    recipient = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='notifications',
+        verbose_name='Destinatario'
+    )
+    kind = models.CharField(
+        max_length=20,
+        choices=KIND_CHOICES,
+        verbose_name='Tipo'
+    )
+    event = models.ForeignKey(
+        'events.Event',
+        on_delete=models.CASCADE,
+        related_name='notifications',
+        verbose_name='Evento'
+    )
+    title = models.CharField(
+        max_length=250,
+        verbose_name='Título'
+    )
+    # Un reintento del envío genera la misma clave y no duplica el aviso
+    idempotency_key = models.CharField(
+        max_length=100,
+        unique=True
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True,
+        verbose_name='Creado'
+    )
+    read_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        verbose_name='Leído'
+    )
+    emailed_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        verbose_name='Enviado por email'
+    )
+    # Ejecución de send_event_notifications que ha reservado el email (ver delivery)
+    email_claim = models.UUIDField(
+        blank=True,
+        null=True,
+        db_index=True
+    )
+
+    class Meta:
+        ordering = ['-created_at']
+        verbose_name = 'notificación'
+        verbose_name_plural = 'notificaciones'
+        indexes = [
+            models.Index(fields=['recipient', '-created_at'], name='notif_recipient_created_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.recipient_id}: {self.title}'
+
+    @staticmethod
+    def make_key(kind, event_id, user_id):
+        return f'{kind}:{event_id}:{user_id}'
@@ -0,0 +1,80 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.management import call_command
+from django.test import TransactionTestCase
+from django.utils import timezone
+
+from events.models import Event
+from users.models import Follow
+from . import delivery
+from .models import Notification
+
+
+# El envío usa un pool de hilos: sus conexiones solo ven datos confirmados
+class SendNotificationsTests(TransactionTestCase):
+    def setUp(self):
+        User = get_user_model()
+        self.creator = User.objects.create_user('creador', password='x')
+        self.fan = User.objects.create_user('fan', email='fan@example.com', password='x')
+        self.mute = User.objects.create_user('sin_email', password='x')
+        now = timezone.now()
+        self.reminder = Event.objects.create(
+            creator=self.creator, title='Pronto', description='d', category=Event.CATEGORY_TALK,
+            scheduled_for=now + timedelta(minutes=5), status=Event.STATUS_SCHEDULED,
+        )
+        self.live = Event.objects.create(
+            creator=self.creator, title='Ahora', description='d', category=Event.CATEGORY_TALK,
+            scheduled_for=now - timedelta(minutes=5), status=Event.STATUS_LIVE,
+        )
+        Event.objects.create(
+            creator=self.creator, title='Lejos', description='d', category=Event.CATEGORY_TALK,
+            scheduled_for=now + timedelta(days=2), status=Event.STATUS_SCHEDULED,
+        )
+        for user in (self.fan, self.mute):
+            Follow.objects.create(follower=user, following=self.creator)
+
+    def send(self):
+        call_command('send_event_notifications', workers=1, stdout=StringIO())
+
+    def test_second_run_creates_no_duplicates(self):
+        self.send()
+        self.send()
+
+        self.assertEqual(Notification.objects.count(), 4)
+        self.assertEqual(
+            set(Notification.objects.filter(recipient=self.fan).values_list('event_id', 'kind')),
+            {(self.reminder.pk, Notification.KIND_REMINDER), (self.live.pk, Notification.KIND_LIVE)},
+        )
+        # Un único email-resumen con los dos eventos, y solo a quien tiene email
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['fan@example.com'])
+        self.assertIn('2 evento(s)', mail.outbox[0].subject)
+        self.assertFalse(Notification.objects.filter(recipient=self.fan, emailed_at__isnull=True).exists())
+        self.assertFalse(Notification.objects.filter(recipient=self.mute, emailed_at__isnull=False).exists())
+
+    def test_claimed_emails_are_not_claimed_again(self):
+        self.send()
+        keys = list(Notification.objects.values_list('idempotency_key', flat=True))
+        Notification.objects.update(emailed_at=None, email_claim=None)
+
+        _claim, first = delivery.claim_emails(keys, timezone.now())
+        _claim, second = delivery.claim_emails(keys, timezone.now())
+
+        self.assertEqual(len(first), 4)
+        self.assertEqual(second, [])
+
+    def test_failed_send_releases_the_claim(self):
+        with mock.patch.object(delivery, 'get_connection', side_effect=OSError('SMTP caído')):
+            with self.assertRaises(OSError):
+                self.send()
+        self.assertEqual(Notification.objects.count(), 4)
+        self.assertFalse(Notification.objects.filter(emailed_at__isnull=False).exists())
+        self.assertFalse(Notification.objects.filter(email_claim__isnull=False).exists())
+
+        self.send()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(Notification.objects.count(), 4)
@@ -0,0 +1,9 @@
+from django.urls import path
+from . import views
+
+app_name = 'notifications'
+
+urlpatterns = [
+    path('', views.inbox_view, name='inbox'),
+    path('<int:pk>/', views.open_notification_view, name='open'),
+]
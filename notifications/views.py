@@ -0,0 +1,26 @@
+from django.contrib.auth.decorators import login_required
+from django.shortcuts import redirect, render
+from django.utils import timezone
+
+from .models import Notification
+
+
+@login_required
+def inbox_view(request):
+    """Bandeja de avisos del usuario actual."""
+    if request.method == 'POST':
+        request.user.notifications.filter(read_at__isnull=True).update(read_at=timezone.now())
+        return redirect('notifications:inbox')
+
+    notifications = request.user.notifications.all()[:50]
+    return render(request, 'notifications/inbox.html', {'notifications': notifications})
+
+
+@login_required
+def open_notification_view(request, pk):
+    """Marca el aviso como leído y lleva al evento."""
+    notification = Notification.objects.filter(pk=pk, recipient=request.user).only('event_id').first()
+    if notification is None:
+        return redirect('notifications:inbox')
+    Notification.objects.filter(pk=pk, read_at__isnull=True).update(read_at=timezone.now())
+    return redirect('events:detail', pk=notification.event_id)
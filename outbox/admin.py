@@ -0,0 +1,19 @@
+from django.contrib import admin
+
+from config.paginators import EstimatedCountPaginator
+from .models import ChangeRecord, ConsumerOffset
+
+
+@admin.register(ChangeRecord)
+class ChangeRecordAdmin(admin.ModelAdmin):
+    list_display = ('id', 'model', 'object_id', 'op', 'created_at')
+    list_filter = ('model', 'op')
+    search_fields = ('=object_id',)
+    readonly_fields = ('model', 'object_id', 'op', 'payload', 'created_at')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+@admin.register(ConsumerOffset)
+class ConsumerOffsetAdmin(admin.ModelAdmin):
+    list_display = ('name', 'position', 'updated_at')
@@ -0,0 +1,32 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from outbox import relay
+
+
+class Command(BaseCommand):
+    help = "Compacta el outbox: conserva solo el último cambio de cada fila antigua"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=7,
+            help='Solo se compactan los cambios con más antigüedad (por defecto: 7)'
+        )
+        parser.add_argument(
+            '--purge',
+            action='store_true',
+            help='Borra además los cambios antiguos que ya han recibido todos los consumidores'
+        )
+
+    def handle(self, *args, **options):
+        before = timezone.now() - timedelta(days=options['days'])
+        compacted = relay.compact(before)
+        self.stdout.write(f'{compacted} cambios sustituidos por otros más recientes borrados.')
+        if options['purge']:
+            purged = relay.purge_consumed(before)
+            self.stdout.write(f'{purged} cambios ya entregados borrados.')
+        self.stdout.write(self.style.SUCCESS('Outbox compactado.'))
@@ -0,0 +1,54 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from outbox import relay
+
+
+class Command(BaseCommand):
+    help = "Entrega los cambios del outbox a los consumidores de OUTBOX_CONSUMERS"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'consumers',
+            nargs='*',
+            help='Consumidores a servir (por defecto: todos)'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Cambios por lote entregado (por defecto: 500)'
+        )
+        parser.add_argument(
+            '--follow',
+            action='store_true',
+            help='No termina: sigue entregando los cambios nuevos'
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=2,
+            help='Segundos entre consultas con --follow (por defecto: 2)'
+        )
+
+    def handle(self, *args, **options):
+        configured = settings.OUTBOX_CONSUMERS
+        names = options['consumers'] or list(configured)
+        unknown = [name for name in names if name not in configured]
+        if unknown:
+            raise CommandError(f"Consumidores desconocidos: {', '.join(unknown)}")
+
+        consumers = [
+            (name, relay.build_sink(configured[name]), configured[name].get('models'))
+            for name in names
+        ]
+        while True:
+            for name, sink, models in consumers:
+                delivered = relay.relay(name, sink, batch_size=options['batch_size'], models=models)
+                if delivered or not options['follow']:
+                    self.stdout.write(f'{name}: {delivered} cambios entregados.')
+            if not options['follow']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,46 @@
+# Generated by Django 3.2.8 on 2026-10-19 19:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeRecord',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('model', models.CharField(max_length=50, verbose_name='Modelo')),
+                ('object_id', models.BigIntegerField(verbose_name='Id del objeto')),
+                ('op', models.CharField(choices=[('create', 'Alta'), ('update', 'Modificación'), ('delete', 'Baja')], max_length=10, verbose_name='Operación')),
+                ('payload', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True, db_index=True)),
+            ],
+            options={
+                'verbose_name': 'cambio',
+                'verbose_name_plural': 'cambios',
+                'ordering': ['id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ConsumerOffset',
+            fields=[
+                ('name', models.CharField(max_length=100, primary_key=True, serialize=False, verbose_name='Consumidor')),
+                ('position', models.BigIntegerField(default=0, verbose_name='Posición')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'offset de consumidor',
+                'verbose_name_plural': 'offsets de consumidores',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='changerecord',
+            index=models.Index(fields=['model', 'object_id'], name='change_model_object_idx'),
+        ),
+    ]
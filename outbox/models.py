@@ -0,0 +1,53 @@
+from django.db import models
+
+
+class ChangeRecord(models.Model):
+    """
+    Cambio de una fila de Event, CustomUser o Follow, escrito en la misma
+    transacción que el cambio. El pk autoincremental es la posición en el
+    registro: los consumidores leen en orden a partir de su offset.
+    """
+    OP_CREATE = 'create'
+    OP_UPDATE = 'update'
+    OP_DELETE = 'delete'
+
+    OP_CHOICES = [
+        (OP_CREATE, 'Alta'),
+        (OP_UPDATE, 'Modificación'),
+        (OP_DELETE, 'Baja'),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    model = models.CharField(max_length=50, verbose_name='Modelo')  # app_label.model
+    object_id = models.BigIntegerField(verbose_name='Id del objeto')
+    op = models.CharField(max_length=10, choices=OP_CHOICES, verbose_name='Operación')
+    # Campos relevantes de la fila en JSON; vacío en las bajas
+    payload = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ['id']
+        verbose_name = 'cambio'
+        verbose_name_plural = 'cambios'
+        indexes = [
+            models.Index(fields=['model', 'object_id'], name='change_model_object_idx'),
+        ]
+
+    def __str__(self):
+        return f'#{self.pk} {self.op} {self.model}:{self.object_id}'
+
+
+class ConsumerOffset(models.Model):
+    """Último ChangeRecord entregado a cada consumidor."""
+    name = models.CharField(max_length=100, primary_key=True, verbose_name='Consumidor')
+    position = models.BigIntegerField(default=0, verbose_name='Posición')
+    # Huecos por debajo de position aún pendientes: {pk: primera vez visto} en JSON
+    gaps = models.TextField(blank=True, default='')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'offset de consumidor'
+        verbose_name_plural = 'offsets de consumidores'
+
+    def __str__(self):
+        return f'{self.name} @ {self.position}'
@@ -0,0 +1,124 @@
+"""
+Escritura de ChangeRecord.
+
+record() lo usan las señales (una fila). Las operaciones masivas que no
+disparan señales usan record_objects() con las instancias que acaban de
+escribir, record_queryset() cuando solo tienen la consulta (update) o
+bulk_create(), que inserta y registra los pk exactos de las filas nuevas.
+Todos deben llamarse dentro de la transacción del cambio.
+"""
+import json
+import threading
+from contextlib import contextmanager
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, connections, router, transaction
+
+from .models import ChangeRecord
+
+
+# Campos que viajan en cada cambio, por modelo (app_label.model)
+TRACKED_FIELDS = {
+    'events.event': [
+        'creator_id', 'title', 'category', 'difficulty', 'status', 'scheduled_for',
+        'ends_at', 'tags', 'is_featured', 'updated_at',
+    ],
+    'users.customuser': ['username', 'display_name', 'avatar', 'is_active', 'updated_at'],
+    'users.follow': ['follower_id', 'following_id', 'created_at'],
+}
+
+BATCH_SIZE = 1000
+
+_local = threading.local()
+
+
+@contextmanager
+def suppressed():
+    """Las señales no registran cambios dentro del bloque; los registra quien lo usa."""
+    previous = getattr(_local, 'suppressed', False)
+    _local.suppressed = True
+    try:
+        yield
+    finally:
+        _local.suppressed = previous
+
+
+def is_suppressed():
+    return getattr(_local, 'suppressed', False)
+
+
+def model_label(model):
+    return model._meta.label_lower
+
+
+def _payload(values):
+    return json.dumps(values, cls=DjangoJSONEncoder, ensure_ascii=False, separators=(',', ':'))
+
+
+def _value(instance, field):
+    value = getattr(instance, field)
+    return value.name if hasattr(value, 'field') and hasattr(value, 'name') else value  # FieldFile
+
+
+def _change(instance, op):
+    label = model_label(type(instance))
+    payload = ''
+    if op != ChangeRecord.OP_DELETE:
+        payload = _payload({field: _value(instance, field) for field in TRACKED_FIELDS[label]})
+    return ChangeRecord(model=label, object_id=instance.pk, op=op, payload=payload)
+
+
+def record(instance, op):
+    _change(instance, op).save()
+
+
+def record_objects(objs, op):
+    """Registra `op` para las instancias `objs` (ya guardadas, con pk). Devuelve cuántas."""
+    records = [_change(obj, op) for obj in objs]
+    ChangeRecord.objects.bulk_create(records, batch_size=BATCH_SIZE)
+    return len(records)
+
+
+def record_queryset(queryset, op):
+    """Registra `op` para todas las filas de `queryset`. Devuelve cuántas."""
+    label = model_label(queryset.model)
+    fields = TRACKED_FIELDS[label]
+    records = []
+    for row in queryset.order_by('pk').values('pk', *fields).iterator(chunk_size=BATCH_SIZE):
+        object_id = row.pop('pk')
+        payload = '' if op == ChangeRecord.OP_DELETE else _payload(row)
+        records.append(ChangeRecord(model=label, object_id=object_id, op=op, payload=payload))
+    ChangeRecord.objects.bulk_create(records, batch_size=BATCH_SIZE)
+    return len(records)
+
+
+def bulk_create(model, objs, batch_size=BATCH_SIZE, ignore_conflicts=False):
+    """
+    bulk_create() que registra el alta de cada fila insertada con su pk.
+
+    Si el motor no devuelve los pk de una inserción masiva (SQLite y djongo
+    en Django 3.2, o cualquiera con ignore_conflicts) las filas se insertan
+    de una en una, con un savepoint por fila si hay que saltarse conflictos.
+    Las señales de post_save se disparan en ese caso: quien llama debe
+    envolverlo en stats.deferred() si mantiene CreatorStats a mano.
+    Devuelve las instancias insertadas.
+    """
+    connection = connections[router.db_for_write(model)]
+    with transaction.atomic(using=connection.alias):
+        if connection.features.can_return_rows_from_bulk_insert and not ignore_conflicts:
+            created = model.objects.bulk_create(objs, batch_size=batch_size)
+        else:
+            created = []
+            with suppressed():
+                for obj in objs:
+                    if ignore_conflicts:
+                        try:
+                            with transaction.atomic(using=connection.alias):
+                                obj.save(force_insert=True)
+                        except IntegrityError:
+                            continue
+                    else:
+                        obj.save(force_insert=True)
+                    created.append(obj)
+        record_objects(created, ChangeRecord.OP_CREATE)
+    return created
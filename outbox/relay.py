@@ -0,0 +1,196 @@
+"""
+Reparto del outbox a los consumidores.
+
+Cada consumidor tiene un sink y un ConsumerOffset. relay() lee los cambios
+posteriores a su offset en orden de pk, los entrega por lotes y avanza el
+offset solo cuando el sink ha aceptado el lote (entrega al menos una vez:
+los consumidores deben tolerar repeticiones).
+
+Los pk se asignan al insertar pero las transacciones confirman en otro
+orden: un pk por debajo del offset puede hacerse visible más tarde. Cada
+pk que falta entre dos cambios entregados se guarda como hueco en el
+ConsumerOffset y se vuelve a buscar en cada ejecución hasta que aparece
+(se entrega entonces, fuera de orden) o pasan OUTBOX_GAP_TIMEOUT segundos
+(la transacción se deshizo o el motor se saltó el pk). Los consumidores
+deben usar el `id` del cambio para descartar los que lleguen tarde sobre
+una fila de la que ya tienen uno posterior.
+"""
+import json
+import urllib.request
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max, Min, Q
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from .models import ChangeRecord, ConsumerOffset
+
+
+def serialize(change):
+    return {
+        'id': change.pk,
+        'model': change.model,
+        'object_id': change.object_id,
+        'op': change.op,
+        'data': json.loads(change.payload) if change.payload else None,
+        'at': change.created_at.isoformat(),
+    }
+
+
+class FileSink:
+    """Añade los cambios a un fichero JSONL."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def send(self, changes):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for change in changes:
+                f.write(json.dumps(change, ensure_ascii=False))
+                f.write('\n')
+
+
+class CallbackSink:
+    """Llama a una función del proceso (ruta con puntos) con la lista de cambios."""
+
+    def __init__(self, callback):
+        self.callback = import_string(callback) if isinstance(callback, str) else callback
+
+    def send(self, changes):
+        self.callback(changes)
+
+
+class HttpSink:
+    """POST de cada lote como JSON; cualquier respuesta que no sea 2xx es un error."""
+
+    def __init__(self, url, timeout=10):
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, changes):
+        request = urllib.request.Request(
+            self.url,
+            data=json.dumps({'changes': changes}).encode(),
+            headers={'Content-Type': 'application/json'},
+            method='POST',
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            if not 200 <= response.status < 300:
+                raise OSError(f'{self.url} ha respondido {response.status}')
+
+
+SINKS = {
+    'file': lambda options: FileSink(options['path']),
+    'callback': lambda options: CallbackSink(options['callback']),
+    'http': lambda options: HttpSink(options['url'], options.get('timeout', 10)),
+}
+
+
+def build_sink(options):
+    return SINKS[options['sink']](options)
+
+
+# Un salto mayor en la secuencia no son transacciones abiertas (p.ej. el motor
+# reserva pk por bloques): no se vigila
+MAX_GAPS = 1000
+
+
+def _load_gaps(offset):
+    return {int(pk): seen for pk, seen in json.loads(offset.gaps).items()} if offset.gaps else {}
+
+
+def _find_gaps(changes, position, gaps, now, timeout):
+    """Añade a `gaps` los pk que faltan entre `position` y los cambios leídos."""
+    expected = position + 1
+    for change in changes:
+        missing = change.pk - expected
+        # Si el cambio posterior ya es antiguo, el hueco también: no llegará
+        if 0 < missing <= MAX_GAPS and change.created_at.timestamp() > now - timeout:
+            for pk in range(expected, change.pk):
+                gaps.setdefault(pk, now)
+        expected = change.pk + 1
+
+
+def relay(name, sink, batch_size=500, max_batches=None, models=None):
+    """
+    Entrega al consumidor `name` los cambios pendientes: primero los huecos
+    que ya han aparecido y después los posteriores a su offset. `models`
+    limita los modelos que le interesan (el offset avanza igualmente).
+    Devuelve cuántos cambios ha entregado.
+    """
+    offset, _created = ConsumerOffset.objects.get_or_create(name=name)
+    timeout = settings.OUTBOX_GAP_TIMEOUT
+    now = timezone.now().timestamp()
+    stored = _load_gaps(offset)
+    gaps = {pk: seen for pk, seen in stored.items() if now - seen < timeout}
+    delivered = batches = 0
+
+    def deliver(changes):
+        nonlocal delivered
+        wanted = [serialize(c) for c in changes if models is None or c.model in models]
+        if wanted:
+            sink.send(wanted)
+        for change in changes:
+            gaps.pop(change.pk, None)
+        ConsumerOffset.objects.filter(name=name).update(
+            position=offset.position, gaps=json.dumps(gaps), updated_at=timezone.now()
+        )
+        delivered += len(wanted)
+
+    late = list(ChangeRecord.objects.filter(pk__in=list(gaps)).order_by('pk')) if gaps else []
+    if late or len(gaps) < len(stored):
+        deliver(late)
+
+    while max_batches is None or batches < max_batches:
+        changes = list(ChangeRecord.objects.filter(pk__gt=offset.position).order_by('pk')[:batch_size])
+        if not changes:
+            break
+        _find_gaps(changes, offset.position, gaps, now, timeout)
+        offset.position = changes[-1].pk
+        deliver(changes)
+        batches += 1
+    return delivered
+
+
+def compact(before, batch_size=500):
+    """
+    Compacta los cambios anteriores a `before`: de cada fila solo se conserva
+    el último cambio, que basta para reconstruir su estado. Devuelve cuántos
+    cambios se han borrado.
+    """
+    deleted = 0
+    superseded = (
+        ChangeRecord.objects.filter(created_at__lt=before)
+        .values('model', 'object_id')
+        .annotate(n=Count('pk'), last=Max('pk'))
+        .filter(n__gt=1)
+        .order_by()
+    )
+    keys = []
+    for row in superseded.iterator():
+        keys.append(row)
+        if len(keys) >= batch_size:
+            deleted += _delete_superseded(keys)
+            keys = []
+    if keys:
+        deleted += _delete_superseded(keys)
+    return deleted
+
+
+def _delete_superseded(keys):
+    condition = Q()
+    for key in keys:
+        condition |= Q(model=key['model'], object_id=key['object_id'], pk__lt=key['last'])
+    with transaction.atomic():
+        deleted, _ = ChangeRecord.objects.filter(condition).delete()
+    return deleted
+
+
+def purge_consumed(before):
+    """Borra los cambios anteriores a `before` que ya han recibido todos los consumidores."""
+    low = ConsumerOffset.objects.aggregate(low=Min('position'))['low']
+    if low is None:
+        return 0
+    deleted, _ = ChangeRecord.objects.filter(pk__lte=low, created_at__lt=before).delete()
+    return deleted
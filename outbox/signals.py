@@ -0,0 +1,31 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from events.models import Event
+from users.models import Follow
+from . import records
+from .models import ChangeRecord
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=Follow)
+def record_save(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or records.is_suppressed():
+        return
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        # Cada inicio de sesión guarda last_login: no interesa a los consumidores
+        return
+    records.record(instance, ChangeRecord.OP_CREATE if created else ChangeRecord.OP_UPDATE)
+
+
+@receiver(post_delete, sender=Event)
+@receiver(post_delete, sender=User)
+@receiver(post_delete, sender=Follow)
+def record_delete(sender, instance, **kwargs):
+    if records.is_suppressed():
+        return
+    records.record(instance, ChangeRecord.OP_DELETE)
@@ -0,0 +1,102 @@
+import json
+from datetime import timedelta
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from . import relay
+from .models import ChangeRecord, ConsumerOffset
+
+
+class ListSink:
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+
+    def send(self, changes):
+        if self.fail:
+            raise OSError('consumidor caído')
+        self.batches.append([change['id'] for change in changes])
+
+    @property
+    def ids(self):
+        return [pk for batch in self.batches for pk in batch]
+
+
+@override_settings(OUTBOX_GAP_TIMEOUT=300)
+class RelayTests(TestCase):
+    def change(self, pk, model='events.event'):
+        return ChangeRecord.objects.create(
+            id=pk, model=model, object_id=pk, op=ChangeRecord.OP_CREATE, payload=json.dumps({'pk': pk})
+        )
+
+    def offset(self):
+        return ConsumerOffset.objects.get(name='test')
+
+    def test_resumes_from_the_stored_position(self):
+        for pk in (1, 2, 3):
+            self.change(pk)
+        sink = ListSink()
+        self.assertEqual(relay.relay('test', sink, batch_size=2), 3)
+        self.assertEqual(sink.batches, [[1, 2], [3]])
+        self.assertEqual(self.offset().position, 3)
+
+        self.change(4)
+        sink = ListSink()
+        self.assertEqual(relay.relay('test', sink), 1)
+        self.assertEqual(sink.ids, [4])
+        self.assertEqual(relay.relay('test', sink), 0)
+
+    def test_failed_send_does_not_advance(self):
+        self.change(1)
+        with self.assertRaises(OSError):
+            relay.relay('test', ListSink(fail=True))
+        self.assertEqual(self.offset().position, 0)
+
+        sink = ListSink()
+        relay.relay('test', sink)
+        self.assertEqual(sink.ids, [1])
+
+    def test_models_filter_still_advances(self):
+        self.change(1, model='users.customuser')
+        self.change(2)
+        sink = ListSink()
+        self.assertEqual(relay.relay('test', sink, models={'events.event'}), 1)
+        self.assertEqual(sink.ids, [2])
+        self.assertEqual(self.offset().position, 2)
+
+    def test_late_change_in_a_gap_is_delivered(self):
+        self.change(1)
+        self.change(3)
+        sink = ListSink()
+        relay.relay('test', sink)
+        self.assertEqual(sink.ids, [1, 3])
+        self.assertEqual(set(json.loads(self.offset().gaps)), {'2'})
+
+        # La transacción del pk 2 confirma después de que el offset lo haya superado
+        self.change(2)
+        self.change(4)
+        sink = ListSink()
+        self.assertEqual(relay.relay('test', sink), 2)
+        self.assertEqual(sink.batches, [[2], [4]])
+        self.assertEqual(json.loads(self.offset().gaps), {})
+
+    def test_gap_expires_after_the_timeout(self):
+        self.change(1)
+        self.change(3)
+        relay.relay('test', ListSink())
+        stale = timezone.now().timestamp() - 301
+        ConsumerOffset.objects.filter(name='test').update(gaps=json.dumps({'2': stale}))
+
+        sink = ListSink()
+        self.assertEqual(relay.relay('test', sink), 0)
+        self.assertEqual(json.loads(self.offset().gaps), {})
+        # Si aparece después ya no se entrega
+        self.change(2)
+        self.assertEqual(relay.relay('test', sink), 0)
+
+    def test_old_jumps_are_not_gaps(self):
+        old = self.change(5)
+        ChangeRecord.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(hours=1))
+        relay.relay('test', ListSink())
+        self.assertEqual(json.loads(self.offset().gaps), {})
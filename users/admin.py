@@ -1,5 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
+from config.paginators import EstimatedCountPaginator
 from .models import CustomUser, Follow
 
 @admin.register(CustomUser)
@@ -8,11 +9,17 @@ class CustomUserAdmin(UserAdmin):
         ('Profile', {'fields': ('display_name', 'bio', 'avatar')}),
     )
     list_display = ('username', 'email', 'display_name', 'is_staff', 'is_active')
-    search_fields = ('username', 'email', 'display_name')
+    # '^' -> cerca per prefix, que pot aprofitar l'índex de username
+    search_fields = ('^username', '^email', '^display_name')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 @admin.register(Follow)
 class FollowAdmin(admin.ModelAdmin):
     list_display = ('follower', 'following', 'created_at')
-    search_fields = ('follower__username', 'following__username')
+    list_select_related = ('follower', 'following')
+    search_fields = ('^follower__username', '^following__username')
     list_filter = ('created_at',)
-    
\ No newline at end of file
+    autocomplete_fields = ('follower', 'following')
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
@@ -0,0 +1,24 @@
+"""Versions asíncrones de les vistes de lectura de users.views (vegeu events.async_views)."""
+import asyncio
+
+from django.contrib.auth import get_user_model
+from django.shortcuts import get_object_or_404
+
+from events import aio
+from events.models import CreatorStats
+from events.stats import get_creator_stats
+
+User = get_user_model()
+
+
+async def public_profile_view(request, username):
+    # Usuari i estadístiques en dues consultes independents i simultànies
+    _user, user_obj, stats = await asyncio.gather(
+        aio.get_user(request),
+        aio.run(get_object_or_404, User, username=username),
+        aio.run(
+            CreatorStats.objects.select_related('next_event').filter(user__username=username).first
+        ),
+    )
+    stats = await aio.run(get_creator_stats, user_obj.pk, stats=stats or CreatorStats(user_id=user_obj.pk))
+    return await aio.render(request, 'users/public_profile.html', {'user_obj': user_obj, 'stats': stats})
@@ -0,0 +1,54 @@
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+
+USER_CACHE_PREFIX = 'auth:user:'
+
+
+def user_cache_key(user_id):
+    return f'{USER_CACHE_PREFIX}{user_id}'
+
+
+def cache_is_shared():
+    """
+    La invalidació només arriba a tots els processos si la caché és compartida:
+    amb LocMemCache cada worker continuaria servint la seva còpia (un usuari
+    desactivat o amb la contrasenya canviada continuaria entrant).
+    """
+    return not isinstance(caches[DEFAULT_CACHE_ALIAS], (LocMemCache, DummyCache))
+
+
+def invalidate_cached_user(user_id):
+    cache.delete(user_cache_key(user_id))
+
+
+def invalidate_cached_users(user_ids):
+    """Per a QuerySet.update() i bulk_update(), que no disparen els senyals."""
+    cache.delete_many([user_cache_key(user_id) for user_id in user_ids])
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ModelBackend que guarda en caché l'usuari autenticat.
+
+    AuthenticationMiddleware crida get_user() a cada petició; amb la caché
+    la majoria de peticions no toquen la base de dades. L'entrada s'invalida
+    des de users.signals quan l'usuari canvia; qui modifiqui usuaris amb
+    update() o bulk_update() ha de cridar invalidate_cached_users().
+    Sense una caché compartida (vegeu cache_is_shared) no es guarda res.
+    """
+
+    def get_user(self, user_id):
+        if not cache_is_shared():
+            return super().get_user(user_id)
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is None:
+                return None
+            cache.set(key, user, settings.USER_CACHE_TIMEOUT)
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,17 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+from .backends import cache_is_shared
+
+
+@register(deploy=True)
+def check_user_cache(app_configs, **kwargs):
+    if 'users.backends.CachedModelBackend' not in settings.AUTHENTICATION_BACKENDS or cache_is_shared():
+        return []
+    return [
+        Warning(
+            'CachedModelBackend no guarda usuaris amb una caché per procés.',
+            hint="Defineix MEMCACHED (o una altra caché compartida a CACHES['default']) per activar-la.",
+            id='users.W001',
+        )
+    ]
@@ -0,0 +1,71 @@
+import time
+from functools import partial
+
+from django.core.management.base import BaseCommand
+
+from users import transfer
+
+
+class Command(BaseCommand):
+    help = "Importa usuaris (upsert per username) i follows exportats amb export_users"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'input',
+            nargs='?',
+            default=None,
+            help="Fitxer d'usuaris: .jsonl, .csv, .jsonl.gz, .csv.gz o '-' per a stdin"
+        )
+        parser.add_argument(
+            '--follows',
+            default=None,
+            help="Fitxer de follows a importar després dels usuaris"
+        )
+        parser.add_argument(
+            '--with-passwords',
+            action='store_true',
+            help='Copia també el hash de la contrasenya si el fitxer el porta'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Files per lot (per defecte: 1000)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4,
+            help='Fils que importen lots en paral·lel (per defecte: 4)'
+        )
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        batch_size, workers = options['batch_size'], options['workers']
+
+        if options['input']:
+            created, updated, rejected, errors = transfer.run_batches(
+                transfer.batched(transfer.read_rows(options['input']), batch_size),
+                partial(transfer.import_users_batch, with_passwords=options['with_passwords']),
+                workers=workers,
+                key=lambda row: row.get('username'),
+                empty=(0, 0, 0, []),
+            )
+            for error in errors:
+                self.stderr.write(f'  {error}')
+            if rejected:
+                self.stderr.write(self.style.WARNING(
+                    f'⚠️ {rejected} files rebutjades' + (f' (se\'n mostren {len(errors)})' if rejected > len(errors) else '') + '.'
+                ))
+            self.stdout.write(f'👤 {created} usuaris creats, {updated} actualitzats.')
+
+        if options['follows']:
+            created, skipped = transfer.run_batches(
+                transfer.batched(transfer.read_rows(options['follows']), batch_size),
+                transfer.import_follows_batch,
+                workers=workers,
+                key=lambda row: row.get('follower__username'),
+            )
+            self.stdout.write(f'🔗 {created} follows creats, {skipped} ja existents o sense usuari.')
+
+        self.stdout.write(self.style.SUCCESS(f'✅ Importació acabada en {time.monotonic() - started:.1f} s.'))
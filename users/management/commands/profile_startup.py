@@ -0,0 +1,181 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+# Script que s'executa en un procés nou (arrencada en fred) i mesura cada fase
+# de django.setup(): càrrega de settings, import de les apps, dels models i ready().
+BOOTSTRAP = r'''
+import json, sys, time
+
+t_start = time.perf_counter()
+import django
+from django.apps import AppConfig
+
+models_times, ready_times = {}, {}
+
+_import_models = AppConfig.import_models
+
+def import_models(self):
+    start = time.perf_counter()
+    _import_models(self)
+    models_times[self.label] = time.perf_counter() - start
+
+AppConfig.import_models = import_models
+
+_create = AppConfig.create.__func__
+
+def create(cls, entry):
+    config = _create(cls, entry)
+    ready = config.ready
+
+    def timed_ready():
+        start = time.perf_counter()
+        ready()
+        ready_times[config.label] = time.perf_counter() - start
+
+    config.ready = timed_ready
+    return config
+
+AppConfig.create = classmethod(create)
+
+t_django = time.perf_counter()
+from django.conf import settings
+settings.INSTALLED_APPS
+t_settings = time.perf_counter()
+django.setup()
+t_setup = time.perf_counter()
+
+target = sys.argv[1] if len(sys.argv) > 1 else ''
+if target:
+    from django.core.management import get_commands, load_command_class
+    load_command_class(get_commands()[target], target)
+t_end = time.perf_counter()
+
+print(json.dumps({
+    'phases': {
+        'import django': t_django - t_start,
+        'settings': t_settings - t_django,
+        'django.setup()': t_setup - t_settings,
+        'command import': t_end - t_setup,
+    },
+    'total': t_end - t_start,
+    'models': models_times,
+    'ready': ready_times,
+}))
+'''
+
+
+def parse_importtime(stderr):
+    """
+    Interpreta la sortida de `python -X importtime` i retorna
+    {mòdul: (self_us, cumulative_us)}.
+    """
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+            modules[name.strip()] = (int(self_us), int(cumulative_us))
+        except ValueError:
+            continue
+    return modules
+
+
+class Command(BaseCommand):
+    help = "Mesura el temps d'arrencada en fred: imports per mòdul i fases de django.setup()"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--profile-settings',
+            default=None,
+            help='Mòdul de settings a mesurar (per defecte: el actual, p.ex. config.settings_worker)'
+        )
+        parser.add_argument(
+            '--command',
+            default='',
+            help="Mesura també l'import d'aquesta comanda de manage.py"
+        )
+        parser.add_argument(
+            '--top',
+            type=int,
+            default=20,
+            help='Nombre de mòduls més lents a mostrar (per defecte: 20)'
+        )
+        parser.add_argument(
+            '--runs',
+            type=int,
+            default=1,
+            help="Nombre d'arrencades a mesurar; es mostra la mediana (per defecte: 1)"
+        )
+        parser.add_argument(
+            '--budget-ms',
+            type=float,
+            default=None,
+            help="Falla si la mediana de l'arrencada supera aquest temps (benchmark de regressió)"
+        )
+
+    def run_once(self, settings_module, command):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings_module)
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', BOOTSTRAP, command],
+            cwd=str(settings.BASE_DIR),
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise CommandError(f"L'arrencada ha fallat:\n{result.stderr[-2000:]}")
+        report = json.loads(result.stdout.strip().splitlines()[-1])
+        report['imports'] = parse_importtime(result.stderr)
+        return report
+
+    def handle(self, *args, **options):
+        settings_module = options['profile_settings'] or settings.SETTINGS_MODULE
+        runs = max(1, options['runs'])
+        top = options['top']
+
+        reports = [self.run_once(settings_module, options['command']) for _ in range(runs)]
+        totals_ms = [r['total'] * 1000 for r in reports]
+        median_ms = statistics.median(totals_ms)
+        # Detall de l'execució més propera a la mediana
+        report = min(reports, key=lambda r: abs(r['total'] * 1000 - median_ms))
+
+        self.stdout.write(self.style.SUCCESS(f"⏱️  Arrencada amb {settings_module}: {median_ms:.1f} ms (mediana de {runs})"))
+
+        self.stdout.write(self.style.MIGRATE_HEADING('Fases'))
+        for phase, seconds in report['phases'].items():
+            self.stdout.write(f'  {phase:<20} {seconds * 1000:8.1f} ms')
+
+        self.stdout.write(self.style.MIGRATE_HEADING('Apps (import de models / ready)'))
+        for label in report['models']:
+            models_ms = report['models'].get(label, 0) * 1000
+            ready_ms = report['ready'].get(label, 0) * 1000
+            self.stdout.write(f'  {label:<20} {models_ms:8.1f} ms {ready_ms:8.1f} ms')
+
+        # Temps propi agregat per paquet de primer nivell (django, djongo, faker...)
+        by_package = defaultdict(int)
+        for name, (self_us, _cumulative) in report['imports'].items():
+            by_package[name.split('.')[0]] += self_us
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f'Paquets més lents (temps propi, top {top})'))
+        for package, self_us in sorted(by_package.items(), key=lambda i: -i[1])[:top]:
+            self.stdout.write(f'  {package:<40} {self_us / 1000:8.1f} ms')
+
+        self.stdout.write(self.style.MIGRATE_HEADING(f'Mòduls més lents (acumulat, top {top})'))
+        ranked = sorted(report['imports'].items(), key=lambda i: -i[1][1])[:top]
+        for name, (self_us, cumulative_us) in ranked:
+            self.stdout.write(f'  {name:<40} {cumulative_us / 1000:8.1f} ms  (propi {self_us / 1000:.1f} ms)')
+
+        budget = options['budget_ms']
+        if budget is not None:
+            if median_ms > budget:
+                raise CommandError(f"Regressió d'arrencada: {median_ms:.1f} ms > {budget:.1f} ms")
+            self.stdout.write(self.style.SUCCESS(f'✅ Dins del pressupost ({budget:.1f} ms)'))
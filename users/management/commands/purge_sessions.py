@@ -0,0 +1,56 @@
+import time
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+
+DB_ENGINES = {
+    'django.contrib.sessions.backends.db',
+    'django.contrib.sessions.backends.cached_db',
+}
+
+
+class Command(BaseCommand):
+    help = "Esborra les sessions caducades en lots (alternativa a clearsessions per a taules grans)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Sessions a esborrar per lot (per defecte: 1000)'
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=0,
+            help='Segons d’espera entre lots per no saturar la base de dades (per defecte: 0)'
+        )
+
+    def handle(self, *args, **options):
+        if settings.SESSION_ENGINE not in DB_ENGINES:
+            self.stdout.write(self.style.WARNING(
+                f"ℹ️  {settings.SESSION_ENGINE} no desa sessions a la base de dades: no hi ha res a esborrar."
+            ))
+            return
+
+        batch_size = options['batch_size']
+        now = timezone.now()
+        total = 0
+
+        while True:
+            keys = list(
+                Session.objects.filter(expire_date__lt=now)
+                .values_list('session_key', flat=True)[:batch_size]
+            )
+            if not keys:
+                break
+            Session.objects.filter(session_key__in=keys).delete()
+            total += len(keys)
+            self.stdout.write(f"🧹 {total} sessions esborrades...")
+            if options['sleep']:
+                time.sleep(options['sleep'])
+
+        self.stdout.write(self.style.SUCCESS(f"✅ {total} sessions caducades esborrades."))
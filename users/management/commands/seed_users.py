@@ -1,7 +1,6 @@
 from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import Group
-from faker import Faker
 from django.db import transaction
 
 class Command(BaseCommand):
@@ -27,6 +26,9 @@ class Command(BaseCommand):
 
     @transaction.atomic()
     def handle(self, *args, **options):
+        # Faker és pesat d'importar: només el carreguem quan la comanda s'executa
+        from faker import Faker
+
         fake = Faker('es_ES')
         User = get_user_model()
         num_users = options['users']
@@ -0,0 +1,27 @@
+from django.db import migrations
+
+
+def backfill_updated_at(apps, schema_editor):
+    # Sense marca d'aigua els comptes anteriors a 0003 mai no entrarien en una
+    # exportació incremental (updated_at >= des de); date_joined és la millor aproximació
+    User = apps.get_model('users', 'CustomUser')
+    batch = []
+    for user in User.objects.filter(updated_at__isnull=True).only('pk', 'date_joined').iterator(chunk_size=1000):
+        user.updated_at = user.date_joined
+        batch.append(user)
+        if len(batch) >= 1000:
+            User.objects.bulk_update(batch, ['updated_at'])
+            batch = []
+    if batch:
+        User.objects.bulk_update(batch, ['updated_at'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0003_customuser_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import AbstractUser
 
 # Create your models here.
@@ -9,6 +9,13 @@ class CustomUser(AbstractUser):
     bio = models.TextField(blank=True)
     avatar = models.ImageField(upload_to='avatars/', blank=True, null=True)
     # Necessita Pillow instal·lat
+    # Marca d'aigua de les exportacions incrementals (export_users)
+    updated_at = models.DateTimeField(auto_now=True, null=True, db_index=True)
+
+    def save(self, *args, **kwargs):
+        # Atòmic perquè el canvi a l'outbox (post_save) vagi a la mateixa transacció
+        with transaction.atomic():
+            super().save(*args, **kwargs)
 
     def __str__(self):
         return self.username
@@ -30,6 +37,14 @@ class Follow(models.Model):
 
     class Meta:
         unique_together = ('follower', 'following')  # Evita duplicats A->B
+        indexes = [
+            # Llistats de seguidors d'un usuari (B <- A) ordenats per data
+            models.Index(fields=['following', 'created_at'], name='follow_following_created_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():
+            super().save(*args, **kwargs)
 
     def __str__(self):
         return f'{self.follower} -> {self.following}'
\ No newline at end of file
@@ -1,3 +1,126 @@
-from django.test import TestCase
+import shutil
+import tempfile
+from datetime import timedelta
+from io import StringIO
 
-# Create your tests here.
+from django.contrib.sessions.backends.db import SessionStore
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .backends import CachedModelBackend, cache_is_shared, user_cache_key
+from .models import CustomUser
+from .transfer import import_users_batch
+
+
+class CachedModelBackendTests(TestCase):
+    def setUp(self):
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir, ignore_errors=True)
+        shared = override_settings(CACHES={'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': cache_dir,
+        }})
+        shared.enable()
+        self.addCleanup(shared.disable)
+        self.user = CustomUser.objects.create_user('cachejat', password='x')
+        self.backend = CachedModelBackend()
+
+    def test_second_lookup_hits_the_cache(self):
+        self.assertTrue(cache_is_shared())
+        with self.assertNumQueries(1):
+            self.assertEqual(self.backend.get_user(self.user.pk), self.user)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.backend.get_user(self.user.pk).username, 'cachejat')
+
+    def test_save_invalidates_the_cached_user(self):
+        self.backend.get_user(self.user.pk)
+        self.user.display_name = 'Nou nom'
+        self.user.save()
+
+        self.assertIsNone(cache.get(user_cache_key(self.user.pk)))
+        self.assertEqual(self.backend.get_user(self.user.pk).display_name, 'Nou nom')
+
+    def test_deactivated_user_is_rejected(self):
+        self.backend.get_user(self.user.pk)
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertIsNone(self.backend.get_user(self.user.pk))
+
+    def test_group_change_invalidates_the_cached_user(self):
+        from django.contrib.auth.models import Group
+
+        self.backend.get_user(self.user.pk)
+        self.user.groups.add(Group.objects.create(name='moderadors'))
+
+        self.assertIsNone(cache.get(user_cache_key(self.user.pk)))
+
+    @override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+    def test_per_process_cache_is_not_used(self):
+        self.assertFalse(cache_is_shared())
+        for _ in range(2):
+            with self.assertNumQueries(1):
+                self.backend.get_user(self.user.pk)
+
+
+@override_settings(SESSION_ENGINE='django.contrib.sessions.backends.db')
+class PurgeSessionsTests(TestCase):
+    def make_session(self, expire_date):
+        session = SessionStore()
+        session['foo'] = 'bar'
+        session.create()
+        Session.objects.filter(session_key=session.session_key).update(expire_date=expire_date)
+        return session.session_key
+
+    def test_deletes_only_expired_sessions_in_batches(self):
+        now = timezone.now()
+        expired = [self.make_session(now - timedelta(days=1)) for _ in range(3)]
+        alive = self.make_session(now + timedelta(days=1))
+
+        out = StringIO()
+        call_command('purge_sessions', batch_size=2, stdout=out)
+
+        self.assertEqual(list(Session.objects.values_list('session_key', flat=True)), [alive])
+        self.assertFalse(Session.objects.filter(session_key__in=expired).exists())
+        self.assertIn('3 sessions caducades esborrades', out.getvalue())
+
+    @override_settings(SESSION_ENGINE='django.contrib.sessions.backends.signed_cookies')
+    def test_skips_engines_without_database(self):
+        self.make_session(timezone.now() - timedelta(days=1))
+
+        out = StringIO()
+        call_command('purge_sessions', stdout=out)
+
+        self.assertEqual(Session.objects.count(), 1)
+        self.assertIn('no hi ha res a esborrar', out.getvalue())
+
+
+class ImportUsersTests(TestCase):
+    def test_upsert_by_username(self):
+        rows = [{'username': 'anna', 'email': 'anna@example.com', 'is_active': 'true', 'date_joined': ''}]
+        self.assertEqual(import_users_batch(rows), (1, 0, 0, []))
+        anna = CustomUser.objects.get(username='anna')
+        self.assertFalse(anna.has_usable_password())
+
+        rows[0]['display_name'] = 'Anna'
+        self.assertEqual(import_users_batch(rows), (0, 1, 0, []))
+        anna.refresh_from_db()
+        self.assertEqual(anna.display_name, 'Anna')
+        self.assertEqual(CustomUser.objects.count(), 1)
+
+    def test_bad_rows_are_rejected(self):
+        created, updated, rejected, errors = import_users_batch([
+            {'username': 'bona', 'email': 'bona@example.com'},
+            {'username': '', 'email': 'sense@example.com'},
+            {'username': 'correu', 'email': 'no-es-un-correu'},
+            {'username': 'data', 'date_joined': 'ahir'},
+        ])
+
+        self.assertEqual((created, updated, rejected), (1, 0, 3))
+        self.assertEqual(errors[0], 'fila sense username')
+        self.assertIn('data: valor no vàlid a "date_joined"', errors[1])
+        self.assertTrue(errors[2].startswith('correu: email:'))
+        self.assertEqual(list(CustomUser.objects.values_list('username', flat=True)), ['bona'])
@@ -1,14 +1,18 @@
 
+from django.conf import settings
 from django.urls import path
-from . import views
+from . import async_views, views
 
 app_name = 'users'
 
+# Amb ASGI (ASYNC_VIEWS) les vistes de lectura se serveixen en la seva versió async
+read_views = async_views if settings.ASYNC_VIEWS else views
+
 urlpatterns = [
     path('register/', views.register_view, name='register'),
     path('login/', views.login_view, name='login'),
     path('logout/', views.logout_view, name='logout'),
     path('profile/', views.profile_view, name='profile'),
     path('profile/edit/', views.edit_profile_view, name='edit_profile'),
-    path('<str:username>/', views.public_profile_view, name='public_profile'),
+    path('<str:username>/', read_views.public_profile_view, name='public_profile'),
 ]
@@ -6,6 +6,7 @@ from django.contrib.auth.decorators import login_required
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
 
+from events.stats import get_creator_stats
 from .forms import CustomUserCreationForm, CustomAuthenticationForm, CustomUserUpdateForm
 
 User = get_user_model()
@@ -51,7 +52,8 @@ def logout_view(request):
 
 @login_required
 def profile_view(request):
-    return render(request, 'users/profile.html', {'user_obj': request.user})
+    stats = get_creator_stats(request.user.pk)
+    return render(request, 'users/profile.html', {'user_obj': request.user, 'stats': stats})
 
 
 @login_required
@@ -70,5 +72,10 @@ def edit_profile_view(request):
 
 
 def public_profile_view(request, username):
-    user_obj = get_object_or_404(User, username=username)
-    return render(request, 'users/public_profile.html', {'user_obj': user_obj})
+    # Usuari, estadístiques i proper esdeveniment en una sola consulta
+    user_obj = get_object_or_404(
+        User.objects.select_related('creator_stats', 'creator_stats__next_event'),
+        username=username,
+    )
+    stats = get_creator_stats(user_obj.pk, stats=getattr(user_obj, 'creator_stats', None))
+    return render(request, 'users/public_profile.html', {'user_obj': user_obj, 'stats': stats})